@@ -1,9 +1,24 @@
-from .querying import KSP_SCHEMA, KSP_SCHEMA_TEXT, execute_query, get_default_adapter
+from .querying import (
+    KSP_SCHEMA,
+    KSP_SCHEMA_TEXT,
+    compile_query,
+    execute_query,
+    execute_query_async,
+    execute_query_batch,
+    explain_query,
+    export_query_results,
+    get_default_adapter,
+)
 
 
 __all__ = [
     "KSP_SCHEMA",
     "KSP_SCHEMA_TEXT",
+    "compile_query",
     "execute_query",
+    "execute_query_async",
+    "execute_query_batch",
+    "explain_query",
+    "export_query_results",
     "get_default_adapter",
 ]
@@ -0,0 +1,146 @@
+"""Benchmarks for performance-sensitive code.
+
+Run with: python -m kerbal_api.benchmarks
+
+Timings depend on the machine and on whatever else it is running, so they are reported here
+instead of being asserted in the unit tests, which only check that the results are correct.
+"""
+from argparse import ArgumentParser
+import logging
+import os
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+from graphql_compiler.interpreter import DataContext
+
+from .cfg_parser.parser import parse_cfg_file
+from .cfg_parser.streaming_parser import parse_cfg_file_streaming
+from .cfg_parser.typedefs import ParsedCfgFile
+from .querying.interpreter import KerbalDataAdapter
+from .querying.registry import KerbalDataManagerRegistry
+from .querying.tokens import KerbalToken
+from .utils import get_ksp_install_path
+
+
+logger = logging.getLogger(__name__)
+
+
+def write_cfg_file_with_repeated_keys(file_path: str, repetitions: int) -> None:
+    """Write a cfg file with a single section, containing the same key the given number of times."""
+    with open(file_path, "w") as f:
+        f.write("FLOAT_CURVE\n{\n")
+        for index in range(repetitions):
+            f.write(f"    key = {index} {index * 2}\n")
+        f.write("}\n")
+
+
+def get_best_time(function: Callable[[], object], *, runs: int = 3) -> float:
+    """Return the shortest time, in seconds, that calling the function took over several runs."""
+    timings = []
+    for _ in range(runs):
+        start_time = perf_counter()
+        function()
+        timings.append(perf_counter() - start_time)
+    return min(timings)
+
+
+def benchmark_parser_scaling(
+    *, small_repetitions: int = 2500, large_repetitions: int = 10000
+) -> None:
+    """Time parsing sections with many repeated keys, which must take linear time in their count.
+
+    Probing for unused duplicate key indexes used to make it quadratic, which took tens of seconds
+    for 10k keys.
+    """
+    parsers: List[Callable[[str], Optional[ParsedCfgFile]]] = [
+        parse_cfg_file,
+        parse_cfg_file_streaming,
+    ]
+    with TemporaryDirectory() as temporary_directory:
+        small_file_path = os.path.join(temporary_directory, "small.cfg")
+        large_file_path = os.path.join(temporary_directory, "large.cfg")
+        write_cfg_file_with_repeated_keys(small_file_path, small_repetitions)
+        write_cfg_file_with_repeated_keys(large_file_path, large_repetitions)
+
+        for parser in parsers:
+            small_file_time = get_best_time(lambda: parser(small_file_path))
+            large_file_time = get_best_time(lambda: parser(large_file_path))
+
+            # Linear scaling takes about as many times longer as there are times more keys,
+            # whereas quadratic scaling takes about the square of that.
+            logger.info(
+                "%s: %d repeated keys in %.1f ms, %d in %.1f ms "
+                "(%.1fx the time for %.1fx the keys)",
+                parser.__name__,
+                small_repetitions,
+                small_file_time * 1000,
+                large_repetitions,
+                large_file_time * 1000,
+                large_file_time / small_file_time,
+                large_repetitions / small_repetitions,
+            )
+
+
+def project_property_one_at_a_time(
+    data_contexts: Iterable[DataContext[KerbalToken]], field_name: str
+) -> Iterable[Tuple[DataContext[KerbalToken], Any]]:
+    """Project a property by looking up the field by name in each token, as it used to be done."""
+    for data_context in data_contexts:
+        token = data_context.current_token
+        current_value = None
+        if token is not None:
+            current_value = token.content[field_name]
+
+        yield (data_context, current_value)
+
+
+def benchmark_project_property(ksp_install_path: str, *, repetitions: int = 1000) -> None:
+    """Time projecting part properties, compared to looking each of them up by name."""
+    field_names = ("name", "cost", "dry_mass", "crash_tolerance", "max_temp_tolerance")
+    with KerbalDataAdapter(ksp_install_path, registry=KerbalDataManagerRegistry()) as adapter:
+        data_contexts = [
+            DataContext.make_empty_context_from_token(token)
+            for token in adapter.data_manager.parts * repetitions
+        ]
+
+        projection_time = get_best_time(
+            lambda: [
+                list(adapter.project_property(data_contexts, "Part", field_name))
+                for field_name in field_names
+            ]
+        )
+        one_at_a_time_time = get_best_time(
+            lambda: [
+                list(project_property_one_at_a_time(data_contexts, field_name))
+                for field_name in field_names
+            ]
+        )
+
+    logger.info(
+        "project_property: %d fields of %d parts in %.1f ms, one at a time in %.1f ms",
+        len(field_names),
+        len(data_contexts),
+        projection_time * 1000,
+        one_at_a_time_time * 1000,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = ArgumentParser(
+        prog="python -m kerbal_api.benchmarks", description=__doc__.split("\n")[0]
+    )
+    parser.add_argument("--ksp-install-path", default=None)
+    options = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    ksp_install_path = options.ksp_install_path
+    if ksp_install_path is None:
+        ksp_install_path = get_ksp_install_path()
+
+    benchmark_parser_scaling()
+    benchmark_project_property(ksp_install_path)
+
+
+if __name__ == "__main__":
+    main()
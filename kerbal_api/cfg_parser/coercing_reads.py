@@ -1,10 +1,14 @@
-from typing import Optional
+from typing import Any, Mapping, Optional
 
 from .constants import comment_sequence, localization_pattern
-from .typedefs import CfgKey, ParsedCfgFile
+from .typedefs import CfgKey
 
 
-def read_raw(config_data: ParsedCfgFile, path: CfgKey,) -> Optional[str]:
+# All of these accept either a flat ParsedCfgFile dict or a CfgNode, since both are mappings.
+# With a CfgNode, the path is relative to that node's section.
+
+
+def read_raw(config_data: Mapping[CfgKey, Any], path: CfgKey,) -> Optional[str]:
     raw_value = config_data.get(path, None)
     if raw_value is None:
         return None
@@ -16,7 +20,7 @@ def read_raw(config_data: ParsedCfgFile, path: CfgKey,) -> Optional[str]:
 
 
 def read_float(
-    config_data: ParsedCfgFile, path: CfgKey, *, default: Optional[float] = None,
+    config_data: Mapping[CfgKey, Any], path: CfgKey, *, default: Optional[float] = None,
 ) -> float:
     raw_value = read_raw(config_data, path)
     if raw_value is None:
@@ -28,7 +32,9 @@ def read_float(
     return float(raw_value)
 
 
-def read_int(config_data: ParsedCfgFile, path: CfgKey, *, default: Optional[int] = None,) -> int:
+def read_int(
+    config_data: Mapping[CfgKey, Any], path: CfgKey, *, default: Optional[int] = None,
+) -> int:
     raw_value = read_raw(config_data, path)
     if raw_value is None:
         if default is None:
@@ -39,7 +45,9 @@ def read_int(config_data: ParsedCfgFile, path: CfgKey, *, default: Optional[int]
     return int(raw_value)
 
 
-def read_bool(config_data: ParsedCfgFile, path: CfgKey, *, default: Optional[bool] = None,) -> bool:
+def read_bool(
+    config_data: Mapping[CfgKey, Any], path: CfgKey, *, default: Optional[bool] = None,
+) -> bool:
     raw_value = read_raw(config_data, path)
     if raw_value is None:
         if default is None:
@@ -55,7 +63,9 @@ def read_bool(config_data: ParsedCfgFile, path: CfgKey, *, default: Optional[boo
     raise AssertionError(f"Unexpected value '{raw_value}' for expected boolean at path {path}")
 
 
-def read_str(config_data: ParsedCfgFile, path: CfgKey, *, default: Optional[str] = None,) -> str:
+def read_str(
+    config_data: Mapping[CfgKey, Any], path: CfgKey, *, default: Optional[str] = None,
+) -> str:
     # N.B.: The string localization data stores the English string in a comment section.
     #       Do not use the regular read_raw() function, since that will strip the comment!
     raw_value = config_data.get(path, default)
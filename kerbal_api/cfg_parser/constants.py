@@ -1,4 +1,5 @@
 import re
+import string
 
 
 # Localization tags of the form "#autoLOC_123456" are generally followed by a comment
@@ -9,3 +10,17 @@ import re
 localization_pattern = re.compile(r"(?P<tag>#autoLOC_\d+)\s+//(?:\s*\1\s*=)?(?P<english>.*)")
 
 comment_sequence = "//"
+
+closed_curly_with_optional_comma = re.compile(r"\}[ ]*,?[ ]*")
+
+expected_section_name_chars = (
+    frozenset(string.ascii_letters) | frozenset(string.digits) | {"_", "-"}
+)
+section_like_exceptions = frozenset(
+    {
+        # One of the built-in KSP files has the below string appear within a section,
+        # bare (without a "= value" suffix), and without starting a new section by that name.
+        # Until we figure out what this means semantically, just pretend it doesn't exist.
+        "fxOriginalOffset",
+    }
+)
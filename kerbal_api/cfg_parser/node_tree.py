@@ -0,0 +1,232 @@
+from itertools import chain
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .streaming_parser import (
+    CfgEvent,
+    CfgKeyValue,
+    CfgSectionStart,
+    iter_events_from_lines,
+    iter_stripped_lines,
+)
+from .typedefs import CfgKey, ParsedCfgFile
+
+
+class CfgNode(Mapping[CfgKey, Any]):
+    """A section of a cfg file, with its values and child sections in file order.
+
+    Also acts as a read-only mapping from CfgKey (relative to this section) to value,
+    so it can be used anywhere a flat ParsedCfgFile dict can.
+    """
+
+    __slots__ = (
+        "name",
+        "index",
+        "children",
+        "children_by_name",
+        "value_names",
+        "value_list",
+        "value_positions",
+    )
+
+    name: str
+    index: int  # how many same-named sections preceded this one within its parent section
+
+    children: List["CfgNode"]  # child sections, in file order
+    children_by_name: Dict[str, List["CfgNode"]]  # child sections by name, in index order
+
+    value_names: List[str]  # key names, in file order
+    # N.B.: Not named "values", which would hide the values() method of Mapping.
+    value_list: List[str]  # values in file order, parallel to value_names
+    value_positions: Dict[str, List[int]]  # positions in value_list, by key name and index
+
+    def __init__(self, name: str, index: int) -> None:
+        self.name = name
+        self.index = index
+        self.children = []
+        self.children_by_name = {}
+        self.value_names = []
+        self.value_list = []
+        self.value_positions = {}
+
+    def add_value(self, key: str, value: str) -> None:
+        self.value_positions.setdefault(key, []).append(len(self.value_list))
+        self.value_names.append(key)
+        self.value_list.append(value)
+
+    def add_child(self, name: str) -> "CfgNode":
+        same_named_children = self.children_by_name.setdefault(name, [])
+        child = CfgNode(name, len(same_named_children))
+        same_named_children.append(child)
+        self.children.append(child)
+        return child
+
+    def children_named(self, name: str) -> Sequence["CfgNode"]:
+        return self.children_by_name.get(name, ())
+
+    def child(self, name: str, index: int = 0) -> Optional["CfgNode"]:
+        same_named_children = self.children_by_name.get(name, None)
+        if same_named_children is None or index >= len(same_named_children):
+            return None
+        return same_named_children[index]
+
+    def values_named(self, key: str) -> List[str]:
+        return [self.value_list[position] for position in self.value_positions.get(key, ())]
+
+    def get_value(self, key: str, index: int = 0, default: Optional[str] = None) -> Optional[str]:
+        positions = self.value_positions.get(key, None)
+        if positions is None or index >= len(positions):
+            return default
+        return self.value_list[positions[index]]
+
+    def get_node(self, section_key: CfgKey) -> Optional["CfgNode"]:
+        """Return the descendant section at the given key, relative to this section."""
+        node: Optional[CfgNode] = self
+        for name, index in section_key:
+            if node is None:
+                return None
+            node = node.child(name, index)
+        return node
+
+    def _lookup(self, cfg_key: CfgKey) -> Tuple[bool, Any]:
+        if not cfg_key:
+            return False, None
+
+        node = self.get_node(cfg_key[:-1]) if len(cfg_key) > 1 else self
+        if node is None:
+            return False, None
+
+        key, index = cfg_key[-1]
+        positions = node.value_positions.get(key, None)
+        if positions is None or index >= len(positions):
+            return False, None
+        return True, node.value_list[positions[index]]
+
+    def __getitem__(self, cfg_key: CfgKey) -> Any:
+        found, value = self._lookup(cfg_key)
+        if not found:
+            raise KeyError(cfg_key)
+        return value
+
+    def get(self, cfg_key: CfgKey, default: Any = None) -> Any:
+        found, value = self._lookup(cfg_key)
+        return value if found else default
+
+    def __contains__(self, cfg_key: object) -> bool:
+        if not isinstance(cfg_key, tuple):
+            return False
+        found, _ = self._lookup(cfg_key)
+        return found
+
+    def _iter_items(self, prefix: CfgKey) -> Iterator[Tuple[CfgKey, str]]:
+        value_counts: Dict[str, int] = {}
+        for key, value in zip(self.value_names, self.value_list):
+            index = value_counts.get(key, 0)
+            value_counts[key] = index + 1
+            yield prefix + ((key, index),), value
+
+        for child in self.children:
+            yield from child._iter_items(prefix + ((child.name, child.index),))
+
+    def __iter__(self) -> Iterator[CfgKey]:
+        return (cfg_key for cfg_key, _ in self._iter_items(()))
+
+    def __len__(self) -> int:
+        return len(self.value_list) + sum(len(child) for child in self.children)
+
+    def __repr__(self) -> str:
+        return (
+            f"CfgNode(name={self.name!r}, index={self.index}, "
+            f"values={len(self.value_list)}, children={len(self.children)})"
+        )
+
+
+# Either representation of a parsed cfg file: data extraction code accepts both.
+CfgData = Union[CfgNode, ParsedCfgFile]
+
+
+def build_cfg_node_tree(events: Iterable[CfgEvent]) -> CfgNode:
+    root = CfgNode("", 0)
+    open_nodes: List[CfgNode] = []
+    current_node = root
+
+    for event in events:
+        if type(event) is CfgKeyValue:
+            current_node.add_value(event.key, event.value)
+        elif type(event) is CfgSectionStart:
+            open_nodes.append(current_node)
+            current_node = current_node.add_child(event.name)
+            if current_node.index != event.occurrence:
+                raise AssertionError(
+                    f"Inconsistent index for section {event}, expected {current_node.index}"
+                )
+        else:
+            current_node = open_nodes.pop()
+
+    return root
+
+
+def parse_cfg_node_tree(file_path: str) -> Optional[CfgNode]:
+    lines = iter_stripped_lines(file_path)
+
+    # Match the flat parsers, which return None for completely empty files.
+    first_line = next(lines, None)
+    if first_line is None:
+        return None
+
+    return build_cfg_node_tree(iter_events_from_lines(chain((first_line,), lines), file_path))
+
+
+def _get_or_add_child(node: CfgNode, name: str, index: int) -> CfgNode:
+    # Flat dicts omit sections that have no values, so indexes may have gaps.
+    # Fill them with empty sections, so that every section keeps its original index.
+    same_named_children = node.children_by_name.get(name, ())
+    while len(same_named_children) <= index:
+        node.add_child(name)
+        same_named_children = node.children_by_name[name]
+    return same_named_children[index]
+
+
+def make_cfg_node_tree(parsed_cfg_file: ParsedCfgFile) -> CfgNode:
+    """Convert a flat ParsedCfgFile dict into the equivalent tree of CfgNode objects."""
+    root = CfgNode("", 0)
+    for cfg_key, value in parsed_cfg_file.items():
+        node = root
+        for name, index in cfg_key[:-1]:
+            node = _get_or_add_child(node, name, index)
+
+        key, index = cfg_key[-1]
+        if len(node.value_positions.get(key, ())) != index:
+            raise AssertionError(f"Unexpected out-of-order or duplicate key: {cfg_key}")
+        node.add_value(key, value)
+
+    return root
+
+
+def as_cfg_node(cfg_data: CfgData) -> CfgNode:
+    if isinstance(cfg_data, CfgNode):
+        return cfg_data
+    return make_cfg_node_tree(cfg_data)
+
+
+def estimate_cfg_node_size(node: CfgNode) -> int:
+    """Estimate the memory used by a section and all of its descendants, in bytes."""
+    size = 0
+    open_nodes = [node]
+    while open_nodes:
+        current_node = open_nodes.pop()
+        size += (
+            sys.getsizeof(current_node)
+            + sys.getsizeof(current_node.name)
+            + sys.getsizeof(current_node.children)
+            + sys.getsizeof(current_node.children_by_name)
+            + sum(sys.getsizeof(children) for children in current_node.children_by_name.values())
+            + sys.getsizeof(current_node.value_names)
+            + sum(sys.getsizeof(value_name) for value_name in current_node.value_names)
+            + sys.getsizeof(current_node.value_list)
+            + sum(sys.getsizeof(value) for value in current_node.value_list)
+            + sys.getsizeof(current_node.value_positions)
+            + sum(sys.getsizeof(positions) for positions in current_node.value_positions.values())
+        )
+        open_nodes.extend(current_node.children)
+    return size
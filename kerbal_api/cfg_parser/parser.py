@@ -1,40 +1,48 @@
-import re
-import string
-from typing import List, Optional, Set, Tuple
-
-from .constants import comment_sequence
+from typing import Dict, List, NamedTuple, Optional
+
+from .constants import (
+    closed_curly_with_optional_comma,
+    comment_sequence,
+    expected_section_name_chars,
+    section_like_exceptions,
+)
 from .typedefs import CfgKey, ParsedCfgFile
 
 
 # TODO: use a proper parsing library to create a "real" parser,
 #       instead of this hacked-together monstrosity.
 
-_closed_curly_with_optional_comma = re.compile(r"\}[ ]*,?[ ]*")
+
+class _OpenSection(NamedTuple):
+    section_key: CfgKey
+    key_counts: Dict[str, int]  # number of keys seen so far in this section, by key name
+    section_counts: Dict[str, int]  # number of child sections seen so far, by section name
+
+
+def _close_section(open_sections: List[_OpenSection], file_path: str, line_index: int) -> None:
+    if len(open_sections) == 1:
+        raise IndexError(f"Unbalanced closing brace at line {line_index} in file {file_path}")
+    open_sections.pop()
 
 
 def parse_cfg_file(file_path: str,) -> Optional[ParsedCfgFile]:
-    with open(file_path, "r") as f:
+    with open(file_path, "r", encoding="utf-8", errors="replace") as f:
         lines: List[str] = [raw_line.strip() for raw_line in f]
 
     if not lines:
         return None
 
-    visited_sections: Set[CfgKey] = set()
-    current_section: List[Tuple[str, int]] = []
+    # Each open section is described by its fully-qualified key, together with the number of
+    # same-named keys and child sections seen in it so far. Duplicate names are numbered using
+    # these counts: probing for the first unused index is quadratic in the number of duplicates.
+    # The root section is at the bottom of the stack and is never closed.
+    open_sections: List[_OpenSection] = [_OpenSection((), {}, {})]
     data: ParsedCfgFile = {}
 
     if lines[0] and lines[0][0] == "\ufeff":
         # Remove byte-order marks at the start of the file
         lines[0] = lines[0][1:]
 
-    expected_section_name_chars = set(string.ascii_letters) | set(string.digits) | {"_", "-"}
-    section_like_exceptions = {
-        # One of the built-in KSP files has the below string appear within a section,
-        # bare (without a "= value" suffix), and without starting a new section by that name.
-        # Until we figure out what this means semantically, just pretend it doesn't exist.
-        "fxOriginalOffset",
-    }
-
     for line_index, line in enumerate(lines):
         if line == "":
             continue
@@ -45,23 +53,20 @@ def parse_cfg_file(file_path: str,) -> Optional[ParsedCfgFile]:
             components = [component.strip() for component in line.split("=", 1)]
             key, value = components
 
-            counter = 0
-            current_field_key = (key, counter)
-            full_key = tuple(current_section) + (current_field_key,)
-            while full_key in data:
-                counter += 1
-                current_field_key = (key, counter)
-                full_key = tuple(current_section) + (current_field_key,)
+            current_section = open_sections[-1]
+            counter = current_section.key_counts.get(key, 0)
+            current_section.key_counts[key] = counter + 1
 
+            full_key = current_section.section_key + ((key, counter),)
             data[full_key] = value
         elif line == "{":
             continue
         elif line.startswith("}"):
-            current_section.pop()
-            while not _closed_curly_with_optional_comma.match(line):
+            _close_section(open_sections, file_path, line_index)
+            while not closed_curly_with_optional_comma.match(line):
                 line = line.split("}", 1)[1].strip()
                 if line.startswith("}"):
-                    current_section.pop()
+                    _close_section(open_sections, file_path, line_index)
         elif line in section_like_exceptions:
             # Certain strings appear in section-like form (unary, not key = value),
             # and we know to ignore them.
@@ -102,18 +107,11 @@ def parse_cfg_file(file_path: str,) -> Optional[ParsedCfgFile]:
                     f"{section_name}"
                 )
 
-            counter = 0
-
-            section_key = (section_name, counter)
-            fully_qualified_section_name: Tuple[Tuple[str, int], ...] = (
-                tuple(current_section) + tuple(section_key,)
-            )
-            while fully_qualified_section_name in visited_sections:
-                counter += 1
-                section_key = (section_name, counter)
-                fully_qualified_section_name = tuple(current_section) + tuple(section_key,)
+            parent_section = open_sections[-1]
+            counter = parent_section.section_counts.get(section_name, 0)
+            parent_section.section_counts[section_name] = counter + 1
 
-            visited_sections.add(fully_qualified_section_name)
-            current_section.append(section_key)
+            section_key = parent_section.section_key + ((section_name, counter),)
+            open_sections.append(_OpenSection(section_key, {}, {}))
 
     return data
@@ -0,0 +1,34 @@
+from functools import lru_cache
+import re
+from typing import AbstractSet, FrozenSet, Pattern
+
+
+@lru_cache(maxsize=None)
+def _make_section_line_pattern(section_names: FrozenSet[str]) -> Pattern[str]:
+    # Matches lines that open a section with one of the given names, in any of the forms
+    # the parsers accept: the name alone (with "{" on a later line), followed by "{",
+    # or followed by a comment. Leading and trailing whitespace, and a leading byte-order mark,
+    # are allowed. "[^\S\n]" is any whitespace other than a line break.
+    alternatives = "|".join(re.escape(section_name) for section_name in sorted(section_names))
+    return re.compile(
+        r"^[^\S\n]*\ufeff?[^\S\n]*(" + alternatives + r")[^\S\n]*(?:\{[^\S\n]*|//.*)?$",
+        re.MULTILINE,
+    )
+
+
+def sniff_section_names(file_path: str, section_names: AbstractSet[str]) -> FrozenSet[str]:
+    """Return which of the given section names may appear in the file, without parsing it.
+
+    Much cheaper than parsing. Sections are matched at any nesting depth, so the result may
+    include names that only appear in nested sections, but never omits a section that is present.
+    """
+    with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+        contents = f.read()
+
+    pattern = _make_section_line_pattern(frozenset(section_names))
+    found_names = set()
+    for match in pattern.finditer(contents):
+        found_names.add(match.group(1))
+        if len(found_names) == len(section_names):
+            break
+    return frozenset(found_names)
@@ -0,0 +1,194 @@
+import io
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from .constants import (
+    closed_curly_with_optional_comma,
+    comment_sequence,
+    expected_section_name_chars,
+    section_like_exceptions,
+)
+from .typedefs import CfgKey, ParsedCfgFile
+
+
+# Single-pass replacement for the line-list parser in parser.py. Instead of reading the whole file
+# into a list and looking ahead for the "{" that opens a section, it remembers the pending section
+# name until the opening brace shows up. Duplicate key and section names are numbered using
+# per-section occurrence counters, instead of probing for unused indexes.
+#
+# The output of parse_cfg_file_streaming() is identical to that of parse_cfg_file().
+
+
+class CfgSectionStart(NamedTuple):
+    name: str
+    occurrence: int  # how many same-named sections preceded this one within its parent section
+
+
+class CfgKeyValue(NamedTuple):
+    key: str
+    occurrence: int  # how many same-named keys preceded this one within its section
+    value: str
+
+
+class CfgSectionEnd(NamedTuple):
+    name: str
+    occurrence: int
+
+
+CfgEvent = Union[CfgSectionStart, CfgKeyValue, CfgSectionEnd]
+
+
+class _SectionFrame:
+    __slots__ = ("name", "index", "key_counts", "section_counts")
+
+    name: str
+    index: int
+    key_counts: Dict[str, int]  # number of keys seen so far in this section, by key name
+    section_counts: Dict[str, int]  # number of child sections seen so far, by section name
+
+    def __init__(self, name: str, index: int) -> None:
+        self.name = name
+        self.index = index
+        self.key_counts = {}
+        self.section_counts = {}
+
+
+_byte_order_mark = "\ufeff"
+
+
+def iter_stripped_lines(file_path: str) -> Iterator[str]:
+    """Produce the lines of the given cfg file, stripped of whitespace and the byte-order mark."""
+    # Decode the buffered byte stream incrementally, with universal newline handling.
+    # Mods' cfg files sometimes contain stray bytes that are not valid UTF-8,
+    # which must not stop the rest of the file from being parsed.
+    with io.open(file_path, "rb") as binary_stream:
+        text_stream = io.TextIOWrapper(binary_stream, encoding="utf-8", errors="replace")
+        first_line = True
+        for raw_line in text_stream:
+            line = raw_line.strip()
+            if first_line:
+                first_line = False
+                if line and line[0] == _byte_order_mark:
+                    # Remove byte-order marks at the start of the file
+                    line = line[1:]
+            yield line
+
+
+def iter_events_from_lines(lines: Iterable[str], file_path: str) -> Iterator[CfgEvent]:
+    """Produce the cfg events in the given stripped lines, which come from the given file."""
+    root_frame = _SectionFrame("", 0)
+    frames: List[_SectionFrame] = [root_frame]
+    current_frame = root_frame
+
+    # Section name awaiting its opening curly brace, together with its line index and line.
+    pending_section: Optional[Tuple[str, int, str]] = None
+
+    for line_index, line in enumerate(lines):
+        if pending_section is not None:
+            if line == "":
+                continue
+            elif line != "{":
+                raise AssertionError(
+                    f"Unexpected line {pending_section[1]} in file {file_path}: "
+                    f"{pending_section[2]}"
+                )
+
+            section_name = pending_section[0]
+            pending_section = None
+
+            section_index = current_frame.section_counts.get(section_name, 0)
+            current_frame.section_counts[section_name] = section_index + 1
+            current_frame = _SectionFrame(section_name, section_index)
+            frames.append(current_frame)
+            yield CfgSectionStart(section_name, section_index)
+            continue
+
+        if line == "":
+            continue
+        elif line.startswith(comment_sequence):
+            # Comment line, ignore.
+            continue
+
+        if "=" in line:
+            key, value = line.split("=", 1)
+            key = key.strip()
+
+            key_index = current_frame.key_counts.get(key, 0)
+            current_frame.key_counts[key] = key_index + 1
+            yield CfgKeyValue(key, key_index, value.strip())
+        elif line == "{":
+            continue
+        elif line[0] == "}":
+            closed_frames = 1
+            while not closed_curly_with_optional_comma.match(line):
+                line = line.split("}", 1)[1].strip()
+                if line.startswith("}"):
+                    closed_frames += 1
+
+            for _ in range(closed_frames):
+                if len(frames) == 1:
+                    raise IndexError(f"Unbalanced closing brace in file {file_path}: {line_index}")
+                closed_frame = frames.pop()
+                yield CfgSectionEnd(closed_frame.name, closed_frame.index)
+            current_frame = frames[-1]
+        elif line in section_like_exceptions:
+            # Certain strings appear in section-like form (unary, not key = value),
+            # and we know to ignore them.
+            continue
+        else:
+            opens_section_immediately = line.endswith("{")
+            if opens_section_immediately:
+                line = line.strip("{").strip()
+
+            section_name = line
+            if "//" in section_name:
+                section_name = section_name.split("//", 1)[0].strip()
+
+            unexpected_chars = set(section_name) - expected_section_name_chars
+            if unexpected_chars:
+                raise AssertionError(
+                    f"Unexpected section name at line {line_index} in file {file_path}: "
+                    f"{section_name}"
+                )
+
+            if opens_section_immediately:
+                section_index = current_frame.section_counts.get(section_name, 0)
+                current_frame.section_counts[section_name] = section_index + 1
+                current_frame = _SectionFrame(section_name, section_index)
+                frames.append(current_frame)
+                yield CfgSectionStart(section_name, section_index)
+            else:
+                pending_section = (section_name, line_index, line)
+
+    if pending_section is not None:
+        raise AssertionError(
+            f"Unexpected line {pending_section[1]} in file {file_path}: {pending_section[2]}"
+        )
+
+
+def iter_cfg_events(file_path: str) -> Iterator[CfgEvent]:
+    """Produce the section start, key-value and section end events in the given cfg file."""
+    return iter_events_from_lines(iter_stripped_lines(file_path), file_path)
+
+
+def parse_cfg_file_streaming(file_path: str) -> Optional[ParsedCfgFile]:
+    lines = iter_stripped_lines(file_path)
+
+    first_line = next(lines, None)
+    if first_line is None:
+        return None
+
+    data: ParsedCfgFile = {}
+    current_section_key: CfgKey = ()
+    section_keys: List[CfgKey] = []
+
+    for event in iter_events_from_lines(chain((first_line,), lines), file_path):
+        if type(event) is CfgKeyValue:
+            data[current_section_key + ((event.key, event.occurrence),)] = event.value
+        elif type(event) is CfgSectionStart:
+            section_keys.append(current_section_key)
+            current_section_key = current_section_key + ((event.name, event.occurrence),)
+        else:
+            current_section_key = section_keys.pop()
+
+    return data
@@ -1,12 +1,39 @@
-from .api import execute_query, get_default_adapter
+from .api import (
+    clear_compiled_query_cache,
+    compile_query,
+    execute_query,
+    execute_query_async,
+    execute_query_batch,
+    explain_query,
+    export_query_results,
+    get_compiled_query_cache_info,
+    get_default_adapter,
+)
+from .compiled_query import CompiledQuery, CompiledQueryCache, CompiledQueryCacheInfo
 from .interpreter import KerbalDataAdapter
+from .profiling import OperationProfile, QueryProfile
+from .registry import KerbalDataManagerRegistry, get_default_registry
 from .schema import KSP_SCHEMA, KSP_SCHEMA_TEXT
 
 
 __all__ = [
+    "CompiledQuery",
+    "CompiledQueryCache",
+    "CompiledQueryCacheInfo",
     "KSP_SCHEMA",
     "KSP_SCHEMA_TEXT",
     "KerbalDataAdapter",
+    "KerbalDataManagerRegistry",
+    "OperationProfile",
+    "QueryProfile",
+    "clear_compiled_query_cache",
+    "compile_query",
     "execute_query",
+    "execute_query_async",
+    "execute_query_batch",
+    "explain_query",
+    "export_query_results",
+    "get_compiled_query_cache_info",
     "get_default_adapter",
+    "get_default_registry",
 ]
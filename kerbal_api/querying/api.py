@@ -1,19 +1,241 @@
-from typing import Any, Dict, Iterable
+import asyncio
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from itertools import islice
+from threading import Event, Lock
+from time import perf_counter
+from typing import IO, Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from graphql_compiler.compiler.compiler_frontend import graphql_to_ir
-from graphql_compiler.interpreter import interpret_ir
+from graphql_compiler.interpreter import InterpreterAdapter
 
 from ..utils import get_ksp_install_path
-from .interpreter import KerbalDataAdapter
-from .schema import KSP_SCHEMA
+from .compiled_query import CompiledQuery, CompiledQueryCache, CompiledQueryCacheInfo
+from .interpreter import KerbalDataAdapter, SharedScanAdapter
+from .profiling import ProfilingAdapter, QueryProfile, profile_results
+from .result_sinks import write_results
+from .tokens import KerbalToken
 
 
-def get_default_adapter() -> KerbalDataAdapter:
-    return KerbalDataAdapter(get_ksp_install_path())
+DEFAULT_ASYNC_QUERY_WORKERS = 4
+DEFAULT_ASYNC_RESULT_CHUNK_SIZE = 100
+
+_default_compiled_query_cache = CompiledQueryCache()
+
+_default_async_query_executor: Optional[ThreadPoolExecutor] = None
+_default_async_query_executor_lock = Lock()
+
+
+def _get_default_async_query_executor() -> ThreadPoolExecutor:
+    global _default_async_query_executor
+
+    with _default_async_query_executor_lock:
+        if _default_async_query_executor is None:
+            _default_async_query_executor = ThreadPoolExecutor(
+                max_workers=DEFAULT_ASYNC_QUERY_WORKERS, thread_name_prefix="kerbal_api_query"
+            )
+        return _default_async_query_executor
+
+
+def get_default_adapter(*, lazy: bool = False) -> KerbalDataAdapter:
+    # All default adapters share the same data manager via the process-wide registry,
+    # so only the first one pays the cost of loading the game data.
+    return KerbalDataAdapter(get_ksp_install_path(), lazy=lazy)
+
+
+def compile_query(query: str) -> CompiledQuery:
+    """Compile the query, or fetch its already-compiled form from the process-wide cache."""
+    return _default_compiled_query_cache.get_or_compile(query)
+
+
+def get_compiled_query_cache_info() -> CompiledQueryCacheInfo:
+    return _default_compiled_query_cache.cache_info()
+
+
+def clear_compiled_query_cache() -> None:
+    _default_compiled_query_cache.clear()
 
 
 def execute_query(
-    adapter: KerbalDataAdapter, query: str, args: Dict[str, Any],
+    adapter: KerbalDataAdapter,
+    query: str,
+    args: Dict[str, Any],
+    *,
+    profile: Optional[QueryProfile] = None,
 ) -> Iterable[Dict[str, Any]]:
-    ir_and_metadata = graphql_to_ir(KSP_SCHEMA, query)
-    return interpret_ir(adapter, ir_and_metadata, args)
+    """Execute the query, returning its results lazily.
+
+    If a profile is given, it records where the query spends its time as the results are consumed.
+    Profiling slows the query down somewhat, so it is off by default.
+    """
+    if profile is None:
+        return compile_query(query).execute(adapter, args)
+
+    start_time = perf_counter()
+    compiled_query = compile_query(query)
+    profile.compile_seconds += perf_counter() - start_time
+
+    return profile_results(
+        compiled_query.execute(ProfilingAdapter(adapter, profile), args), profile
+    )
+
+
+def explain_query(adapter: KerbalDataAdapter, query: str, args: Dict[str, Any]) -> QueryProfile:
+    """Execute the query to completion, and return its profile instead of its results.
+
+    Call format() on the profile for a human-readable report.
+    """
+    profile = QueryProfile()
+    for _ in execute_query(adapter, query, args, profile=profile):
+        pass
+    return profile
+
+
+def execute_query_batch(
+    adapter: KerbalDataAdapter,
+    query: str,
+    args_list: Iterable[Dict[str, Any]],
+    *,
+    profile: Optional[QueryProfile] = None,
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Execute the query once per set of arguments, yielding (args index, result) pairs.
+
+    Results are yielded in order of their argument sets. The query is compiled once, and the
+    argument sets share on-demand equality indexes: a root vertex equality filter on a field
+    without a prebuilt index costs a single scan for the whole batch, instead of one per argument
+    set. Otherwise, each argument set costs the same as a separate execute_query() call.
+
+    If a profile is given, it records the work of the whole batch, as in execute_query().
+    """
+    start_time = perf_counter()
+    compiled_query = compile_query(query)
+    shared_scan_adapter = SharedScanAdapter(adapter)
+    batch_adapter: InterpreterAdapter[KerbalToken] = shared_scan_adapter
+    if profile is not None:
+        profile.compile_seconds += perf_counter() - start_time
+        batch_adapter = ProfilingAdapter(shared_scan_adapter, profile)
+
+    for args_index, args in enumerate(args_list):
+        results = compiled_query.execute(batch_adapter, args)
+        if profile is not None:
+            results = profile_results(results, profile)
+        for result in results:
+            yield args_index, result
+
+
+def export_query_results(
+    adapter: KerbalDataAdapter,
+    query: str,
+    args: Dict[str, Any],
+    output_file: IO[Any],
+    *,
+    result_format: str = "ndjson",
+) -> int:
+    """Execute the query, writing its results to the file as they are produced.
+
+    The format is "ndjson" or "arrow" (an Arrow IPC stream) for binary files, or "csv" for text
+    files opened with newline="". Columns are the query's @output names, in query order.
+    Returns the number of rows written.
+    """
+    compiled_query = compile_query(query)
+    results = compiled_query.execute(adapter, args)
+    return write_results(
+        results, output_file, compiled_query.ir_and_metadata.output_metadata, result_format
+    )
+
+
+def _start_query(
+    adapter: KerbalDataAdapter, query: str, args: Dict[str, Any]
+) -> Iterator[Dict[str, Any]]:
+    return iter(compile_query(query).execute(adapter, args))
+
+
+def _get_next_chunk(
+    results: Iterator[Dict[str, Any]], chunk_size: int, cancelled: Event
+) -> List[Dict[str, Any]]:
+    chunk: List[Dict[str, Any]] = []
+    for result in islice(results, chunk_size):
+        chunk.append(result)
+        if cancelled.is_set():
+            break
+    return chunk
+
+
+def _close_results(results: Iterator[Dict[str, Any]]) -> None:
+    close = getattr(results, "close", None)
+    if close is not None:
+        close()
+
+
+def _close_started_results(start_work: "Future[Iterator[Dict[str, Any]]]") -> None:
+    if not start_work.cancelled() and start_work.exception() is None:
+        _close_results(start_work.result())
+
+
+async def execute_query_async(
+    adapter: KerbalDataAdapter,
+    query: str,
+    args: Dict[str, Any],
+    *,
+    timeout: Optional[float] = None,
+    chunk_size: int = DEFAULT_ASYNC_RESULT_CHUNK_SIZE,
+    executor: Optional[Executor] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Execute the query on a worker pool, without blocking the event loop.
+
+    Results are computed in chunks of up to chunk_size rows, and the next chunk is only computed
+    once the caller has consumed the previous one. If a timeout is given, asyncio.TimeoutError is
+    raised once that many seconds pass since the query started. Cancelling the calling task,
+    timing out, or closing the iterator early all stop the query after at most one more row.
+
+    Uses the same compiled query cache and data managers as execute_query(). Runs on a shared
+    pool of DEFAULT_ASYNC_QUERY_WORKERS threads unless a different executor is given.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"Chunk size must be positive, but got {chunk_size}.")
+    if executor is None:
+        executor = _get_default_async_query_executor()
+
+    loop = asyncio.get_running_loop()
+    deadline = None if timeout is None else loop.time() + timeout
+
+    def get_remaining_time() -> Optional[float]:
+        if deadline is None:
+            return None
+        remaining_time = deadline - loop.time()
+        if remaining_time <= 0:
+            raise asyncio.TimeoutError()
+        return remaining_time
+
+    cancelled = Event()
+    results: Optional[Iterator[Dict[str, Any]]] = None
+    pending_work: "Optional[Future[Any]]" = None
+    try:
+        # Compiling the query and loading the game data may both take a while,
+        # so they also happen on the worker pool.
+        pending_work = executor.submit(_start_query, adapter, query, args)
+        started_results: Iterator[Dict[str, Any]] = await asyncio.wait_for(
+            asyncio.wrap_future(pending_work), get_remaining_time()
+        )
+        results = started_results
+        pending_work = None
+
+        while True:
+            pending_work = executor.submit(_get_next_chunk, started_results, chunk_size, cancelled)
+            chunk = await asyncio.wait_for(asyncio.wrap_future(pending_work), get_remaining_time())
+            pending_work = None
+            if not chunk:
+                break
+
+            for result in chunk:
+                yield result
+    finally:
+        cancelled.set()
+        if results is None:
+            if pending_work is not None:
+                # The query is still starting. Close its results once the worker returns them.
+                pending_work.add_done_callback(_close_started_results)
+        elif pending_work is None:
+            _close_results(results)
+        else:
+            # The results iterator is still in use by a worker. Close it once it's released.
+            finished_results = results
+            pending_work.add_done_callback(lambda _: _close_results(finished_results))
@@ -0,0 +1,227 @@
+from array import array
+import math
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from ..utils import import_numpy
+from .tokens import KerbalConfigToken
+
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# Columnar view of the numeric fields of tokens, for vectorized analysis with NumPy.
+# NumPy is an optional dependency: columns are collected using the standard library
+# while files are ingested, and only converted to NumPy arrays when first requested.
+
+columnar_fields: Dict[str, Tuple[str, ...]] = {
+    "Part": ("cost", "development_cost", "dry_mass", "crash_tolerance", "max_temp_tolerance"),
+    "EngineModule": ("min_thrust", "max_thrust", "isp_vacuum", "isp_at_1atm"),
+    "ContainedResource": ("amount", "max_amount"),
+    "Resource": ("density", "specific_heat", "unit_cost", "specific_volume"),
+}
+
+# Edge name -> (source type name, destination type name)
+columnar_edges: Dict[str, Tuple[str, str]] = {
+    "Part_EngineModule": ("Part", "EngineModule"),
+    "Part_HasDefaultResource": ("Part", "ContainedResource"),
+    "ContainedResource_Resource": ("ContainedResource", "Resource"),
+}
+
+
+class ColumnTable:
+    """Numeric columns for a set of tokens of a single type, as NumPy arrays.
+
+    Missing (None) values are represented as NaN. Each row has a row id, which is the position
+    of its token in the list of all tokens of that type. In tables returned by ColumnarStore,
+    row ids are equal to row positions; filtered and sorted tables keep the original row ids.
+    """
+
+    type_name: str
+    tokens: Sequence[KerbalConfigToken]  # all tokens of this type, indexed by row id
+    row_ids: "np.ndarray"
+    columns: Dict[str, "np.ndarray"]
+
+    def __init__(
+        self,
+        type_name: str,
+        tokens: Sequence[KerbalConfigToken],
+        row_ids: "np.ndarray",
+        columns: Dict[str, "np.ndarray"],
+    ) -> None:
+        self.type_name = type_name
+        self.tokens = tokens
+        self.row_ids = row_ids
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.row_ids)
+
+    def __getitem__(self, column_name: str) -> "np.ndarray":
+        return self.columns[column_name]
+
+    def _take(self, positions: "np.ndarray") -> "ColumnTable":
+        return ColumnTable(
+            self.type_name,
+            self.tokens,
+            self.row_ids[positions],
+            {column_name: values[positions] for column_name, values in self.columns.items()},
+        )
+
+    def where(self, mask: "np.ndarray") -> "ColumnTable":
+        """Return a table with only the rows where the boolean mask is true."""
+        return self._take(mask)
+
+    def sort_by(self, column_name: str, *, descending: bool = False) -> "ColumnTable":
+        """Return a table sorted by the given column. Ties keep their order, and NaNs go last."""
+        numpy = import_numpy()
+
+        values = self.columns[column_name]
+        if descending:
+            # Negating keeps NaNs last, and stable sorting keeps ties in their original order.
+            positions = numpy.argsort(-values, kind="stable")
+        else:
+            positions = numpy.argsort(values, kind="stable")
+        return self._take(positions)
+
+    def with_column(self, column_name: str, values: "np.ndarray") -> "ColumnTable":
+        """Return a table with an added or replaced column, e.g. one derived from other columns."""
+        if len(values) != len(self.row_ids):
+            raise ValueError(
+                f"Column {column_name} has {len(values)} values, "
+                f"but the table has {len(self.row_ids)} rows."
+            )
+        columns = dict(self.columns)
+        columns[column_name] = values
+        return ColumnTable(self.type_name, self.tokens, self.row_ids, columns)
+
+    def get_tokens(self) -> List[KerbalConfigToken]:
+        return [self.tokens[row_id] for row_id in self.row_ids.tolist()]
+
+
+class ColumnarStore:
+    """Column tables for each type, together with join arrays for the edges between them."""
+
+    tables: Dict[str, ColumnTable]
+
+    # Edge name -> (source row ids, destination row ids), with one entry per edge.
+    joins: Dict[str, Tuple["np.ndarray", "np.ndarray"]]
+
+    def __init__(
+        self, tables: Dict[str, ColumnTable], joins: Dict[str, Tuple["np.ndarray", "np.ndarray"]],
+    ) -> None:
+        self.tables = tables
+        self.joins = joins
+
+    def table(self, type_name: str) -> ColumnTable:
+        return self.tables[type_name]
+
+    def join(self, edge_name: str) -> Tuple["np.ndarray", "np.ndarray"]:
+        return self.joins[edge_name]
+
+
+class ColumnarStoreBuilder:
+    """Collects token field values and edges as tokens are created, without needing NumPy."""
+
+    tokens: Dict[str, List[KerbalConfigToken]]
+    values: Dict[str, Dict[str, array]]  # type name -> field name -> value by row id
+
+    # Edge name -> (source row ids, destination row ids)
+    edges: Dict[str, Tuple[array, array]]
+
+    # Edges whose destination is looked up by a field value when the store is built,
+    # since the destination may not have been ingested yet: edge name -> field name,
+    # and the list of (source row id, destination field value) pairs.
+    keyed_edge_fields: Dict[str, str]
+    keyed_edges: Dict[str, List[Tuple[int, Any]]]
+
+    _built_store: Optional[ColumnarStore]  # discarded whenever more data is added
+
+    def __init__(self) -> None:
+        self.tokens = {type_name: [] for type_name in columnar_fields}
+        self.values = {
+            type_name: {field_name: array("d") for field_name in field_names}
+            for type_name, field_names in columnar_fields.items()
+        }
+        self.edges = {edge_name: (array("q"), array("q")) for edge_name in columnar_edges}
+        self.keyed_edge_fields = {"ContainedResource_Resource": "internal_name"}
+        self.keyed_edges = {edge_name: [] for edge_name in self.keyed_edge_fields}
+        self._built_store = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The built store is just a cache, and unpickling it would require NumPy.
+        state = dict(self.__dict__)
+        state["_built_store"] = None
+        return state
+
+    def add_token(self, token: KerbalConfigToken) -> int:
+        """Add the token's fields as a new row, and return its row id."""
+        self._built_store = None
+
+        type_tokens = self.tokens[token.type_name]
+        row_id = len(type_tokens)
+        type_tokens.append(token)
+
+        for field_name, column in self.values[token.type_name].items():
+            value = token.content[field_name]
+            column.append(math.nan if value is None else float(value))
+
+        return row_id
+
+    def add_edge(self, edge_name: str, source_row_id: int, destination_row_id: int) -> None:
+        self._built_store = None
+
+        source_row_ids, destination_row_ids = self.edges[edge_name]
+        source_row_ids.append(source_row_id)
+        destination_row_ids.append(destination_row_id)
+
+    def add_keyed_edge(self, edge_name: str, source_row_id: int, destination_key: Any) -> None:
+        self._built_store = None
+        self.keyed_edges[edge_name].append((source_row_id, destination_key))
+
+    def build(self) -> ColumnarStore:
+        """Return the NumPy-backed columnar store for the data added so far."""
+        store = self._built_store
+        if store is not None:
+            return store
+
+        numpy = import_numpy()
+
+        tables: Dict[str, ColumnTable] = {}
+        for type_name, type_tokens in self.tokens.items():
+            columns = {
+                field_name: numpy.array(column, dtype=numpy.float64)
+                for field_name, column in self.values[type_name].items()
+            }
+            row_ids = numpy.arange(len(type_tokens), dtype=numpy.int64)
+            tables[type_name] = ColumnTable(type_name, list(type_tokens), row_ids, columns)
+
+        joins: Dict[str, Tuple["np.ndarray", "np.ndarray"]] = {}
+        for edge_name, (source_row_ids, destination_row_ids) in self.edges.items():
+            if edge_name in self.keyed_edge_fields:
+                _, destination_type_name = columnar_edges[edge_name]
+                key_field_name = self.keyed_edge_fields[edge_name]
+                row_ids_by_key = {
+                    token.content[key_field_name]: row_id
+                    for row_id, token in enumerate(self.tokens[destination_type_name])
+                }
+
+                # Destinations that never got ingested have no row, so they have no edge either.
+                keyed_source_row_ids = array("q")
+                keyed_destination_row_ids = array("q")
+                for source_row_id, destination_key in self.keyed_edges[edge_name]:
+                    destination_row_id = row_ids_by_key.get(destination_key, None)
+                    if destination_row_id is not None:
+                        keyed_source_row_ids.append(source_row_id)
+                        keyed_destination_row_ids.append(destination_row_id)
+                source_row_ids = keyed_source_row_ids
+                destination_row_ids = keyed_destination_row_ids
+
+            joins[edge_name] = (
+                numpy.array(source_row_ids, dtype=numpy.int64),
+                numpy.array(destination_row_ids, dtype=numpy.int64),
+            )
+
+        store = ColumnarStore(tables, joins)
+        self._built_store = store
+        return store
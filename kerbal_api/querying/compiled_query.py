@@ -0,0 +1,108 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+import re
+from threading import Lock
+from typing import Any, Dict, Iterable, NamedTuple
+
+from graphql_compiler.compiler.compiler_frontend import IrAndMetadata, graphql_to_ir
+from graphql_compiler.interpreter import InterpreterAdapter, interpret_ir
+
+from .schema import KSP_SCHEMA
+from .tokens import KerbalToken
+
+
+DEFAULT_COMPILED_QUERY_CACHE_SIZE = 256
+
+# GraphQL string literals (block strings first, then regular ones) must be kept verbatim,
+# whereas runs of whitespace, commas and comments are all insignificant and may be collapsed.
+_string_literal_or_ignored_tokens = re.compile(
+    r'"""(?:\\"""|.)*?"""|"(?:\\.|[^"\\\n])*"|(?:[\s,]|#[^\n\r]*)+', re.DOTALL
+)
+
+
+def normalize_query_text(query: str) -> str:
+    """Return a canonical form of the query text, suitable for use as a cache key."""
+
+    def _replace(match: "re.Match[str]") -> str:
+        matched_text = match.group(0)
+        if matched_text.startswith('"'):
+            return matched_text
+        else:
+            return " "
+
+    return _string_literal_or_ignored_tokens.sub(_replace, query).strip()
+
+
+@dataclass(frozen=True)
+class CompiledQuery:
+    query: str  # normalized query text
+    ir_and_metadata: IrAndMetadata
+
+    def execute(
+        self, adapter: InterpreterAdapter[KerbalToken], args: Dict[str, Any]
+    ) -> Iterable[Dict[str, Any]]:
+        return interpret_ir(adapter, self.ir_and_metadata, args)
+
+
+class CompiledQueryCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    max_size: int
+    current_size: int
+
+
+class CompiledQueryCache:
+    max_size: int
+
+    _hits: int
+    _misses: int
+    _compiled_queries: "OrderedDict[str, CompiledQuery]"  # in least-recently-used first order
+    _lock: Lock
+
+    def __init__(self, max_size: int = DEFAULT_COMPILED_QUERY_CACHE_SIZE) -> None:
+        if max_size < 1:
+            raise ValueError(f"Compiled query cache size must be positive, but got {max_size}.")
+
+        self.max_size = max_size
+        self._hits = 0
+        self._misses = 0
+        self._compiled_queries = OrderedDict()
+        self._lock = Lock()
+
+    def get_or_compile(self, query: str) -> CompiledQuery:
+        normalized_query = normalize_query_text(query)
+
+        with self._lock:
+            compiled_query = self._compiled_queries.get(normalized_query, None)
+            if compiled_query is not None:
+                self._hits += 1
+                self._compiled_queries.move_to_end(normalized_query)
+                return compiled_query
+
+            self._misses += 1
+
+        # Compile outside of the lock, so that a slow compilation does not block cache hits
+        # for other queries. Concurrent misses on the same query may both compile it,
+        # which is wasteful but harmless: compilation is deterministic.
+        # Compilation errors propagate to the caller and nothing is cached for that query.
+        compiled_query = CompiledQuery(normalized_query, graphql_to_ir(KSP_SCHEMA, query))
+
+        with self._lock:
+            self._compiled_queries[normalized_query] = compiled_query
+            self._compiled_queries.move_to_end(normalized_query)
+            while len(self._compiled_queries) > self.max_size:
+                self._compiled_queries.popitem(last=False)
+
+        return compiled_query
+
+    def cache_info(self) -> CompiledQueryCacheInfo:
+        with self._lock:
+            return CompiledQueryCacheInfo(
+                self._hits, self._misses, self.max_size, len(self._compiled_queries)
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._compiled_queries.clear()
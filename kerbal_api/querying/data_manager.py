@@ -1,11 +1,43 @@
+from concurrent.futures import ProcessPoolExecutor
 from os import path
-from typing import Any, Dict, List, Optional, Type, TypeVar
+from threading import Lock, RLock
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
 from ..cfg_parser.coercing_reads import read_bool, read_float, read_raw, read_str
 from ..cfg_parser.file_finder import get_cfg_files_recursively
-from ..cfg_parser.parser import parse_cfg_file
-from ..cfg_parser.typedefs import CfgKey, ParsedCfgFile
-from .tokens import KerbalConfigToken, make_part_token, make_resource_tokens, make_technology_tokens
+from ..cfg_parser.node_tree import CfgNode, estimate_cfg_node_size, parse_cfg_node_tree
+from ..cfg_parser.section_sniffer import sniff_section_names
+from ..cfg_parser.typedefs import CfgKey
+from ..utils import import_numpy
+from .columnar import ColumnarStore, ColumnarStoreBuilder
+from .float_curve import evaluate_float_curves, parse_float_curve
+from .indexes import NumericFieldIndex, SortedFieldIndex, SubstringIndex
+from .snapshot import CfgFileStat, get_cfg_file_stat, read_snapshot, write_snapshot
+from .tech_tree import TechPrerequisiteClosure
+from .tokens import (
+    KerbalConfigToken,
+    get_field_values,
+    get_foreign_key_values,
+    make_part_token,
+    make_resource_tokens,
+    make_technology_tokens,
+)
+
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 def _canonicalize_path(file_path: str) -> str:
@@ -34,8 +66,62 @@ def _set_without_overwriting(mapping: Dict[K, V], new_key: K, new_value: V) -> N
 T = TypeVar("T", bound="KerbalDataManager")
 
 
+# Numeric fields that are kept in sorted indexes, which are updated as each file is ingested.
+_numeric_indexed_fields: Dict[str, Tuple[str, ...]] = {
+    "Part": ("cost", "development_cost", "dry_mass", "crash_tolerance", "max_temp_tolerance"),
+    "Resource": ("density", "unit_cost"),
+    "Technology": ("science_cost",),
+    "EngineModule": ("max_thrust", "isp_vacuum"),
+}
+
+# String fields that are kept in substring indexes, which are updated as each file is ingested.
+_substring_indexed_fields: Dict[str, Tuple[str, ...]] = {
+    "Part": ("name", "internal_name"),
+    "Resource": ("name",),
+    "Technology": ("name", "description"),
+}
+
+
+# For lazy ingestion: the top-level section that defines each type of root token.
+_section_names_by_type: Dict[str, str] = {
+    "Part": "PART",
+    "Resource": "RESOURCE_DEFINITION",
+    "Technology": "TechTree",
+}
+
+# Non-root token types are ingested together with the root tokens they belong to.
+_ingestion_type_names: Dict[str, str] = {
+    "EngineModule": "Part",
+    "ContainedResource": "Part",
+}
+
+
 class KerbalDataManager:
-    parsed_cfg_files: Dict[str, ParsedCfgFile]  # mapping file path to parsed data
+    """All token data of a KSP install, with the indexes and caches used to query it.
+
+    Concurrency model: a data manager is built by a single thread, and then frozen. Once frozen,
+    no more files may be ingested explicitly, and all public methods and the edge functions in
+    this module are safe to call from many threads at once. Work that still happens lazily
+    after freezing (deferred ingestion, and building derived indexes and caches) is guarded by
+    a lock and done at most once, before any of its results become visible to other threads.
+    The only exception is memoized part neighbors, which may be built more than once
+    concurrently, with all but one of the equal results discarded.
+    """
+
+    cfg_file_stats: Dict[str, CfgFileStat]  # mapping file path to its state when ingested
+    parsed_cfg_files: Dict[str, CfgNode]  # mapping file path to parsed data
+
+    # Mapping file path to the kind of tokens it defined: "part", "resource", "technology",
+    # or "other" if none. Only includes files in a cfg format we recognize.
+    cfg_file_categories: Dict[str, str]
+
+    # If set, the approximate number of bytes of parsed_cfg_files to keep in memory.
+    # Files that define no tokens are then dropped right after ingestion. Other files are kept
+    # in least-recently-used order within the budget, and re-read from disk when needed again.
+    cfg_file_memory_budget: Optional[int]
+    cfg_file_sizes: Dict[str, int]  # estimated size of each kept file, if using a budget
+    _retained_cfg_file_bytes: int  # sum of cfg_file_sizes
+    _cfg_file_lock: Lock
 
     # Part data management
     parts: List[KerbalConfigToken]  # authoritative list of all known parts
@@ -57,10 +143,58 @@ class KerbalDataManager:
     technologies: List[KerbalConfigToken]  # authoritative list of all known techs
     technologies_by_name: Dict[str, KerbalConfigToken]  # index of technologies by display name
     technologies_by_id: Dict[str, KerbalConfigToken]  # index of technologies by internal id
+
+    # Reverse prerequisite edges: techs that have the keyed tech id as a prerequisite.
+    mandatory_dependents_by_technology_id: Dict[str, List[KerbalConfigToken]]
+    any_of_dependents_by_technology_id: Dict[str, List[KerbalConfigToken]]
+
+    # Built on first use, and discarded whenever more technologies are ingested.
+    technology_prerequisite_closure: Optional[TechPrerequisiteClosure]
     # End technology data management
 
-    def __init__(self) -> None:
+    # Part neighbor data management: each part's neighbor tokens are built at most once,
+    # on first use, and then shared by all subsequent traversals of that part's edges.
+    # Parts are keyed by their origin config file path, since each file defines at most one part.
+    # The cached lists must never be mutated.
+    engine_modules_by_part_cfg_file_path: Dict[str, List[KerbalConfigToken]]
+    default_resources_by_part_cfg_file_path: Dict[str, List[KerbalConfigToken]]
+    data_transmitters_by_part_cfg_file_path: Dict[str, List[KerbalConfigToken]]
+    # End part neighbor data management
+
+    # Sorted indexes over numeric token fields, keyed by type name and field name.
+    # Engine modules are extracted and indexed at ingestion time, since their fields are indexed.
+    numeric_field_indexes: Dict[Tuple[str, str], NumericFieldIndex[KerbalConfigToken]]
+
+    # Trigram indexes over string token fields, for substring lookups.
+    substring_indexes: Dict[Tuple[str, str], SubstringIndex[KerbalConfigToken]]
+
+    # Sorted indexes over other token fields, built on first use.
+    sorted_field_indexes: Dict[Tuple[str, str], SortedFieldIndex[KerbalConfigToken]]
+
+    # Numeric token fields and edges in columnar form. Parts' default resources are also
+    # extracted at ingestion time, so that the columns cover them too.
+    columnar_store_builder: ColumnarStoreBuilder
+
+    # Lazy ingestion: the files that may define tokens of each type, and are yet to be ingested.
+    # A type is removed once its files are ingested, which happens the first time it is needed.
+    # Files that define more than one type are ingested in full the first time any of them is.
+    pending_cfg_file_paths_by_type: Dict[str, List[str]]
+    lazy_ingestion_max_workers: Optional[int]
+
+    # Set once ingestion is complete, after which no more files may be ingested explicitly.
+    frozen: bool
+
+    # Guards all lazy initialization: deferred ingestion, and building derived data on first use.
+    _lazy_init_lock: RLock
+
+    def __init__(self, *, cfg_file_memory_budget: Optional[int] = None) -> None:
+        self.cfg_file_stats = {}
         self.parsed_cfg_files = {}
+        self.cfg_file_categories = {}
+        self.cfg_file_memory_budget = cfg_file_memory_budget
+        self.cfg_file_sizes = {}
+        self._retained_cfg_file_bytes = 0
+        self._cfg_file_lock = Lock()
 
         self.parts = []
         self.parts_by_cfg_file_path = {}
@@ -74,30 +208,430 @@ class KerbalDataManager:
         self.technologies = []
         self.technologies_by_name = {}
         self.technologies_by_id = {}
+        self.mandatory_dependents_by_technology_id = {}
+        self.any_of_dependents_by_technology_id = {}
+        self.technology_prerequisite_closure = None
+
+        self.engine_modules_by_part_cfg_file_path = {}
+        self.default_resources_by_part_cfg_file_path = {}
+        self.data_transmitters_by_part_cfg_file_path = {}
+
+        self.numeric_field_indexes = {
+            (type_name, field_name): NumericFieldIndex()
+            for type_name, field_names in _numeric_indexed_fields.items()
+            for field_name in field_names
+        }
+        self.substring_indexes = {
+            (type_name, field_name): SubstringIndex()
+            for type_name, field_names in _substring_indexed_fields.items()
+            for field_name in field_names
+        }
+        self.sorted_field_indexes = {}
+
+        self.columnar_store_builder = ColumnarStoreBuilder()
+
+        self.pending_cfg_file_paths_by_type = {}
+        self.lazy_ingestion_max_workers = None
+
+        self.frozen = False
+        self._lazy_init_lock = RLock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = dict(self.__dict__)
+        del state["_lazy_init_lock"]
+        del state["_cfg_file_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lazy_init_lock = RLock()
+        self._cfg_file_lock = Lock()
+
+    @classmethod
+    def from_ksp_install_path(
+        cls: Type[T],
+        ksp_install_path: str,
+        *,
+        snapshot_path: Optional[str] = None,
+        verify_content_hashes: bool = False,
+        max_workers: Optional[int] = None,
+        lazy_ingestion: bool = False,
+        cfg_file_memory_budget: Optional[int] = None,
+    ) -> T:
+        # If max_workers is set, parsing and token extraction are spread across a pool of
+        # that many processes. Results are always indexed in file discovery order,
+        # so the outcome is identical to the serial ingestion that happens by default.
+        #
+        # With lazy_ingestion, files are only checked for the sections that define each type,
+        # and the files for a type are parsed and ingested the first time that type is needed.
+        # Snapshots always contain all types, so lazy ingestion does not apply to them.
+        # The memory budget does apply to snapshots, whatever budget they were made with.
+        cfg_file_paths = _get_canonicalized_cfg_file_paths(ksp_install_path)
+
+        if snapshot_path is None:
+            result = cls(cfg_file_memory_budget=cfg_file_memory_budget)
+            if lazy_ingestion:
+                result._defer_cfg_file_ingestion(cfg_file_paths, max_workers=max_workers)
+            else:
+                result._ingest_cfg_files(cfg_file_paths, max_workers=max_workers)
+            result.freeze()
+            return result
+
+        # The install's current file states are cheap to compute, unless we are also asked
+        # to hash the file contents. Any difference from the snapshot's file states means
+        # we have to rebuild, though we can still reuse the snapshot's parsed data for files
+        # that are unchanged. Deleted files are simply not ingested again.
+        current_cfg_file_stats: Dict[str, CfgFileStat] = {
+            cfg_file_path: get_cfg_file_stat(cfg_file_path, with_content_hash=verify_content_hashes)
+            for cfg_file_path in cfg_file_paths
+        }
+
+        snapshot = cls.load_snapshot(snapshot_path)
+        if snapshot is not None and snapshot.cfg_file_stats == current_cfg_file_stats:
+            with snapshot._cfg_file_lock:
+                snapshot._set_cfg_file_memory_budget(cfg_file_memory_budget)
+            snapshot.freeze()
+            return snapshot
+
+        # Snapshots made with a memory budget may not have kept all parsed files.
+        # Files without parsed data in the snapshot are simply parsed again.
+        reusable_cfg_files: Dict[str, Optional[CfgNode]] = {}
+        if snapshot is not None:
+            for cfg_file_path, cfg_file_stat in current_cfg_file_stats.items():
+                if (
+                    snapshot.cfg_file_stats.get(cfg_file_path, None) == cfg_file_stat
+                    and cfg_file_path in snapshot.parsed_cfg_files
+                ):
+                    reusable_cfg_files[cfg_file_path] = snapshot.parsed_cfg_files[cfg_file_path]
+
+        result = cls(cfg_file_memory_budget=cfg_file_memory_budget)
+        result._ingest_cfg_files(
+            cfg_file_paths,
+            cfg_file_stats=current_cfg_file_stats,
+            reusable_cfg_files=reusable_cfg_files,
+            max_workers=max_workers,
+        )
+        result.freeze()
+        result.save_snapshot(snapshot_path)
+        return result
 
     @classmethod
-    def from_ksp_install_path(cls: Type[T], ksp_install_path: str) -> T:
-        result = cls()
+    def load_snapshot(cls: Type[T], snapshot_path: str) -> Optional[T]:
+        """Load a data manager snapshot, or return None if it is missing or unusable."""
+        snapshot = read_snapshot(snapshot_path)
+        if not isinstance(snapshot, cls):
+            return None
+        return snapshot
+
+    def save_snapshot(self, snapshot_path: str) -> None:
+        for type_name in list(self.pending_cfg_file_paths_by_type):
+            self.ensure_ingested(type_name)
+        write_snapshot(self, snapshot_path)
+
+    def freeze(self) -> None:
+        """Mark ingestion as complete. Afterward, the data manager may be shared across threads."""
+        self._flush_field_indexes()
+        self.frozen = True
+
+    def ensure_ingested(self, type_name: str) -> None:
+        """Ingest all files that may define tokens of the given type, if lazy ingestion is used."""
+        type_name = _ingestion_type_names.get(type_name, type_name)
+        if type_name not in self.pending_cfg_file_paths_by_type:
+            return
 
-        for cfg_file in get_cfg_files_recursively(ksp_install_path):
-            result.ingest_cfg_file(cfg_file)
+        with self._lazy_init_lock:
+            pending_cfg_file_paths = self.pending_cfg_file_paths_by_type.get(type_name, None)
+            if pending_cfg_file_paths is None:
+                # Another thread ingested them while we were waiting for the lock.
+                return
 
-        return result
+            self._ingest_cfg_files(
+                pending_cfg_file_paths, max_workers=self.lazy_ingestion_max_workers
+            )
+            # Only mark the type as ingested once all its data is in place,
+            # since other threads check this without holding the lock.
+            del self.pending_cfg_file_paths_by_type[type_name]
+
+    def get_parsed_cfg_file(self, canonicalized_path: str) -> CfgNode:
+        """Return the parsed data of an ingested file, re-reading it from disk if it was dropped."""
+        with self._cfg_file_lock:
+            cfg_file = self.parsed_cfg_files.get(canonicalized_path, None)
+            if cfg_file is not None:
+                if self.cfg_file_memory_budget is not None:
+                    # Mark the file as the most recently used one.
+                    del self.parsed_cfg_files[canonicalized_path]
+                    self.parsed_cfg_files[canonicalized_path] = cfg_file
+                return cfg_file
+
+        if canonicalized_path not in self.cfg_file_categories:
+            raise KeyError(
+                f"File was not ingested, or is not in a recognized format: {canonicalized_path}"
+            )
+
+        # The file must not have changed since it was ingested, or its data would be inconsistent
+        # with the tokens we already have. The ingested state may include a content hash,
+        # so compare only the cheap parts of it.
+        ingested_stat = self.cfg_file_stats[canonicalized_path]
+        current_stat = get_cfg_file_stat(canonicalized_path, with_content_hash=False)
+        if (current_stat.size, current_stat.mtime_ns) != (
+            ingested_stat.size,
+            ingested_stat.mtime_ns,
+        ):
+            raise AssertionError(
+                f"File {canonicalized_path} was modified after it was ingested, and its parsed "
+                f"data was dropped to stay within the memory budget. Please reload the data."
+            )
+
+        cfg_file = parse_cfg_node_tree(canonicalized_path)
+        assert cfg_file is not None
+        with self._cfg_file_lock:
+            self._retain_cfg_file(canonicalized_path, cfg_file)
+        return cfg_file
+
+    def get_cfg_file_memory_usage(self) -> Dict[str, int]:
+        """Return the estimated bytes of parsed file data kept in memory, by file category."""
+        with self._cfg_file_lock:
+            retained_cfg_files = list(self.parsed_cfg_files.items())
+
+        memory_usage: Dict[str, int] = {}
+        for canonicalized_path, cfg_file in retained_cfg_files:
+            category = self.cfg_file_categories[canonicalized_path]
+            size = self.cfg_file_sizes.get(canonicalized_path, None)
+            if size is None:
+                size = estimate_cfg_node_size(cfg_file)
+            memory_usage[category] = memory_usage.get(category, 0) + size
+        return memory_usage
+
+    def _retain_cfg_file(self, canonicalized_path: str, cfg_file: CfgNode) -> None:
+        # N.B.: Must be called while holding the parsed file lock.
+        memory_budget = self.cfg_file_memory_budget
+        if memory_budget is None:
+            self.parsed_cfg_files[canonicalized_path] = cfg_file
+            return
+
+        self.parsed_cfg_files.pop(canonicalized_path, None)
+        self._retained_cfg_file_bytes -= self.cfg_file_sizes.pop(canonicalized_path, 0)
+        self.parsed_cfg_files[canonicalized_path] = cfg_file
+        cfg_file_size = estimate_cfg_node_size(cfg_file)
+        self.cfg_file_sizes[canonicalized_path] = cfg_file_size
+        self._retained_cfg_file_bytes += cfg_file_size
+
+        self._drop_cfg_files_over_budget(memory_budget)
+
+    def _drop_cfg_files_over_budget(self, memory_budget: int) -> None:
+        # N.B.: Must be called while holding the parsed file lock.
+        # Drop the least recently used files until we are within budget,
+        # though always keeping the most recently used one.
+        while self._retained_cfg_file_bytes > memory_budget and len(self.parsed_cfg_files) > 1:
+            dropped_path = next(iter(self.parsed_cfg_files))
+            del self.parsed_cfg_files[dropped_path]
+            self._retained_cfg_file_bytes -= self.cfg_file_sizes.pop(dropped_path)
+
+    def _set_cfg_file_memory_budget(self, cfg_file_memory_budget: Optional[int]) -> None:
+        # N.B.: Must be called while holding the parsed file lock.
+        # Used on loaded snapshots, which may have been made with a different budget or none.
+        self.cfg_file_memory_budget = cfg_file_memory_budget
+        if cfg_file_memory_budget is None:
+            self.cfg_file_sizes = {}
+            self._retained_cfg_file_bytes = 0
+            return
+
+        for canonicalized_path in list(self.parsed_cfg_files):
+            if self.cfg_file_categories.get(canonicalized_path, None) == "other":
+                del self.parsed_cfg_files[canonicalized_path]
+
+        self.cfg_file_sizes = {
+            canonicalized_path: estimate_cfg_node_size(cfg_file)
+            for canonicalized_path, cfg_file in self.parsed_cfg_files.items()
+        }
+        self._retained_cfg_file_bytes = sum(self.cfg_file_sizes.values())
+        self._drop_cfg_files_over_budget(cfg_file_memory_budget)
+
+    def get_root_tokens(self, type_name: str) -> List[KerbalConfigToken]:
+        self.ensure_ingested(type_name)
+        if type_name == "Part":
+            return self.parts
+        elif type_name == "Resource":
+            return self.resources
+        elif type_name == "Technology":
+            return self.technologies
+        else:
+            raise NotImplementedError(type_name)
+
+    def get_sorted_field_index(
+        self, type_name: str, field_name: str
+    ) -> SortedFieldIndex[KerbalConfigToken]:
+        self.ensure_ingested(type_name)
+
+        index_key = (type_name, field_name)
+        numeric_index = self.numeric_field_indexes.get(index_key, None)
+        if numeric_index is not None:
+            return numeric_index
+
+        index = self.sorted_field_indexes.get(index_key, None)
+        if index is None:
+            with self._lazy_init_lock:
+                index = self.sorted_field_indexes.get(index_key, None)
+                if index is None:
+                    index = SortedFieldIndex(
+                        [
+                            (token.content.get(field_name, None), token)
+                            for token in self.get_root_tokens(type_name)
+                        ]
+                    )
+                    self.sorted_field_indexes[index_key] = index
+        return index
+
+    def find_tokens_with_substring(
+        self, type_name: str, field_name: str, substring: str, *, case_sensitive: bool = True
+    ) -> Optional[List[KerbalConfigToken]]:
+        """Return the tokens whose field value contains the substring, or None if not indexed."""
+        self.ensure_ingested(type_name)
+        index = self.substring_indexes.get((type_name, field_name), None)
+        if index is None:
+            return None
+        return index.find(substring, case_sensitive=case_sensitive)
+
+    def get_technology_prerequisite_closure(self) -> TechPrerequisiteClosure:
+        self.ensure_ingested("Technology")
+        closure = self.technology_prerequisite_closure
+        if closure is None:
+            with self._lazy_init_lock:
+                closure = self.technology_prerequisite_closure
+                if closure is None:
+                    closure = TechPrerequisiteClosure(self.technologies)
+                    self.technology_prerequisite_closure = closure
+        return closure
+
+    def get_columnar_store(self) -> ColumnarStore:
+        """Return NumPy arrays of numeric token fields. Requires the optional NumPy dependency."""
+        for type_name in ("Part", "Resource"):
+            self.ensure_ingested(type_name)
+        with self._lazy_init_lock:
+            return self.columnar_store_builder.build()
+
+    def materialize_part_neighbors(self) -> None:
+        """Eagerly build the neighbor tokens of all parts, instead of on first use."""
+        self.ensure_ingested("Part")
+        for part_token in self.parts:
+            get_engine_modules_for_part(self, part_token)
+            get_default_resources_for_part(self, part_token)
+            get_data_transmitter_for_part(self, part_token)
 
     def ingest_cfg_file(self, file_path: str) -> None:
+        if self.frozen:
+            raise AssertionError(f"Cannot ingest {file_path} into a frozen data manager.")
+
         canonicalized_path = _canonicalize_path(file_path)
-        if canonicalized_path in self.parsed_cfg_files:
+        if canonicalized_path in self.cfg_file_stats:
             # All done, this is a no-op.
             return
 
-        cfg_file = parse_cfg_file(canonicalized_path)
+        cfg_file_stat = get_cfg_file_stat(canonicalized_path, with_content_hash=False)
+        extracted_cfg_file = _parse_and_extract_cfg_file(canonicalized_path)
+        self._index_extracted_cfg_file(canonicalized_path, cfg_file_stat, extracted_cfg_file)
+
+    def _defer_cfg_file_ingestion(
+        self, canonicalized_paths: List[str], *, max_workers: Optional[int] = None
+    ) -> None:
+        section_names = frozenset(_section_names_by_type.values())
+        for canonicalized_path in canonicalized_paths:
+            found_section_names = sniff_section_names(canonicalized_path, section_names)
+            for type_name, section_name in _section_names_by_type.items():
+                if section_name in found_section_names:
+                    self.pending_cfg_file_paths_by_type.setdefault(type_name, []).append(
+                        canonicalized_path
+                    )
+
+        self.lazy_ingestion_max_workers = max_workers
+
+    def _ingest_cfg_files(
+        self,
+        canonicalized_paths: List[str],
+        *,
+        cfg_file_stats: Optional[Dict[str, CfgFileStat]] = None,
+        reusable_cfg_files: Optional[Dict[str, Optional[CfgNode]]] = None,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        if cfg_file_stats is None:
+            cfg_file_stats = {}
+        if reusable_cfg_files is None:
+            reusable_cfg_files = {}
+
+        paths_to_parse = [
+            canonicalized_path
+            for canonicalized_path in canonicalized_paths
+            if canonicalized_path not in self.cfg_file_stats
+            and canonicalized_path not in reusable_cfg_files
+        ]
+
+        extracted_cfg_files: Dict[str, _ExtractedCfgFile] = {}
+        if max_workers is not None and paths_to_parse:
+            # Send each worker several reasonably-sized batches of files, to amortize
+            # the inter-process communication overhead while still balancing the load.
+            chunk_size = max(1, len(paths_to_parse) // (max_workers * 4))
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                extracted_cfg_files = dict(
+                    zip(
+                        paths_to_parse,
+                        executor.map(
+                            _parse_and_extract_cfg_file, paths_to_parse, chunksize=chunk_size
+                        ),
+                    )
+                )
+
+        for canonicalized_path in canonicalized_paths:
+            if canonicalized_path in self.cfg_file_stats:
+                # Already ingested, this is a no-op.
+                continue
+
+            cfg_file_stat = cfg_file_stats.get(canonicalized_path, None)
+            if cfg_file_stat is None:
+                cfg_file_stat = get_cfg_file_stat(canonicalized_path, with_content_hash=False)
+
+            extracted_cfg_file = extracted_cfg_files.get(canonicalized_path, None)
+            if extracted_cfg_file is None:
+                if canonicalized_path in reusable_cfg_files:
+                    extracted_cfg_file = _extract_cfg_file(
+                        canonicalized_path, reusable_cfg_files[canonicalized_path]
+                    )
+                else:
+                    extracted_cfg_file = _parse_and_extract_cfg_file(canonicalized_path)
+
+            self._index_extracted_cfg_file(canonicalized_path, cfg_file_stat, extracted_cfg_file)
+
+        # Lazy ingestion happens after the data manager is frozen, when it may already be shared.
+        self._flush_field_indexes()
+
+    def _index_extracted_cfg_file(
+        self,
+        canonicalized_path: str,
+        cfg_file_stat: CfgFileStat,
+        extracted_cfg_file: "_ExtractedCfgFile",
+    ) -> None:
+        self.cfg_file_stats[canonicalized_path] = cfg_file_stat
+
+        cfg_file = extracted_cfg_file.cfg_file
         if cfg_file is None:
             # This is not a cfg file format we recognize. Nothing to be done.
             return
 
-        self.parsed_cfg_files[canonicalized_path] = cfg_file
-
-        part_token = make_part_token(canonicalized_path, cfg_file)
+        if extracted_cfg_file.part_token is not None:
+            category = "part"
+        elif extracted_cfg_file.resource_tokens:
+            category = "resource"
+        elif extracted_cfg_file.technology_tokens:
+            category = "technology"
+        else:
+            category = "other"
+        self.cfg_file_categories[canonicalized_path] = category
+
+        # With a memory budget, files that define no tokens are never needed again.
+        if self.cfg_file_memory_budget is None or category != "other":
+            with self._cfg_file_lock:
+                self._retain_cfg_file(canonicalized_path, cfg_file)
+
+        part_token = extracted_cfg_file.part_token
         if part_token is not None:
             part_name = part_token.content["name"]
             part_internal_name = part_token.content["internal_name"]
@@ -106,9 +640,40 @@ class KerbalDataManager:
             _set_without_overwriting(self.parts_by_cfg_file_path, canonicalized_path, part_token)
             self.parts_by_internal_name.setdefault(part_internal_name, []).append(part_token)
             self.parts_by_name.setdefault(part_name, []).append(part_token)
+            self._index_token_fields(part_token)
+            part_row_id = self.columnar_store_builder.add_token(part_token)
 
-        resource_tokens = make_resource_tokens(canonicalized_path, cfg_file)
-        for resource_token in resource_tokens:
+            engine_module_tokens = extracted_cfg_file.engine_module_tokens
+            _set_without_overwriting(
+                self.engine_modules_by_part_cfg_file_path, canonicalized_path, engine_module_tokens
+            )
+            for engine_module_token in engine_module_tokens:
+                self._index_token_fields(engine_module_token)
+                engine_module_row_id = self.columnar_store_builder.add_token(engine_module_token)
+                self.columnar_store_builder.add_edge(
+                    "Part_EngineModule", part_row_id, engine_module_row_id
+                )
+
+            default_resource_tokens = extracted_cfg_file.default_resource_tokens
+            _set_without_overwriting(
+                self.default_resources_by_part_cfg_file_path,
+                canonicalized_path,
+                default_resource_tokens,
+            )
+            for default_resource_token in default_resource_tokens:
+                default_resource_row_id = self.columnar_store_builder.add_token(
+                    default_resource_token
+                )
+                self.columnar_store_builder.add_edge(
+                    "Part_HasDefaultResource", part_row_id, default_resource_row_id
+                )
+                self.columnar_store_builder.add_keyed_edge(
+                    "ContainedResource_Resource",
+                    default_resource_row_id,
+                    default_resource_token.foreign_keys["resource_internal_name"],
+                )
+
+        for resource_token in extracted_cfg_file.resource_tokens:
             resource_name = resource_token.content["name"]
             resource_internal_name = resource_token.content["internal_name"]
 
@@ -117,144 +682,294 @@ class KerbalDataManager:
             _set_without_overwriting(
                 self.resources_by_internal_name, resource_internal_name, resource_token
             )
+            self._index_token_fields(resource_token)
+            self.columnar_store_builder.add_token(resource_token)
 
-        technology_tokens = make_technology_tokens(canonicalized_path, cfg_file)
-        for technology_token in technology_tokens:
+        for technology_token in extracted_cfg_file.technology_tokens:
             technology_name = technology_token.content["name"]
             technology_id = technology_token.content["id"]
 
             self.technologies.append(technology_token)
             _set_without_overwriting(self.technologies_by_name, technology_name, technology_token)
             _set_without_overwriting(self.technologies_by_id, technology_id, technology_token)
+            for prereq_id in technology_token.foreign_keys["mandatory_prereq_ids"]:
+                self.mandatory_dependents_by_technology_id.setdefault(prereq_id, []).append(
+                    technology_token
+                )
+            for prereq_id in technology_token.foreign_keys["any_of_prereq_ids"]:
+                self.any_of_dependents_by_technology_id.setdefault(prereq_id, []).append(
+                    technology_token
+                )
+            self.technology_prerequisite_closure = None
+            self._index_token_fields(technology_token)
+
+    def _index_token_fields(self, token: KerbalConfigToken) -> None:
+        for field_name in _numeric_indexed_fields.get(token.type_name, ()):
+            self.numeric_field_indexes[(token.type_name, field_name)].add(
+                token.content[field_name], token
+            )
+        for field_name in _substring_indexed_fields.get(token.type_name, ()):
+            self.substring_indexes[(token.type_name, field_name)].add(
+                token.content[field_name], token
+            )
+
+    def _flush_field_indexes(self) -> None:
+        for numeric_index in self.numeric_field_indexes.values():
+            numeric_index.flush()
+
+
+class _ExtractedCfgFile(NamedTuple):
+    cfg_file: Optional[CfgNode]  # None if the file is not in a format we recognize
+    part_token: Optional[KerbalConfigToken]
+    engine_module_tokens: List[KerbalConfigToken]  # the part's engine modules, if any
+    default_resource_tokens: List[KerbalConfigToken]  # the part's default resources, if any
+    resource_tokens: List[KerbalConfigToken]
+    technology_tokens: List[KerbalConfigToken]
+
+
+def _get_canonicalized_cfg_file_paths(ksp_install_path: str) -> List[str]:
+    # Different discovered paths may canonicalize to the same file, e.g. via symbolic links.
+    # Only keep the first occurrence of each file, preserving the discovery order.
+    canonicalized_paths: Dict[str, None] = {}
+    for cfg_file in get_cfg_files_recursively(ksp_install_path):
+        canonicalized_paths.setdefault(_canonicalize_path(cfg_file), None)
+    return list(canonicalized_paths)
+
+
+def _extract_cfg_file(canonicalized_path: str, cfg_file: Optional[CfgNode]) -> _ExtractedCfgFile:
+    if cfg_file is None:
+        return _ExtractedCfgFile(None, None, [], [], [], [])
+
+    part_token = make_part_token(canonicalized_path, cfg_file)
+    engine_module_tokens: List[KerbalConfigToken] = []
+    default_resource_tokens: List[KerbalConfigToken] = []
+    if part_token is not None:
+        part_node = cfg_file.get_node(part_token.from_cfg_root)
+        engine_module_tokens = _make_engine_module_tokens_for_part(part_token, part_node)
+        default_resource_tokens = _make_default_resource_tokens_for_part(part_token, part_node)
+
+    return _ExtractedCfgFile(
+        cfg_file,
+        part_token,
+        engine_module_tokens,
+        default_resource_tokens,
+        make_resource_tokens(canonicalized_path, cfg_file),
+        make_technology_tokens(canonicalized_path, cfg_file),
+    )
+
+
+def _parse_and_extract_cfg_file(canonicalized_path: str) -> _ExtractedCfgFile:
+    # N.B.: This function runs in worker processes during parallel ingestion,
+    #       so it must remain a picklable module-level function.
+    return _extract_cfg_file(canonicalized_path, parse_cfg_node_tree(canonicalized_path))
+
+
+def _get_cfg_node_for_token(
+    data_manager: KerbalDataManager, token: KerbalConfigToken
+) -> Optional[CfgNode]:
+    cfg_file = data_manager.get_parsed_cfg_file(token.from_cfg_file_path)
+    return cfg_file.get_node(token.from_cfg_root)
 
 
 def _make_engine_module_token(
-    data_manager: KerbalDataManager, cfg_file_path: str, cfg_path_root: CfgKey,
+    cfg_file_path: str, cfg_path_root: CfgKey, module_node: CfgNode,
 ) -> KerbalConfigToken:
-    parsed_cfg_file = data_manager.parsed_cfg_files[cfg_file_path]
     type_name = "EngineModule"
 
     content: Dict[str, Any] = {}
-    content["min_thrust"] = read_float(parsed_cfg_file, cfg_path_root + (("minThrust", 0),))
-    content["max_thrust"] = read_float(parsed_cfg_file, cfg_path_root + (("maxThrust", 0),))
-    content["throttleable"] = not read_bool(
-        parsed_cfg_file, cfg_path_root + (("throttleLocked", 0),), default=False
-    )
+    content["min_thrust"] = read_float(module_node, (("minThrust", 0),))
+    content["max_thrust"] = read_float(module_node, (("maxThrust", 0),))
+    content["throttleable"] = not read_bool(module_node, (("throttleLocked", 0),), default=False)
 
-    atmosphere_curve: Dict[float, float] = {}
-    curve_root_key = cfg_path_root + (("atmosphereCurve", 0),)
+    curve_node = module_node.child("atmosphereCurve")
+    curve_step_count = len(curve_node.value_positions.get("key", ())) if curve_node else 0
 
-    counter = 0
-    curve_step_key = curve_root_key + (("key", counter),)
-    while curve_step_key in parsed_cfg_file:
-        data = read_raw(parsed_cfg_file, curve_step_key)
+    raw_curve_keys: List[str] = []
+    for counter in range(curve_step_count):
+        data = read_raw(curve_node, (("key", counter),))
         assert data is not None
+        raw_curve_keys.append(data)
 
-        components = data.split(" ")
-        assert len(components) >= 2, components
+    # Isp as a function of atmospheric pressure, measured in atmospheres.
+    # This is not a schema field: use evaluate_engine_performance() to evaluate it.
+    atmosphere_curve = parse_float_curve(raw_curve_keys)
+    content["atmosphere_curve"] = atmosphere_curve
 
-        atmosphere_coefficient = float(components[0])
-        isp = float(components[1])
-        atmosphere_curve[atmosphere_coefficient] = isp
+    # If the curve has multiple keys at the same pressure, the last one wins.
+    isp_by_pressure = dict(zip(atmosphere_curve.times, atmosphere_curve.values))
+    content["isp_vacuum"] = isp_by_pressure.get(0.0, None)
+    content["isp_at_1atm"] = isp_by_pressure.get(1.0, None)
 
-        counter += 1
-        curve_step_key = curve_root_key + (("key", counter),)
+    return KerbalConfigToken(type_name, content, {}, cfg_file_path, cfg_path_root)
 
-    content["isp_vacuum"] = atmosphere_curve.get(0.0, None)
-    content["isp_at_1atm"] = atmosphere_curve.get(1.0, None)
 
-    return KerbalConfigToken(type_name, content, {}, cfg_file_path, cfg_path_root)
+def evaluate_engine_performance(
+    engine_module_tokens: Sequence[KerbalConfigToken], pressures: Sequence[float]
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Compute each engine module's Isp and max thrust at each pressure, measured in atmospheres.
+
+    Returns a pair of (engine modules, pressures) arrays: Isp and max thrust. An engine's fuel flow
+    is fixed, so its thrust scales with its Isp relative to its vacuum Isp.
+    Requires the optional NumPy dependency.
+    """
+    for token in engine_module_tokens:
+        assert token.type_name == "EngineModule", token
+
+    isp = evaluate_float_curves(
+        [token.content["atmosphere_curve"] for token in engine_module_tokens], pressures
+    )
+    max_thrust = (
+        isp
+        * _float_column(engine_module_tokens, "max_thrust")[:, None]
+        / _float_column(engine_module_tokens, "isp_vacuum")[:, None]
+    )
+    return isp, max_thrust
+
+
+def _float_column(tokens: Sequence[KerbalConfigToken], field_name: str) -> "np.ndarray":
+    numpy = import_numpy()
+    return numpy.array(
+        [
+            numpy.nan if token.content[field_name] is None else token.content[field_name]
+            for token in tokens
+        ],
+        dtype=numpy.float64,
+    )
+
+
+def _get_named_child_nodes(parent_node: Optional[CfgNode], section_name: str) -> List[CfgNode]:
+    # Only sections that have a name are meaningful, and we stop at the first one that doesn't.
+    if parent_node is None:
+        return []
+
+    results: List[CfgNode] = []
+    for child_node in parent_node.children_named(section_name):
+        if child_node.get_value("name") is None:
+            break
+        results.append(child_node)
+    return results
+
+
+def _get_memoized_part_neighbors(
+    data_manager: KerbalDataManager,
+    token: KerbalConfigToken,
+    cache: Dict[str, List[KerbalConfigToken]],
+    extractor: Callable[[KerbalDataManager, KerbalConfigToken], List[KerbalConfigToken]],
+) -> List[KerbalConfigToken]:
+    assert token.type_name == "Part"
+
+    neighbors = cache.get(token.from_cfg_file_path, None)
+    if neighbors is None:
+        # Concurrent first uses may both build the neighbors. That's wasteful but harmless,
+        # since the results are equal; only one of them is kept and reused afterward.
+        neighbors = cache.setdefault(token.from_cfg_file_path, extractor(data_manager, token))
+    return neighbors
 
 
 def get_engine_modules_for_part(
     data_manager: KerbalDataManager, token: KerbalConfigToken
 ) -> List[KerbalConfigToken]:
-    assert token.type_name == "Part"
+    return _get_memoized_part_neighbors(
+        data_manager,
+        token,
+        data_manager.engine_modules_by_part_cfg_file_path,
+        _extract_engine_modules_for_part,
+    )
+
+
+def get_default_resources_for_part(
+    data_manager: KerbalDataManager, token: KerbalConfigToken
+) -> List[KerbalConfigToken]:
+    return _get_memoized_part_neighbors(
+        data_manager,
+        token,
+        data_manager.default_resources_by_part_cfg_file_path,
+        _extract_default_resources_for_part,
+    )
 
-    results: List[KerbalConfigToken] = []
 
-    parsed_cfg_file = data_manager.parsed_cfg_files[token.from_cfg_file_path]
+def get_data_transmitter_for_part(
+    data_manager: KerbalDataManager, token: KerbalConfigToken
+) -> List[KerbalConfigToken]:
+    return _get_memoized_part_neighbors(
+        data_manager,
+        token,
+        data_manager.data_transmitters_by_part_cfg_file_path,
+        _extract_data_transmitter_for_part,
+    )
+
+
+def _extract_engine_modules_for_part(
+    data_manager: KerbalDataManager, token: KerbalConfigToken
+) -> List[KerbalConfigToken]:
+    assert token.type_name == "Part"
+    return _make_engine_module_tokens_for_part(token, _get_cfg_node_for_token(data_manager, token))
 
-    cfg_key_base = token.from_cfg_root
-    counter = 0
 
-    cfg_key = cfg_key_base + (("MODULE", counter),)
-    module_name_key = cfg_key + (("name", 0),)
+def _make_engine_module_tokens_for_part(
+    token: KerbalConfigToken, part_node: Optional[CfgNode]
+) -> List[KerbalConfigToken]:
+    results: List[KerbalConfigToken] = []
 
-    while module_name_key in parsed_cfg_file:
-        if parsed_cfg_file.get(module_name_key, "") in {"ModuleEngines", "ModuleEnginesFX"}:
+    for module_node in _get_named_child_nodes(part_node, "MODULE"):
+        if module_node.get_value("name") in {"ModuleEngines", "ModuleEnginesFX"}:
+            cfg_key = token.from_cfg_root + (("MODULE", module_node.index),)
             results.append(
-                _make_engine_module_token(data_manager, token.from_cfg_file_path, cfg_key)
+                _make_engine_module_token(token.from_cfg_file_path, cfg_key, module_node)
             )
 
-        counter += 1
-        cfg_key = cfg_key_base + (("MODULE", counter),)
-        module_name_key = cfg_key + (("name", 0),)
-
     return results
 
 
 def _make_contained_resource_token(
-    data_manager: KerbalDataManager, cfg_file_path: str, cfg_path_root: CfgKey,
+    cfg_file_path: str, cfg_path_root: CfgKey, resource_node: CfgNode,
 ) -> KerbalConfigToken:
-    parsed_cfg_file = data_manager.parsed_cfg_files[cfg_file_path]
     type_name = "ContainedResource"
 
     content: Dict[str, Any] = {
-        "amount": read_float(parsed_cfg_file, cfg_path_root + (("amount", 0),)),
-        "max_amount": read_float(parsed_cfg_file, cfg_path_root + (("maxAmount", 0),)),
+        "amount": read_float(resource_node, (("amount", 0),)),
+        "max_amount": read_float(resource_node, (("maxAmount", 0),)),
     }
     foreign_keys: Dict[str, Any] = {
-        "resource_internal_name": read_str(parsed_cfg_file, cfg_path_root + (("name", 0),)),
+        "resource_internal_name": read_str(resource_node, (("name", 0),)),
     }
 
     return KerbalConfigToken(type_name, content, foreign_keys, cfg_file_path, cfg_path_root)
 
 
-def get_default_resources_for_part(
+def _extract_default_resources_for_part(
     data_manager: KerbalDataManager, token: KerbalConfigToken,
 ) -> List[KerbalConfigToken]:
     assert token.type_name == "Part"
+    return _make_default_resource_tokens_for_part(
+        token, _get_cfg_node_for_token(data_manager, token)
+    )
 
-    results: List[KerbalConfigToken] = []
-
-    parsed_cfg_file = data_manager.parsed_cfg_files[token.from_cfg_file_path]
-
-    cfg_key_base = token.from_cfg_root
-    counter = 0
 
-    cfg_key = cfg_key_base + (("RESOURCE", counter),)
-    resource_name_key = cfg_key + (("name", 0),)
+def _make_default_resource_tokens_for_part(
+    token: KerbalConfigToken, part_node: Optional[CfgNode]
+) -> List[KerbalConfigToken]:
+    results: List[KerbalConfigToken] = []
 
-    while resource_name_key in parsed_cfg_file:
+    for resource_node in _get_named_child_nodes(part_node, "RESOURCE"):
+        cfg_key = token.from_cfg_root + (("RESOURCE", resource_node.index),)
         results.append(
-            _make_contained_resource_token(data_manager, token.from_cfg_file_path, cfg_key)
+            _make_contained_resource_token(token.from_cfg_file_path, cfg_key, resource_node)
         )
 
-        counter += 1
-        cfg_key = cfg_key_base + (("RESOURCE", counter),)
-        resource_name_key = cfg_key + (("name", 0),)
-
     return results
 
 
-def get_data_transmitter_for_part(
+def _extract_data_transmitter_for_part(
     data_manager: KerbalDataManager, token: KerbalConfigToken,
 ) -> List[KerbalConfigToken]:
     assert token.type_name == "Part"
 
     data_transmitter: Optional[KerbalConfigToken] = None
 
-    parsed_cfg_file = data_manager.parsed_cfg_files[token.from_cfg_file_path]
-
-    cfg_key_base = token.from_cfg_root
-
-    counter = 0
-    cfg_key_root = cfg_key_base + (("MODULE", counter),)
-    module_name_key = cfg_key_root + (("name", 0),)
-
-    while module_name_key in parsed_cfg_file:
-        if read_str(parsed_cfg_file, module_name_key) == "ModuleDataTransmitter":
+    part_node = _get_cfg_node_for_token(data_manager, token)
+    for module_node in _get_named_child_nodes(part_node, "MODULE"):
+        if read_str(module_node, (("name", 0),)) == "ModuleDataTransmitter":
             assert (
                 data_transmitter is None
             ), f"Unexpectedly found part with multiple transmitter modules: {token}"
@@ -264,25 +979,19 @@ def get_data_transmitter_for_part(
                 "DIRECT": "DirectAntennaModule",
                 "RELAY": "RelayAntennaModule",
             }
-            transmitter_type_key = cfg_key_root + (("antennaType", 0),)
-            transmitter_type_value = read_str(parsed_cfg_file, transmitter_type_key)
+            transmitter_type_value = read_str(module_node, (("antennaType", 0),))
 
             type_name = transmitter_type_mapping[transmitter_type_value]
 
             assert (
-                read_str(parsed_cfg_file, cfg_key_root + (("requiredResource", 0),))
-                == "ElectricCharge"
+                read_str(module_node, (("requiredResource", 0),)) == "ElectricCharge"
             ), f"Unexpectedly found a transmitter that does not use electricity: {token}"
 
             content: Dict[str, Any] = {
-                "power": read_float(parsed_cfg_file, cfg_key_root + (("antennaPower", 0),)),
-                "packet_size": read_float(parsed_cfg_file, cfg_key_root + (("packetSize", 0),)),
-                "packet_cost": read_float(
-                    parsed_cfg_file, cfg_key_root + (("packetResourceCost", 0),)
-                ),
-                "packet_interval": read_float(
-                    parsed_cfg_file, cfg_key_root + (("packetInterval", 0),)
-                ),
+                "power": read_float(module_node, (("antennaPower", 0),)),
+                "packet_size": read_float(module_node, (("packetSize", 0),)),
+                "packet_cost": read_float(module_node, (("packetResourceCost", 0),)),
+                "packet_interval": read_float(module_node, (("packetInterval", 0),)),
             }
             content.update(
                 {
@@ -293,17 +1002,183 @@ def get_data_transmitter_for_part(
                 }
             )
 
+            cfg_key_root = token.from_cfg_root + (("MODULE", module_node.index),)
             data_transmitter = KerbalConfigToken(
                 type_name, content, {}, token.from_cfg_file_path, cfg_key_root
             )
 
-        counter += 1
-        cfg_key_root = cfg_key_base + (("MODULE", counter),)
-        module_name_key = cfg_key_root + (("name", 0),)
-
     if data_transmitter is not None:
         # The contract of these functions as used in the interpreter requires an iterable.
         # We just happen to know that the iterable is always either empty or of size 1.
         return [data_transmitter]
     else:
         return []
+
+
+def get_required_technologies_for_part(
+    data_manager: KerbalDataManager, token: KerbalConfigToken
+) -> List[KerbalConfigToken]:
+    assert token.type_name == "Part"
+    data_manager.ensure_ingested("Technology")
+    return [
+        data_manager.technologies_by_id[tech_id] for tech_id in token.foreign_keys["tech_required"]
+    ]
+
+
+def get_resource_for_contained_resource(
+    data_manager: KerbalDataManager, token: KerbalConfigToken
+) -> List[KerbalConfigToken]:
+    assert token.type_name == "ContainedResource"
+    data_manager.ensure_ingested("Resource")
+    return [data_manager.resources_by_internal_name[token.foreign_keys["resource_internal_name"]]]
+
+
+def get_mandatory_prerequisites_of_technology(
+    data_manager: KerbalDataManager, token: KerbalConfigToken
+) -> List[KerbalConfigToken]:
+    assert token.type_name == "Technology"
+    data_manager.ensure_ingested("Technology")
+    return [
+        data_manager.technologies_by_id[tech_id]
+        for tech_id in token.foreign_keys["mandatory_prereq_ids"]
+    ]
+
+
+def get_any_of_prerequisites_of_technology(
+    data_manager: KerbalDataManager, token: KerbalConfigToken
+) -> List[KerbalConfigToken]:
+    assert token.type_name == "Technology"
+    data_manager.ensure_ingested("Technology")
+    return [
+        data_manager.technologies_by_id[tech_id]
+        for tech_id in token.foreign_keys["any_of_prereq_ids"]
+    ]
+
+
+def get_mandatory_dependents_of_technology(
+    data_manager: KerbalDataManager, token: KerbalConfigToken
+) -> List[KerbalConfigToken]:
+    assert token.type_name == "Technology"
+    data_manager.ensure_ingested("Technology")
+    return data_manager.mandatory_dependents_by_technology_id.get(token.content["id"], [])
+
+
+def get_any_of_dependents_of_technology(
+    data_manager: KerbalDataManager, token: KerbalConfigToken
+) -> List[KerbalConfigToken]:
+    assert token.type_name == "Technology"
+    data_manager.ensure_ingested("Technology")
+    return data_manager.any_of_dependents_by_technology_id.get(token.content["id"], [])
+
+
+def get_transitive_prerequisites_of_technology(
+    data_manager: KerbalDataManager, token: KerbalConfigToken
+) -> List[KerbalConfigToken]:
+    assert token.type_name == "Technology"
+    closure = data_manager.get_technology_prerequisite_closure()
+    return closure.get_transitive_prerequisites(token.content["id"])
+
+
+def get_transitive_dependents_of_technology(
+    data_manager: KerbalDataManager, token: KerbalConfigToken
+) -> List[KerbalConfigToken]:
+    assert token.type_name == "Technology"
+    closure = data_manager.get_technology_prerequisite_closure()
+    return closure.get_transitive_dependents(token.content["id"])
+
+
+# Batched versions of the edges above, which resolve the neighbors of many tokens at once.
+# Each returns a list of neighbor lists, in the same order as the given tokens.
+
+
+def _resolve_foreign_keys(
+    tokens: Sequence[KerbalConfigToken],
+    foreign_key_name: str,
+    targets_by_key: Dict[str, KerbalConfigToken],
+) -> List[List[KerbalConfigToken]]:
+    return [
+        [targets_by_key[key] for key in keys]
+        for keys in get_foreign_key_values(tokens, foreign_key_name)
+    ]
+
+
+def get_required_technologies_for_parts(
+    data_manager: KerbalDataManager, tokens: Sequence[KerbalConfigToken]
+) -> List[List[KerbalConfigToken]]:
+    assert all(token.type_name == "Part" for token in tokens)
+    data_manager.ensure_ingested("Technology")
+    return _resolve_foreign_keys(tokens, "tech_required", data_manager.technologies_by_id)
+
+
+def get_resources_for_contained_resources(
+    data_manager: KerbalDataManager, tokens: Sequence[KerbalConfigToken]
+) -> List[List[KerbalConfigToken]]:
+    assert all(token.type_name == "ContainedResource" for token in tokens)
+    data_manager.ensure_ingested("Resource")
+    resources_by_internal_name = data_manager.resources_by_internal_name
+    return [
+        [resources_by_internal_name[internal_name]]
+        for internal_name in get_foreign_key_values(tokens, "resource_internal_name")
+    ]
+
+
+def get_mandatory_prerequisites_of_technologies(
+    data_manager: KerbalDataManager, tokens: Sequence[KerbalConfigToken]
+) -> List[List[KerbalConfigToken]]:
+    assert all(token.type_name == "Technology" for token in tokens)
+    data_manager.ensure_ingested("Technology")
+    return _resolve_foreign_keys(tokens, "mandatory_prereq_ids", data_manager.technologies_by_id)
+
+
+def get_any_of_prerequisites_of_technologies(
+    data_manager: KerbalDataManager, tokens: Sequence[KerbalConfigToken]
+) -> List[List[KerbalConfigToken]]:
+    assert all(token.type_name == "Technology" for token in tokens)
+    data_manager.ensure_ingested("Technology")
+    return _resolve_foreign_keys(tokens, "any_of_prereq_ids", data_manager.technologies_by_id)
+
+
+def get_mandatory_dependents_of_technologies(
+    data_manager: KerbalDataManager, tokens: Sequence[KerbalConfigToken]
+) -> List[List[KerbalConfigToken]]:
+    assert all(token.type_name == "Technology" for token in tokens)
+    data_manager.ensure_ingested("Technology")
+    dependents_by_technology_id = data_manager.mandatory_dependents_by_technology_id
+    return [
+        dependents_by_technology_id.get(technology_id, [])
+        for technology_id in get_field_values(tokens, "id")
+    ]
+
+
+def get_any_of_dependents_of_technologies(
+    data_manager: KerbalDataManager, tokens: Sequence[KerbalConfigToken]
+) -> List[List[KerbalConfigToken]]:
+    assert all(token.type_name == "Technology" for token in tokens)
+    data_manager.ensure_ingested("Technology")
+    dependents_by_technology_id = data_manager.any_of_dependents_by_technology_id
+    return [
+        dependents_by_technology_id.get(technology_id, [])
+        for technology_id in get_field_values(tokens, "id")
+    ]
+
+
+def get_transitive_prerequisites_of_technologies(
+    data_manager: KerbalDataManager, tokens: Sequence[KerbalConfigToken]
+) -> List[List[KerbalConfigToken]]:
+    assert all(token.type_name == "Technology" for token in tokens)
+    closure = data_manager.get_technology_prerequisite_closure()
+    return [
+        closure.get_transitive_prerequisites(technology_id)
+        for technology_id in get_field_values(tokens, "id")
+    ]
+
+
+def get_transitive_dependents_of_technologies(
+    data_manager: KerbalDataManager, tokens: Sequence[KerbalConfigToken]
+) -> List[List[KerbalConfigToken]]:
+    assert all(token.type_name == "Technology" for token in tokens)
+    closure = data_manager.get_technology_prerequisite_closure()
+    return [
+        closure.get_transitive_dependents(technology_id)
+        for technology_id in get_field_values(tokens, "id")
+    ]
@@ -0,0 +1,286 @@
+from typing import (
+    Any,
+    Collection,
+    Dict,
+    List,
+    Mapping,
+    MutableMapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .data_manager import KerbalDataManager
+from .tokens import KerbalConfigToken, get_field_values
+
+
+# Filters on a root vertex's properties can often be answered from an index, instead of
+# by scanning all vertices of that type. The interpreter still applies every filter to every
+# vertex we return, so index lookups only need to produce a superset of the matching vertices.
+# Whenever a filter is not index-friendly, or its arguments are unusable, we return None
+# and the caller falls back to a full scan.
+
+_equality_ops = frozenset({"=", "in_collection"})
+_range_ops = frozenset({"<", "<=", ">", ">=", "between"})
+_substring_ops = frozenset({"has_substring"})
+
+
+# (type name, field name) -> name of the data manager attribute holding the equality index.
+# The index values are either single tokens (for unique fields) or lists of tokens.
+# Equality indexes over other fields may be built on demand, for the duration of a query batch.
+_equality_index_attributes: Dict[Tuple[str, str], str] = {
+    ("Part", "cfg_file_path"): "parts_by_cfg_file_path",
+    ("Part", "internal_name"): "parts_by_internal_name",
+    ("Part", "name"): "parts_by_name",
+    ("Resource", "internal_name"): "resources_by_internal_name",
+    ("Resource", "name"): "resources_by_name",
+    ("Technology", "id"): "technologies_by_id",
+    ("Technology", "name"): "technologies_by_name",
+}
+
+
+# (type name, field name) -> equality index built on demand, or None if the field's values
+# cannot be indexed. The index values are lists of tokens.
+OnDemandEqualityIndexes = MutableMapping[
+    Tuple[str, str], Optional[Dict[Any, List[KerbalConfigToken]]]
+]
+
+
+class RootTokenLookup(NamedTuple):
+    """The root vertices to return for a query, and the work it took to find them."""
+
+    tokens: List[KerbalConfigToken]
+    used_index: bool  # False if the tokens are all tokens of the type, found by a full scan
+    full_scans: int  # scans over all tokens of the type, including any to build indexes
+
+
+def _build_equality_index(
+    data_manager: KerbalDataManager, type_name: str, field_name: str
+) -> Optional[Dict[Any, List[KerbalConfigToken]]]:
+    tokens = data_manager.get_root_tokens(type_name)
+    index: Dict[Any, List[KerbalConfigToken]] = {}
+    try:
+        for token, value in zip(tokens, get_field_values(tokens, field_name)):
+            index.setdefault(value, []).append(token)
+    except TypeError:
+        # Unhashable field values. Indexing only some of them could miss matches.
+        return None
+    return index
+
+
+def _get_equality_index(
+    data_manager: KerbalDataManager,
+    type_name: str,
+    field_name: str,
+    on_demand_indexes: Optional[OnDemandEqualityIndexes],
+) -> Tuple[Optional[Mapping[Any, Any]], int]:
+    """Return the equality index, if any, and the number of full scans it took to build it."""
+    index_key = (type_name, field_name)
+    index_attribute = _equality_index_attributes.get(index_key, None)
+    if index_attribute is not None:
+        return getattr(data_manager, index_attribute), 0
+    if on_demand_indexes is None:
+        return None, 0
+
+    full_scans = 0
+    if index_key not in on_demand_indexes:
+        on_demand_indexes[index_key] = _build_equality_index(data_manager, type_name, field_name)
+        full_scans = 1
+    return on_demand_indexes[index_key], full_scans
+
+
+def _resolve_filter_args(
+    filter_args: Sequence[str], runtime_args: Mapping[str, Any]
+) -> Optional[List[Any]]:
+    resolved_args: List[Any] = []
+    for filter_arg in filter_args:
+        if not filter_arg.startswith("$"):
+            # Tagged values come from elsewhere in the query, and aren't known up front.
+            return None
+
+        runtime_arg_name = filter_arg[1:]
+        if runtime_arg_name not in runtime_args:
+            return None
+        resolved_args.append(runtime_args[runtime_arg_name])
+
+    return resolved_args
+
+
+def _find_candidates_for_equality_filter(
+    data_manager: KerbalDataManager,
+    type_name: str,
+    field_name: str,
+    op_name: str,
+    filter_args: List[Any],
+    on_demand_indexes: Optional[OnDemandEqualityIndexes],
+) -> Tuple[Optional[List[KerbalConfigToken]], int]:
+    if len(filter_args) != 1:
+        return None, 0
+
+    index, full_scans = _get_equality_index(data_manager, type_name, field_name, on_demand_indexes)
+    if index is None:
+        return None, full_scans
+
+    candidates: List[KerbalConfigToken] = []
+    try:
+        if op_name == "=":
+            wanted_values = {filter_args[0]}
+        else:
+            wanted_values = set(filter_args[0])
+    except TypeError:
+        # Unhashable or non-iterable values, which the index cannot look up.
+        return None, full_scans
+
+    for wanted_value in wanted_values:
+        match = index.get(wanted_value, None)
+
+        if match is None:
+            continue
+        elif isinstance(match, list):
+            candidates.extend(match)
+        else:
+            candidates.append(match)
+
+    return candidates, full_scans
+
+
+def _find_candidates_for_range_filter(
+    data_manager: KerbalDataManager,
+    type_name: str,
+    field_name: str,
+    op_name: str,
+    filter_args: List[Any],
+) -> Optional[List[KerbalConfigToken]]:
+    if op_name == "between":
+        if len(filter_args) != 2:
+            return None
+        range_args: Dict[str, Any] = {"lower_bound": filter_args[0], "upper_bound": filter_args[1]}
+    else:
+        if len(filter_args) != 1:
+            return None
+        range_args = {
+            "<": {"upper_bound": filter_args[0], "upper_inclusive": False},
+            "<=": {"upper_bound": filter_args[0]},
+            ">": {"lower_bound": filter_args[0], "lower_inclusive": False},
+            ">=": {"lower_bound": filter_args[0]},
+        }[op_name]
+
+    if any(filter_arg is None for filter_arg in filter_args):
+        return None
+
+    try:
+        index = data_manager.get_sorted_field_index(type_name, field_name)
+        return index.find_range(**range_args)
+    except TypeError:
+        # The field values are not comparable with each other, or with the filter's arguments.
+        return None
+
+
+def _find_candidates_for_substring_filter(
+    data_manager: KerbalDataManager, type_name: str, field_name: str, filter_args: List[Any],
+) -> Optional[List[KerbalConfigToken]]:
+    if len(filter_args) != 1 or not isinstance(filter_args[0], str):
+        return None
+    return data_manager.find_tokens_with_substring(type_name, field_name, filter_args[0])
+
+
+def find_candidate_tokens(
+    data_manager: KerbalDataManager,
+    type_name: str,
+    filter_hints: Optional[Collection[Any]],
+    runtime_arg_hints: Optional[Mapping[str, Any]],
+    *,
+    on_demand_indexes: Optional[OnDemandEqualityIndexes] = None,
+) -> Optional[List[KerbalConfigToken]]:
+    """Use indexes to find a superset of the root vertices that satisfy the filter hints.
+
+    Each filter hint is expected to have "fields", "op_name" and "args" attributes, as in
+    the graphql-compiler interpreter's FilterInfo. Returns None if no index is applicable.
+
+    If a mapping of on-demand indexes is given, equality filters on fields without a prebuilt
+    index are answered from an index built with a single scan, and stored in the mapping
+    so that later calls can reuse it.
+    """
+    candidates, _ = _find_candidates(
+        data_manager,
+        type_name,
+        filter_hints,
+        runtime_arg_hints,
+        on_demand_indexes=on_demand_indexes,
+    )
+    return candidates
+
+
+def find_root_tokens(
+    data_manager: KerbalDataManager,
+    type_name: str,
+    filter_hints: Optional[Collection[Any]],
+    runtime_arg_hints: Optional[Mapping[str, Any]],
+    *,
+    on_demand_indexes: Optional[OnDemandEqualityIndexes] = None,
+) -> RootTokenLookup:
+    """Find the root vertices for a query, using indexes as in find_candidate_tokens() if any apply.
+
+    Returns all tokens of the type if no index applies, and counts the full scans either way.
+    """
+    candidates, full_scans = _find_candidates(
+        data_manager,
+        type_name,
+        filter_hints,
+        runtime_arg_hints,
+        on_demand_indexes=on_demand_indexes,
+    )
+    if candidates is not None:
+        return RootTokenLookup(candidates, True, full_scans)
+    return RootTokenLookup(data_manager.get_root_tokens(type_name), False, full_scans + 1)
+
+
+def _find_candidates(
+    data_manager: KerbalDataManager,
+    type_name: str,
+    filter_hints: Optional[Collection[Any]],
+    runtime_arg_hints: Optional[Mapping[str, Any]],
+    *,
+    on_demand_indexes: Optional[OnDemandEqualityIndexes],
+) -> Tuple[Optional[List[KerbalConfigToken]], int]:
+    if not filter_hints or runtime_arg_hints is None:
+        return None, 0
+
+    # The equality indexes are only complete once all tokens of the type are ingested.
+    data_manager.ensure_ingested(type_name)
+
+    best_candidates: Optional[List[KerbalConfigToken]] = None
+    full_scans = 0
+    for filter_hint in filter_hints:
+        if len(filter_hint.fields) != 1:
+            continue
+
+        field_name = filter_hint.fields[0]
+        op_name = filter_hint.op_name
+        filter_args = _resolve_filter_args(filter_hint.args, runtime_arg_hints)
+        if filter_args is None:
+            continue
+
+        candidates: Optional[List[KerbalConfigToken]] = None
+        if op_name in _equality_ops:
+            candidates, index_full_scans = _find_candidates_for_equality_filter(
+                data_manager, type_name, field_name, op_name, filter_args, on_demand_indexes
+            )
+            full_scans += index_full_scans
+        elif op_name in _range_ops:
+            candidates = _find_candidates_for_range_filter(
+                data_manager, type_name, field_name, op_name, filter_args
+            )
+        elif op_name in _substring_ops:
+            candidates = _find_candidates_for_substring_filter(
+                data_manager, type_name, field_name, filter_args
+            )
+
+        # All filters must be satisfied, so the smallest candidate set is the best one.
+        if candidates is not None and (
+            best_candidates is None or len(candidates) < len(best_candidates)
+        ):
+            best_candidates = candidates
+
+    return best_candidates, full_scans
@@ -0,0 +1,242 @@
+from array import array
+import math
+from typing import TYPE_CHECKING, Any, Iterable, Sequence, Tuple
+
+from ..utils import import_numpy
+
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# KSP's FloatCurve is a cubic Hermite spline through a list of (time, value) keys, each of which
+# may optionally specify the curve's incoming and outgoing tangent at that key. Missing tangents
+# are computed automatically: at interior keys they are the mean of the slopes of the two adjacent
+# segments, and at the first and last keys they are zero. The curve is constant outside its keys.
+
+
+class FloatCurve:
+    """The keys of a FloatCurve, stored in compact arrays sorted by time.
+
+    Missing tangents are stored as NaN, and replaced by automatic tangents when evaluating.
+    """
+
+    __slots__ = ("times", "values", "in_tangents", "out_tangents")
+
+    times: array
+    values: array
+    in_tangents: array
+    out_tangents: array
+
+    def __init__(
+        self,
+        times: Iterable[float],
+        values: Iterable[float],
+        in_tangents: Iterable[float],
+        out_tangents: Iterable[float],
+    ) -> None:
+        self.times = array("d", times)
+        self.values = array("d", values)
+        self.in_tangents = array("d", in_tangents)
+        self.out_tangents = array("d", out_tangents)
+
+    def __getstate__(self) -> Any:
+        return (self.times, self.values, self.in_tangents, self.out_tangents)
+
+    def __setstate__(self, state: Any) -> None:
+        self.times, self.values, self.in_tangents, self.out_tangents = state
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FloatCurve):
+            return NotImplemented
+        # Missing tangents are NaN, which must compare equal to each other here.
+        return all(
+            _arrays_equal(own_array, other_array)
+            for own_array, other_array in zip(self.__getstate__(), other.__getstate__())
+        )
+
+    def __repr__(self) -> str:
+        return f"FloatCurve(times={list(self.times)}, values={list(self.values)})"
+
+    def get_tangents(self, key_index: int) -> Tuple[float, float]:
+        """Return the incoming and outgoing tangents at the given key, computing missing ones."""
+        in_tangent = self.in_tangents[key_index]
+        out_tangent = self.out_tangents[key_index]
+        if math.isnan(in_tangent) or math.isnan(out_tangent):
+            auto_tangent = self._get_auto_tangent(key_index)
+            if math.isnan(in_tangent):
+                in_tangent = auto_tangent
+            if math.isnan(out_tangent):
+                out_tangent = auto_tangent
+        return in_tangent, out_tangent
+
+    def _get_auto_tangent(self, key_index: int) -> float:
+        if key_index == 0 or key_index == len(self.times) - 1:
+            return 0.0
+
+        previous_slope = self._get_segment_slope(key_index - 1)
+        next_slope = self._get_segment_slope(key_index)
+        return (previous_slope + next_slope) / 2
+
+    def _get_segment_slope(self, segment_index: int) -> float:
+        # Zero-width segments, between keys with the same time, are treated as flat.
+        time_delta = self.times[segment_index + 1] - self.times[segment_index]
+        if time_delta == 0:
+            return 0.0
+        return (self.values[segment_index + 1] - self.values[segment_index]) / time_delta
+
+    def evaluate(self, time: float) -> float:
+        """Evaluate the curve at a single point in time. Returns NaN for curves with no keys."""
+        times = self.times
+        values = self.values
+        key_count = len(times)
+        if key_count == 0:
+            return math.nan
+        elif time <= times[0]:
+            return values[0]
+        elif time >= times[-1]:
+            return values[-1]
+
+        # Use the segment starting at the last key at or before the given time.
+        segment_index = 0
+        while times[segment_index + 1] <= time:
+            segment_index += 1
+
+        time_delta = times[segment_index + 1] - times[segment_index]
+        fraction = (time - times[segment_index]) / time_delta
+        _, start_tangent = self.get_tangents(segment_index)
+        end_tangent, _ = self.get_tangents(segment_index + 1)
+
+        return _hermite(
+            fraction,
+            values[segment_index],
+            start_tangent * time_delta,
+            values[segment_index + 1],
+            end_tangent * time_delta,
+        )
+
+
+def _arrays_equal(first: array, second: array) -> bool:
+    return len(first) == len(second) and all(
+        first_value == second_value or (math.isnan(first_value) and math.isnan(second_value))
+        for first_value, second_value in zip(first, second)
+    )
+
+
+def _hermite(
+    fraction: Any, start_value: Any, start_slope: Any, end_value: Any, end_slope: Any
+) -> Any:
+    # Works for both floats and NumPy arrays.
+    fraction_squared = fraction * fraction
+    fraction_cubed = fraction_squared * fraction
+    return (
+        (2 * fraction_cubed - 3 * fraction_squared + 1) * start_value
+        + (fraction_cubed - 2 * fraction_squared + fraction) * start_slope
+        + (-2 * fraction_cubed + 3 * fraction_squared) * end_value
+        + (fraction_cubed - fraction_squared) * end_slope
+    )
+
+
+def parse_float_curve(raw_keys: Iterable[str]) -> FloatCurve:
+    """Parse FloatCurve keys of the form "time value [in_tangent out_tangent]"."""
+    parsed_keys = []
+    for raw_key in raw_keys:
+        components = raw_key.split()
+        assert len(components) >= 2, components
+
+        time = float(components[0])
+        value = float(components[1])
+        if len(components) >= 4:
+            in_tangent = float(components[2])
+            out_tangent = float(components[3])
+        else:
+            in_tangent = out_tangent = math.nan
+        parsed_keys.append((time, value, in_tangent, out_tangent))
+
+    # KSP sorts the keys by time. The sort is stable, so equal times keep their file order,
+    # and of several keys with the same time, the last one wins.
+    parsed_keys.sort(key=lambda parsed_key: parsed_key[0])
+    parsed_keys = [
+        parsed_key
+        for key_index, parsed_key in enumerate(parsed_keys)
+        if key_index + 1 == len(parsed_keys) or parsed_keys[key_index + 1][0] != parsed_key[0]
+    ]
+    return FloatCurve(
+        (parsed_key[0] for parsed_key in parsed_keys),
+        (parsed_key[1] for parsed_key in parsed_keys),
+        (parsed_key[2] for parsed_key in parsed_keys),
+        (parsed_key[3] for parsed_key in parsed_keys),
+    )
+
+
+def evaluate_float_curves(curves: Sequence[FloatCurve], times: Sequence[float]) -> "np.ndarray":
+    """Evaluate many curves at many points in time, returning a (curves, times) array of values.
+
+    Requires the optional NumPy dependency. Curves with no keys evaluate to NaN.
+    """
+    numpy = import_numpy()
+
+    curve_count = len(curves)
+    max_key_count = max((len(curve) for curve in curves), default=0)
+    eval_times = numpy.asarray(times, dtype=numpy.float64)
+    if curve_count == 0 or max_key_count == 0:
+        return numpy.full((curve_count, len(eval_times)), numpy.nan)
+
+    # Pad every curve to the same number of keys by repeating its last key, one time unit apart.
+    # The padding forms flat segments that are never reached, since evaluation times are clamped
+    # to each curve's own time range.
+    key_times = numpy.zeros((curve_count, max_key_count))
+    key_values = numpy.full((curve_count, max_key_count), numpy.nan)
+    in_tangents = numpy.zeros((curve_count, max_key_count))
+    out_tangents = numpy.zeros((curve_count, max_key_count))
+    key_counts = numpy.zeros(curve_count, dtype=numpy.int64)
+    for curve_index, curve in enumerate(curves):
+        key_count = len(curve)
+        key_counts[curve_index] = key_count
+        if key_count == 0:
+            continue
+
+        key_times[curve_index, :key_count] = curve.times
+        key_times[curve_index, key_count:] = curve.times[-1] + numpy.arange(
+            1, max_key_count - key_count + 1
+        )
+        key_values[curve_index, :key_count] = curve.values
+        key_values[curve_index, key_count:] = curve.values[-1]
+        for key_index in range(key_count):
+            (
+                in_tangents[curve_index, key_index],
+                out_tangents[curve_index, key_index],
+            ) = curve.get_tangents(key_index)
+
+    last_key_indexes = numpy.maximum(key_counts - 1, 0)
+    first_times = key_times[:, :1]
+    last_times = numpy.take_along_axis(key_times, last_key_indexes[:, None], axis=1)
+    clamped_times = numpy.clip(eval_times[None, :], first_times, last_times)
+
+    # Find each evaluation time's segment: the last key at or before it, excluding the last key.
+    segment_indexes = (key_times[:, None, :] <= clamped_times[:, :, None]).sum(axis=2) - 1
+    segment_indexes = numpy.clip(
+        segment_indexes, 0, numpy.maximum(last_key_indexes - 1, 0)[:, None]
+    )
+    next_indexes = numpy.minimum(segment_indexes + 1, max_key_count - 1)
+
+    start_times = numpy.take_along_axis(key_times, segment_indexes, axis=1)
+    end_times = numpy.take_along_axis(key_times, next_indexes, axis=1)
+    time_deltas = end_times - start_times
+    time_deltas[time_deltas == 0] = 1.0  # single-key curves, whose value is constant
+    fractions = numpy.clip((clamped_times - start_times) / time_deltas, 0.0, 1.0)
+
+    result = _hermite(
+        fractions,
+        numpy.take_along_axis(key_values, segment_indexes, axis=1),
+        numpy.take_along_axis(out_tangents, segment_indexes, axis=1) * time_deltas,
+        numpy.take_along_axis(key_values, next_indexes, axis=1),
+        numpy.take_along_axis(in_tangents, next_indexes, axis=1) * time_deltas,
+    )
+
+    single_key_curves = key_counts == 1
+    result[single_key_curves] = key_values[single_key_curves, :1]
+    return result
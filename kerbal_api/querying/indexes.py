@@ -0,0 +1,207 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+
+T = TypeVar("T")
+
+
+def _is_indexable_key(key: Any) -> bool:
+    # NaN compares unequal to everything including itself, and would break the sort order
+    # that bisection relies on.
+    return key is not None and key == key
+
+
+def _get_key(keyed_item: Tuple[Any, Any]) -> Any:
+    return keyed_item[0]
+
+
+class SortedFieldIndex(Generic[T]):
+    """Index of items by the value of one of their fields, supporting range lookups.
+
+    Items whose field value is None or NaN are not included in the index.
+    """
+
+    keys: MutableSequence[Any]  # sorted field values
+    items: List[T]  # items corresponding to each of the keys
+
+    # Items added since the index was last sorted, in the order they were added. Inserting each
+    # into the sorted keys would take linear time, so they are sorted in all at once instead.
+    added_keyed_items: List[Tuple[Any, T]]
+
+    def __init__(self, keyed_items: Iterable[Tuple[Any, T]] = ()) -> None:
+        indexable_keyed_items = [(key, item) for key, item in keyed_items if _is_indexable_key(key)]
+
+        # Sort by key only: the items themselves need not be comparable. Python's sort is stable,
+        # so items with equal keys keep their original relative order.
+        indexable_keyed_items.sort(key=_get_key)
+
+        self.keys = self._make_keys(key for key, _ in indexable_keyed_items)
+        self.items = [item for _, item in indexable_keyed_items]
+        self.added_keyed_items = []
+
+    def _make_keys(self, sorted_keys: Iterable[Any]) -> MutableSequence[Any]:
+        return list(sorted_keys)
+
+    def __len__(self) -> int:
+        self.flush()
+        return len(self.keys)
+
+    def add(self, key: Any, item: T) -> None:
+        """Add an item to the index, after any existing items with an equal key.
+
+        The item is only sorted into the index by the next flush() or lookup.
+        """
+        if _is_indexable_key(key):
+            self.added_keyed_items.append((key, item))
+
+    def flush(self) -> None:
+        """Sort the items added since the last flush into the index.
+
+        Lookups flush the index first, so this is only needed before sharing it across threads.
+        """
+        if not self.added_keyed_items:
+            return
+
+        # The existing keys and the added ones sorted on their own are two sorted runs,
+        # which the stable sort merges in linear time, keeping the existing items first.
+        self.added_keyed_items.sort(key=_get_key)
+        keyed_items = list(zip(self.keys, self.items))
+        keyed_items.extend(self.added_keyed_items)
+        keyed_items.sort(key=_get_key)
+
+        self.keys = self._make_keys(key for key, _ in keyed_items)
+        self.items = [item for _, item in keyed_items]
+        self.added_keyed_items = []
+
+    def find_range(
+        self,
+        lower_bound: Optional[Any] = None,
+        upper_bound: Optional[Any] = None,
+        *,
+        lower_inclusive: bool = True,
+        upper_inclusive: bool = True,
+    ) -> List[T]:
+        """Return the items whose key is within the given bounds. None means unbounded."""
+        self.flush()
+        if lower_bound is None:
+            start_index = 0
+        elif lower_inclusive:
+            start_index = bisect_left(self.keys, lower_bound)
+        else:
+            start_index = bisect_right(self.keys, lower_bound)
+
+        if upper_bound is None:
+            end_index = len(self.keys)
+        elif upper_inclusive:
+            end_index = bisect_right(self.keys, upper_bound)
+        else:
+            end_index = bisect_left(self.keys, upper_bound)
+
+        return self.items[start_index:end_index]
+
+
+class NumericFieldIndex(SortedFieldIndex[T]):
+    """Sorted index over a numeric field, with its keys stored in a compact array of doubles.
+
+    Looking up a non-numeric bound raises TypeError.
+    """
+
+    def _make_keys(self, sorted_keys: Iterable[Any]) -> MutableSequence[Any]:
+        return array("d", sorted_keys)
+
+    def add(self, key: Any, item: T) -> None:
+        if key is None:
+            return
+        super().add(float(key), item)
+
+
+def _get_trigrams(value: str) -> Set[str]:
+    return {value[start : start + 3] for start in range(len(value) - 2)}
+
+
+class SubstringIndex(Generic[T]):
+    """Trigram index of items by the value of one of their string fields.
+
+    Finds the items whose value contains a given substring, optionally ignoring case.
+    Items whose field value is None are not included in the index.
+    """
+
+    items: List[T]
+    values: List[str]  # the field value of each item
+    folded_values: List[str]  # the case-folded field value of each item
+
+    # Positions of the items whose case-folded value contains each trigram, in increasing order.
+    # Case-folding maps each character independently, so a case-sensitive match is always
+    # also a case-insensitive one: the same postings serve both kinds of lookup.
+    postings: Dict[str, List[int]]
+
+    def __init__(self) -> None:
+        self.items = []
+        self.values = []
+        self.folded_values = []
+        self.postings = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def add(self, value: Optional[str], item: T) -> None:
+        if value is None:
+            return
+
+        position = len(self.items)
+        folded_value = value.casefold()
+        self.items.append(item)
+        self.values.append(value)
+        self.folded_values.append(folded_value)
+
+        for trigram in _get_trigrams(folded_value):
+            self.postings.setdefault(trigram, []).append(position)
+
+    def _find_candidate_positions(self, folded_substring: str) -> Iterable[int]:
+        trigrams = _get_trigrams(folded_substring)
+        if not trigrams:
+            # Too short to have any trigrams: every item is a candidate.
+            return range(len(self.items))
+
+        # Intersecting posting lists costs more than verifying candidates with a substring check,
+        # so just use the shortest posting list as the candidates.
+        shortest_posting_list: Sequence[int] = range(len(self.items))
+        for trigram in trigrams:
+            posting_list = self.postings.get(trigram, None)
+            if posting_list is None:
+                return ()
+            if len(posting_list) < len(shortest_posting_list):
+                shortest_posting_list = posting_list
+        return shortest_posting_list
+
+    def find(self, substring: str, *, case_sensitive: bool = True) -> List[T]:
+        """Return the items whose value contains the substring, in the order they were added."""
+        folded_substring = substring.casefold()
+        candidate_positions = self._find_candidate_positions(folded_substring)
+
+        # Trigrams only narrow down the candidates, which still need to be verified.
+        if case_sensitive:
+            return [
+                self.items[position]
+                for position in candidate_positions
+                if substring in self.values[position]
+            ]
+        else:
+            return [
+                self.items[position]
+                for position in candidate_positions
+                if folded_substring in self.folded_values[position]
+            ]
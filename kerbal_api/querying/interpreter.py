@@ -1,34 +1,264 @@
-from typing import Any, Dict, Iterable, Set, Tuple
+from abc import abstractmethod
+from functools import partial
+from itertools import islice
+from operator import attrgetter
+from types import TracebackType
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
 
 from graphql_compiler.interpreter import DataContext, InterpreterAdapter
 from graphql_compiler.interpreter.typedefs import EdgeInfo
 
 from .data_manager import (
     KerbalDataManager,
+    get_any_of_dependents_of_technologies,
+    get_any_of_dependents_of_technology,
+    get_any_of_prerequisites_of_technologies,
+    get_any_of_prerequisites_of_technology,
     get_data_transmitter_for_part,
     get_default_resources_for_part,
     get_engine_modules_for_part,
+    get_mandatory_dependents_of_technologies,
+    get_mandatory_dependents_of_technology,
+    get_mandatory_prerequisites_of_technologies,
+    get_mandatory_prerequisites_of_technology,
+    get_required_technologies_for_part,
+    get_required_technologies_for_parts,
+    get_resource_for_contained_resource,
+    get_resources_for_contained_resources,
+    get_transitive_dependents_of_technologies,
+    get_transitive_dependents_of_technology,
+    get_transitive_prerequisites_of_technologies,
+    get_transitive_prerequisites_of_technology,
 )
-from .tokens import KerbalToken
+from .filter_pushdown import OnDemandEqualityIndexes, RootTokenLookup, find_root_tokens
+from .registry import KerbalDataManagerRegistry, get_default_registry
+from .tokens import KerbalToken, iter_context_field_values
+
+
+EdgeHandler = Callable[[KerbalDataManager, Any], Iterable[KerbalToken]]
+BatchEdgeHandler = Callable[[KerbalDataManager, Sequence[Any]], Sequence[Iterable[KerbalToken]]]
+
+
+# How many data contexts to process at a time when projecting neighbors.
+# Large enough to amortize per-batch work, small enough to keep results streaming.
+DATA_CONTEXT_BATCH_SIZE = 1000
+
+
+_current_token_getter = attrgetter("current_token")
+
+
+def _iter_batches(items: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    batch = list(islice(iterator, batch_size))
+    while batch:
+        yield batch
+        batch = list(islice(iterator, batch_size))
+
 
+def _resolve_neighbors_one_at_a_time(
+    handler: EdgeHandler, data_manager: KerbalDataManager, tokens: Sequence[KerbalToken]
+) -> List[Iterable[KerbalToken]]:
+    return [handler(data_manager, token) for token in tokens]
+
+
+class RootTokenLookupAdapter(InterpreterAdapter[KerbalToken]):
+    """An adapter that reports how it finds root tokens, e.g. whether it had to scan them all."""
+
+    @abstractmethod
+    def find_root_tokens(self, type_name: str, **hints: Any) -> RootTokenLookup:
+        """Find the tokens that get_tokens_of_type() returns, and the work it took to find them."""
+
+    def get_tokens_of_type(self, type_name: str, **hints: Any) -> Iterable[KerbalToken]:
+        return self.find_root_tokens(type_name, **hints).tokens
+
+
+class KerbalDataAdapter(RootTokenLookupAdapter):
+    # (type name, edge info) -> function returning the neighbors of a single token.
+    edge_handlers: ClassVar[Dict[Tuple[str, EdgeInfo], EdgeHandler]] = {
+        ("Part", ("out", "Part_EngineModule")): get_engine_modules_for_part,
+        ("Part", ("out", "Part_HasDefaultResource")): get_default_resources_for_part,
+        ("Part", ("out", "Part_DataTransmitter")): get_data_transmitter_for_part,
+        ("Part", ("out", "Part_RequiredTechnology")): get_required_technologies_for_part,
+        ("ContainedResource", ("out", "ContainedResource_Resource")): (
+            get_resource_for_contained_resource
+        ),
+        ("Technology", ("out", "Technology_MandatoryPrerequisite")): (
+            get_mandatory_prerequisites_of_technology
+        ),
+        ("Technology", ("out", "Technology_AnyOfPrerequisite")): (
+            get_any_of_prerequisites_of_technology
+        ),
+        ("Technology", ("in", "Technology_MandatoryPrerequisite")): (
+            get_mandatory_dependents_of_technology
+        ),
+        ("Technology", ("in", "Technology_AnyOfPrerequisite")): (
+            get_any_of_dependents_of_technology
+        ),
+        ("Technology", ("out", "Technology_TransitivePrerequisite")): (
+            get_transitive_prerequisites_of_technology
+        ),
+        ("Technology", ("in", "Technology_TransitivePrerequisite")): (
+            get_transitive_dependents_of_technology
+        ),
+    }
+
+    # (type name, edge info) -> function returning the neighbors of many tokens at once.
+    # Edges without a batch handler fall back to calling their single-token handler in a loop.
+    batch_edge_handlers: ClassVar[Dict[Tuple[str, EdgeInfo], BatchEdgeHandler]] = {
+        ("Part", ("out", "Part_RequiredTechnology")): get_required_technologies_for_parts,
+        ("ContainedResource", ("out", "ContainedResource_Resource")): (
+            get_resources_for_contained_resources
+        ),
+        ("Technology", ("out", "Technology_MandatoryPrerequisite")): (
+            get_mandatory_prerequisites_of_technologies
+        ),
+        ("Technology", ("out", "Technology_AnyOfPrerequisite")): (
+            get_any_of_prerequisites_of_technologies
+        ),
+        ("Technology", ("in", "Technology_MandatoryPrerequisite")): (
+            get_mandatory_dependents_of_technologies
+        ),
+        ("Technology", ("in", "Technology_AnyOfPrerequisite")): (
+            get_any_of_dependents_of_technologies
+        ),
+        ("Technology", ("out", "Technology_TransitivePrerequisite")): (
+            get_transitive_prerequisites_of_technologies
+        ),
+        ("Technology", ("in", "Technology_TransitivePrerequisite")): (
+            get_transitive_dependents_of_technologies
+        ),
+    }
+
+    # (current_known_type, attempted_coercion_type) -> set of concrete types for which
+    # the coercion is successful. The attempted coercion type may be concrete or abstract;
+    # if abstract then all concrete types that are descended from it are in the value set.
+    coercion_table: ClassVar[Dict[Tuple[str, str], FrozenSet[str]]] = {
+        ("DataTransmitterModule", "InternalTransmitterModule"): frozenset(
+            {"InternalTransmitterModule"}
+        ),
+        ("DataTransmitterModule", "AntennaModule"): frozenset(
+            {"DirectAntennaModule", "RelayAntennaModule"}
+        ),
+        ("AntennaModule", "DirectAntennaModule"): frozenset({"DirectAntennaModule"}),
+        ("AntennaModule", "RelayAntennaModule"): frozenset({"RelayAntennaModule"}),
+    }
 
-class KerbalDataAdapter(InterpreterAdapter[KerbalToken]):
     ksp_install_path: str
-    data_manager: KerbalDataManager
+    registry: KerbalDataManagerRegistry
+
+    _data_manager: Optional[KerbalDataManager]  # None until first used, if loading lazily
+    _closed: bool
 
-    def __init__(self, ksp_install_path: str) -> None:
+    def __init__(
+        self,
+        ksp_install_path: str,
+        *,
+        registry: Optional[KerbalDataManagerRegistry] = None,
+        lazy: bool = False,
+    ) -> None:
         self.ksp_install_path = ksp_install_path
-        self.data_manager = KerbalDataManager.from_ksp_install_path(ksp_install_path)
-
-    def get_tokens_of_type(self, type_name: str, **hints: Dict[str, Any]) -> Iterable[KerbalToken]:
-        if type_name == "Part":
-            return self.data_manager.parts
-        elif type_name == "Resource":
-            return self.data_manager.resources
-        elif type_name == "Technology":
-            return self.data_manager.technologies
-        else:
-            raise NotImplementedError()
+        self.registry = registry if registry is not None else get_default_registry()
+
+        self._data_manager = None
+        self._closed = False
+
+        self.registry.acquire(ksp_install_path)
+        if not lazy:
+            self._data_manager = self.registry.get_data_manager(ksp_install_path)
+
+    @property
+    def data_manager(self) -> KerbalDataManager:
+        # The data manager is shared with all other adapters for the same install path,
+        # so it must never be mutated. Once fetched, we keep using the same data manager
+        # even if the registry entry gets invalidated, so that results stay self-consistent.
+        data_manager = self._data_manager
+        if data_manager is None:
+            data_manager = self.registry.get_data_manager(self.ksp_install_path)
+            self._data_manager = data_manager
+        return data_manager
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self.registry.release(self.ksp_install_path)
+
+    def __enter__(self) -> "KerbalDataAdapter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    @classmethod
+    def register_edge_handler(
+        cls,
+        type_name: str,
+        edge_info: EdgeInfo,
+        handler: EdgeHandler,
+        *,
+        batch_handler: Optional[BatchEdgeHandler] = None,
+    ) -> None:
+        """Add support for an edge, e.g. one added to the schema by a mod.
+
+        Registering on a subclass does not affect the classes it inherits from. Registration is
+        not thread-safe, and is meant to happen at import time, before any queries are run.
+        """
+        handler_key = (type_name, edge_info)
+        if handler_key in cls.edge_handlers:
+            raise ValueError(f"An edge handler is already registered for {handler_key}.")
+
+        if "edge_handlers" not in cls.__dict__:
+            cls.edge_handlers = dict(cls.edge_handlers)
+            cls.batch_edge_handlers = dict(cls.batch_edge_handlers)
+
+        cls.edge_handlers[handler_key] = handler
+        if batch_handler is not None:
+            cls.batch_edge_handlers[handler_key] = batch_handler
+
+    @classmethod
+    def register_coercion(
+        cls, current_type_name: str, coerce_to_type_name: str, concrete_type_names: Iterable[str]
+    ) -> None:
+        """Allow coercing a type to another, succeeding for tokens of the given concrete types.
+
+        Registering on a subclass does not affect the classes it inherits from. Registration is
+        not thread-safe, and is meant to happen at import time, before any queries are run.
+        """
+        coercion_key = (current_type_name, coerce_to_type_name)
+        if coercion_key in cls.coercion_table:
+            raise ValueError(f"A coercion is already registered for {coercion_key}.")
+
+        if "coercion_table" not in cls.__dict__:
+            cls.coercion_table = dict(cls.coercion_table)
+
+        cls.coercion_table[coercion_key] = frozenset(concrete_type_names)
+
+    def find_root_tokens(self, type_name: str, **hints: Any) -> RootTokenLookup:
+        # If the interpreter tells us about filters on this root vertex, try to answer them
+        # from an index. Otherwise, or if no index applies, return all tokens of the type.
+        return find_root_tokens(
+            self.data_manager,
+            type_name,
+            hints.get("filter_hints", None),
+            hints.get("runtime_arg_hints", None),
+        )
 
     def project_property(
         self,
@@ -37,13 +267,7 @@ class KerbalDataAdapter(InterpreterAdapter[KerbalToken]):
         field_name: str,
         **hints: Dict[str, Any],
     ) -> Iterable[Tuple[DataContext[KerbalToken], Any]]:
-        for data_context in data_contexts:
-            token = data_context.current_token
-            current_value = None
-            if token is not None:
-                current_value = token.content[field_name]
-
-            yield (data_context, current_value)
+        return iter_context_field_values(data_contexts, field_name)
 
     def project_neighbors(
         self,
@@ -52,48 +276,24 @@ class KerbalDataAdapter(InterpreterAdapter[KerbalToken]):
         edge_info: EdgeInfo,
         **hints: Dict[str, Any],
     ) -> Iterable[Tuple[DataContext[KerbalToken], Iterable[KerbalToken]]]:
-        edge_handlers = {
-            ("Part", ("out", "Part_EngineModule")): get_engine_modules_for_part,
-            ("Part", ("out", "Part_HasDefaultResource")): get_default_resources_for_part,
-            ("Part", ("out", "Part_DataTransmitter")): get_data_transmitter_for_part,
-            ("Part", ("out", "Part_RequiredTechnology")): (
-                lambda data_manager, token: [
-                    data_manager.technologies_by_id[tech_id]
-                    for tech_id in token.foreign_keys["tech_required"]
-                ]
-            ),
-            ("ContainedResource", ("out", "ContainedResource_Resource")): (
-                lambda data_manager, token: [
-                    data_manager.resources_by_internal_name[
-                        token.foreign_keys["resource_internal_name"]
-                    ],
-                ]
-            ),
-            ("Technology", ("out", "Technology_MandatoryPrerequisite")): (
-                lambda data_manager, token: [
-                    data_manager.technologies_by_id[tech_id]
-                    for tech_id in token.foreign_keys["mandatory_prereq_ids"]
-                ]
-            ),
-            ("Technology", ("out", "Technology_AnyOfPrerequisite")): (
-                lambda data_manager, token: [
-                    data_manager.technologies_by_id[tech_id]
-                    for tech_id in token.foreign_keys["any_of_prereq_ids"]
-                ]
-            ),
-        }
-
         handler_key = (current_type_name, edge_info)
-        handler_for_edge = edge_handlers.get(handler_key, None)
-        if handler_for_edge is None:
-            raise NotImplementedError(handler_key)
-        else:
-            for data_context in data_contexts:
-                token = data_context.current_token
-
-                neighbors = []
+        batch_handler = self.batch_edge_handlers.get(handler_key, None)
+        if batch_handler is None:
+            handler_for_edge = self.edge_handlers.get(handler_key, None)
+            if handler_for_edge is None:
+                raise NotImplementedError(handler_key)
+            batch_handler = partial(_resolve_neighbors_one_at_a_time, handler_for_edge)
+
+        data_manager = self.data_manager
+        for data_contexts_batch in _iter_batches(data_contexts, DATA_CONTEXT_BATCH_SIZE):
+            tokens = list(map(_current_token_getter, data_contexts_batch))
+            present_tokens = [token for token in tokens if token is not None]
+            present_neighbors = iter(batch_handler(data_manager, present_tokens))
+
+            for data_context, token in zip(data_contexts_batch, tokens):
+                neighbors: Iterable[KerbalToken] = []
                 if token is not None:
-                    neighbors = handler_for_edge(self.data_manager, token)
+                    neighbors = next(present_neighbors)
 
                 yield (data_context, neighbors)
 
@@ -104,27 +304,78 @@ class KerbalDataAdapter(InterpreterAdapter[KerbalToken]):
         coerce_to_type_name: str,
         **hints: Dict[str, Any],
     ) -> Iterable[Tuple[DataContext[KerbalToken], bool]]:
-        # Tuple (current_known_type, attempted_coercion_type) -> set of concrete types for which
-        # the coercion is successful. The attempted coercion type may be concrete or abstract;
-        # if abstract then all concrete types that are descended from it are in the value set.
-        coercion_table: Dict[Tuple[str, str], Set[str]] = {
-            ("DataTransmitterModule", "InternalTransmitterModule"): {"InternalTransmitterModule"},
-            ("DataTransmitterModule", "AntennaModule"): {
-                "DirectAntennaModule",
-                "RelayAntennaModule",
-            },
-            ("AntennaModule", "DirectAntennaModule"): {"DirectAntennaModule"},
-            ("AntennaModule", "RelayAntennaModule"): {"RelayAntennaModule"},
-        }
+        allowed_types: Optional[FrozenSet[str]] = None
 
         for data_context in data_contexts:
             token = data_context.current_token
 
             can_coerce = False
             if token is not None:
-                # Getting a KeyError here means that the coercion table needs to be updated
-                # to account for more type conversions that the schema allows to occur.
-                allowed_types = coercion_table[(current_type_name, coerce_to_type_name)]
+                if allowed_types is None:
+                    # Getting a KeyError here means that the coercion table needs to be updated
+                    # to account for more type conversions that the schema allows to occur.
+                    allowed_types = self.coercion_table[(current_type_name, coerce_to_type_name)]
                 can_coerce = token.type_name in allowed_types
 
             yield (data_context, can_coerce)
+
+
+class SharedScanAdapter(RootTokenLookupAdapter):
+    """Wraps an adapter, to run the same query with many different arguments.
+
+    Shares on-demand equality indexes across argument sets: equality filters on root vertex fields
+    that have no prebuilt index are answered from an index built with a single scan on first use.
+    All other work, including filters that prebuilt or sorted indexes already answer, is the same
+    as without this adapter. The indexes are kept for as long as this adapter is, so it is meant
+    to be used for one batch of queries and then discarded. Not thread-safe.
+    """
+
+    adapter: KerbalDataAdapter
+
+    _on_demand_indexes: OnDemandEqualityIndexes
+
+    def __init__(self, adapter: KerbalDataAdapter) -> None:
+        self.adapter = adapter
+        self._on_demand_indexes = {}
+
+    @property
+    def data_manager(self) -> KerbalDataManager:
+        return self.adapter.data_manager
+
+    def find_root_tokens(self, type_name: str, **hints: Any) -> RootTokenLookup:
+        return find_root_tokens(
+            self.adapter.data_manager,
+            type_name,
+            hints.get("filter_hints", None),
+            hints.get("runtime_arg_hints", None),
+            on_demand_indexes=self._on_demand_indexes,
+        )
+
+    def project_property(
+        self,
+        data_contexts: Iterable[DataContext[KerbalToken]],
+        current_type_name: str,
+        field_name: str,
+        **hints: Dict[str, Any],
+    ) -> Iterable[Tuple[DataContext[KerbalToken], Any]]:
+        return self.adapter.project_property(data_contexts, current_type_name, field_name, **hints)
+
+    def project_neighbors(
+        self,
+        data_contexts: Iterable[DataContext[KerbalToken]],
+        current_type_name: str,
+        edge_info: EdgeInfo,
+        **hints: Dict[str, Any],
+    ) -> Iterable[Tuple[DataContext[KerbalToken], Iterable[KerbalToken]]]:
+        return self.adapter.project_neighbors(data_contexts, current_type_name, edge_info, **hints)
+
+    def can_coerce_to_type(
+        self,
+        data_contexts: Iterable[DataContext[KerbalToken]],
+        current_type_name: str,
+        coerce_to_type_name: str,
+        **hints: Dict[str, Any],
+    ) -> Iterable[Tuple[DataContext[KerbalToken], bool]]:
+        return self.adapter.can_coerce_to_type(
+            data_contexts, current_type_name, coerce_to_type_name, **hints
+        )
@@ -0,0 +1,253 @@
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sized, Tuple
+
+from graphql_compiler.interpreter import DataContext, InterpreterAdapter
+from graphql_compiler.interpreter.typedefs import EdgeInfo
+
+from .interpreter import RootTokenLookupAdapter
+from .tokens import KerbalToken
+
+
+# Profiling wraps the adapter, so queries that are not profiled run exactly as before.
+# Times are exclusive: an operation's time does not include the time spent computing its input
+# data contexts, since those come from the operations before it.
+
+
+@dataclass
+class OperationProfile:
+    """Statistics for all calls of one adapter operation, e.g. projecting one property."""
+
+    operation: str  # name of the adapter method
+    type_name: str  # the current type, or the root type for get_tokens_of_type
+    target: Optional[str]  # field name, edge field name, or type to coerce to, if any
+
+    calls: int = 0
+    input_contexts: int = 0
+    outputs: int = 0  # root tokens, values, neighbors, or successful coercions
+    seconds: float = 0.0
+    index_lookups: int = 0  # get_tokens_of_type calls answered from an index
+    full_scans: int = 0  # scans over all tokens of the type, including any to build indexes
+
+    def describe(self) -> str:
+        subject = self.type_name if self.target is None else f"{self.type_name}.{self.target}"
+        details = [f"{self.calls} call{'' if self.calls == 1 else 's'}"]
+        if self.operation == "get_tokens_of_type":
+            details.append(f"{self.index_lookups} index lookups, {self.full_scans} full scans")
+            details.append(f"{self.outputs} tokens")
+        else:
+            details.append(f"{self.input_contexts} contexts")
+            if self.operation == "project_neighbors":
+                details.append(f"{self.outputs} neighbors")
+            elif self.operation == "can_coerce_to_type":
+                details.append(f"{self.outputs} coerced")
+        details.append(f"{self.seconds * 1000:.3f} ms")
+        return f"{self.operation} {subject}: " + ", ".join(details)
+
+
+@dataclass
+class QueryProfile:
+    """Where a query spent its time. Filled in while the query's results are consumed."""
+
+    compile_seconds: float = 0.0
+    execute_seconds: float = 0.0  # total time spent producing results, including all operations
+    result_count: int = 0
+    operations: List[OperationProfile] = field(default_factory=list)  # in order of first use
+
+    _operations_by_key: Dict[Tuple[str, str, Optional[str]], OperationProfile] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+
+    def get_operation(
+        self, operation: str, type_name: str, target: Optional[str]
+    ) -> OperationProfile:
+        key = (operation, type_name, target)
+        operation_profile = self._operations_by_key.get(key, None)
+        if operation_profile is None:
+            operation_profile = OperationProfile(operation, type_name, target)
+            self._operations_by_key[key] = operation_profile
+            self.operations.append(operation_profile)
+        return operation_profile
+
+    def format(self) -> str:
+        """Return a human-readable report, with one line per operation."""
+        lines = [
+            f"{self.result_count} results in {self.execute_seconds * 1000:.3f} ms, "
+            f"compiled in {self.compile_seconds * 1000:.3f} ms"
+        ]
+        lines.extend("  " + operation.describe() for operation in self.operations)
+        return "\n".join(lines)
+
+
+class _TimedInput:
+    """Iterates over an operation's input, counting the items and the time spent producing them."""
+
+    __slots__ = ("_iterator", "count", "seconds")
+
+    def __init__(self, iterable: Iterable[Any]) -> None:
+        self._iterator = iter(iterable)
+        self.count = 0
+        self.seconds = 0.0
+
+    def __iter__(self) -> "_TimedInput":
+        return self
+
+    def __next__(self) -> Any:
+        start_time = perf_counter()
+        try:
+            item = next(self._iterator)
+        finally:
+            self.seconds += perf_counter() - start_time
+        self.count += 1
+        return item
+
+
+def _profile_outputs(
+    operation_profile: OperationProfile,
+    timed_input: _TimedInput,
+    get_outputs: Callable[[], Iterable[Any]],
+    count_outputs: Callable[[Any], int],
+) -> Iterator[Any]:
+    operation_profile.calls += 1
+    start_time = perf_counter()
+    iterator = iter(get_outputs())
+    operation_profile.seconds += perf_counter() - start_time
+
+    try:
+        while True:
+            start_time = perf_counter()
+            upstream_seconds = timed_input.seconds
+            try:
+                item = next(iterator)
+            finally:
+                elapsed_seconds = perf_counter() - start_time
+                operation_profile.seconds += elapsed_seconds - (
+                    timed_input.seconds - upstream_seconds
+                )
+
+            operation_profile.outputs += count_outputs(item)
+            yield item
+    except StopIteration:
+        pass
+    finally:
+        operation_profile.input_contexts += timed_input.count
+
+
+def _count_nothing(item: Any) -> int:
+    return 0
+
+
+def _count_coercions(item: Tuple[DataContext[KerbalToken], bool]) -> int:
+    return 1 if item[1] else 0
+
+
+class ProfilingAdapter(InterpreterAdapter[KerbalToken]):
+    """Wraps an adapter, recording the time and amount of work of each operation of a query."""
+
+    adapter: RootTokenLookupAdapter
+    profile: QueryProfile
+
+    def __init__(self, adapter: RootTokenLookupAdapter, profile: QueryProfile) -> None:
+        self.adapter = adapter
+        self.profile = profile
+
+    def get_tokens_of_type(self, type_name: str, **hints: Any) -> Iterable[KerbalToken]:
+        operation_profile = self.profile.get_operation("get_tokens_of_type", type_name, None)
+
+        start_time = perf_counter()
+        lookup = self.adapter.find_root_tokens(type_name, **hints)
+        operation_profile.seconds += perf_counter() - start_time
+
+        operation_profile.full_scans += lookup.full_scans
+        if lookup.used_index:
+            operation_profile.index_lookups += 1
+
+        return _profile_outputs(
+            operation_profile, _TimedInput(()), lambda: lookup.tokens, lambda _: 1
+        )
+
+    def project_property(
+        self,
+        data_contexts: Iterable[DataContext[KerbalToken]],
+        current_type_name: str,
+        field_name: str,
+        **hints: Any,
+    ) -> Iterable[Tuple[DataContext[KerbalToken], Any]]:
+        operation_profile = self.profile.get_operation(
+            "project_property", current_type_name, field_name
+        )
+        timed_input = _TimedInput(data_contexts)
+        return _profile_outputs(
+            operation_profile,
+            timed_input,
+            lambda: self.adapter.project_property(
+                timed_input, current_type_name, field_name, **hints
+            ),
+            _count_nothing,
+        )
+
+    def project_neighbors(
+        self,
+        data_contexts: Iterable[DataContext[KerbalToken]],
+        current_type_name: str,
+        edge_info: EdgeInfo,
+        **hints: Any,
+    ) -> Iterable[Tuple[DataContext[KerbalToken], Iterable[KerbalToken]]]:
+        direction, edge_name = edge_info
+        operation_profile = self.profile.get_operation(
+            "project_neighbors", current_type_name, f"{direction}_{edge_name}"
+        )
+        timed_input = _TimedInput(data_contexts)
+        neighbor_results = _profile_outputs(
+            operation_profile,
+            timed_input,
+            lambda: self.adapter.project_neighbors(
+                timed_input, current_type_name, edge_info, **hints
+            ),
+            _count_nothing,
+        )
+
+        for data_context, neighbors in neighbor_results:
+            if not isinstance(neighbors, Sized):
+                neighbors = list(neighbors)
+            operation_profile.outputs += len(neighbors)
+            yield (data_context, neighbors)
+
+    def can_coerce_to_type(
+        self,
+        data_contexts: Iterable[DataContext[KerbalToken]],
+        current_type_name: str,
+        coerce_to_type_name: str,
+        **hints: Any,
+    ) -> Iterable[Tuple[DataContext[KerbalToken], bool]]:
+        operation_profile = self.profile.get_operation(
+            "can_coerce_to_type", current_type_name, coerce_to_type_name
+        )
+        timed_input = _TimedInput(data_contexts)
+        return _profile_outputs(
+            operation_profile,
+            timed_input,
+            lambda: self.adapter.can_coerce_to_type(
+                timed_input, current_type_name, coerce_to_type_name, **hints
+            ),
+            _count_coercions,
+        )
+
+
+def profile_results(
+    results: Iterable[Dict[str, Any]], profile: QueryProfile
+) -> Iterator[Dict[str, Any]]:
+    """Yield the results, recording how many there were and how long they took to produce."""
+    iterator = iter(results)
+    try:
+        while True:
+            start_time = perf_counter()
+            try:
+                result = next(iterator)
+            finally:
+                profile.execute_seconds += perf_counter() - start_time
+
+            profile.result_count += 1
+            yield result
+    except StopIteration:
+        pass
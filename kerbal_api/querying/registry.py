@@ -0,0 +1,114 @@
+from threading import Lock
+from typing import Callable, Dict, Optional
+
+from .data_manager import KerbalDataManager, _canonicalize_path
+
+
+DataManagerBuilder = Callable[[str], KerbalDataManager]
+
+
+class _RegistryEntry:
+    data_manager: Optional[KerbalDataManager]  # None until first requested
+    reference_count: int
+    build_lock: Lock  # ensures each entry's data manager is built at most once
+
+    def __init__(self) -> None:
+        self.data_manager = None
+        self.reference_count = 0
+        self.build_lock = Lock()
+
+
+class KerbalDataManagerRegistry:
+    """Process-wide registry of data managers, shared by all adapters for the same KSP install.
+
+    Data managers are built lazily, on the first request for a given install path, and are
+    shared by every holder of that path afterward. Holders must treat them as immutable.
+    Data managers are frozen once built, so they are safe to use from many threads at once.
+    Invalidating a path only affects holders that request the data manager afterward;
+    previous holders keep using the data manager they already received.
+    """
+
+    builder: DataManagerBuilder
+
+    _entries: Dict[str, _RegistryEntry]  # keyed by canonicalized install path
+    _lock: Lock
+
+    def __init__(
+        self, builder: DataManagerBuilder = KerbalDataManager.from_ksp_install_path
+    ) -> None:
+        self.builder = builder
+        self._entries = {}
+        self._lock = Lock()
+
+    def _get_or_create_entry(self, canonicalized_path: str) -> _RegistryEntry:
+        with self._lock:
+            entry = self._entries.get(canonicalized_path, None)
+            if entry is None:
+                entry = _RegistryEntry()
+                self._entries[canonicalized_path] = entry
+            return entry
+
+    def acquire(self, ksp_install_path: str) -> None:
+        """Register one more holder of the data for the given path, without building it yet."""
+        canonicalized_path = _canonicalize_path(ksp_install_path)
+        entry = self._get_or_create_entry(canonicalized_path)
+        with self._lock:
+            entry.reference_count += 1
+
+    def release(self, ksp_install_path: str) -> None:
+        """Unregister a holder of the data for the given path. The data itself stays cached."""
+        canonicalized_path = _canonicalize_path(ksp_install_path)
+        with self._lock:
+            entry = self._entries.get(canonicalized_path, None)
+            if entry is not None and entry.reference_count > 0:
+                entry.reference_count -= 1
+
+    def reference_count(self, ksp_install_path: str) -> int:
+        canonicalized_path = _canonicalize_path(ksp_install_path)
+        with self._lock:
+            entry = self._entries.get(canonicalized_path, None)
+            return entry.reference_count if entry is not None else 0
+
+    def get_data_manager(self, ksp_install_path: str) -> KerbalDataManager:
+        """Return the shared data manager for the given path, building it if necessary."""
+        canonicalized_path = _canonicalize_path(ksp_install_path)
+        entry = self._get_or_create_entry(canonicalized_path)
+
+        data_manager = entry.data_manager
+        if data_manager is None:
+            with entry.build_lock:
+                data_manager = entry.data_manager
+                if data_manager is None:
+                    data_manager = self.builder(canonicalized_path)
+                    entry.data_manager = data_manager
+
+        return data_manager
+
+    def invalidate(self, ksp_install_path: str) -> None:
+        """Drop the cached data for the given path, so that the next request rebuilds it.
+
+        Reference counts are preserved: holders of the path remain registered as such.
+        """
+        canonicalized_path = _canonicalize_path(ksp_install_path)
+        with self._lock:
+            entry = self._entries.get(canonicalized_path, None)
+            if entry is not None:
+                new_entry = _RegistryEntry()
+                new_entry.reference_count = entry.reference_count
+                self._entries[canonicalized_path] = new_entry
+
+    def evict_unused(self) -> None:
+        """Drop the cached data for all paths that currently have no registered holders."""
+        with self._lock:
+            self._entries = {
+                canonicalized_path: entry
+                for canonicalized_path, entry in self._entries.items()
+                if entry.reference_count > 0
+            }
+
+
+_default_registry = KerbalDataManagerRegistry()
+
+
+def get_default_registry() -> KerbalDataManagerRegistry:
+    return _default_registry
@@ -0,0 +1,189 @@
+import csv
+import json
+from typing import IO, Any, Dict, Iterable, List, Mapping, Sequence
+
+
+# Result sinks write query results to a file-like object as they are produced, one row at a time,
+# so memory use does not grow with the size of the result set. Every row is written with the same
+# columns, in the same order: the query's @output names, in the order they appear in the query.
+# Outputs that are missing from a row (e.g. within an @optional block) are written as nulls.
+
+DEFAULT_MAX_BUFFERED_BYTES = 64 * 1024
+DEFAULT_ARROW_BATCH_SIZE = 1024
+
+# GraphQL scalar type name -> name of the pyarrow function that returns the matching Arrow type.
+_arrow_type_factory_names: Dict[str, str] = {
+    "String": "string",
+    "ID": "string",
+    "Int": "int64",
+    "Float": "float64",
+    "Boolean": "bool_",
+}
+
+
+def _import_pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "Writing results in Arrow format requires pyarrow. "
+            "Install it with: pip install kerbal-api[arrow]"
+        ) from e
+    return pyarrow
+
+
+def write_results_as_ndjson(
+    results: Iterable[Mapping[str, Any]],
+    output_file: IO[bytes],
+    output_names: Sequence[str],
+    *,
+    max_buffered_bytes: int = DEFAULT_MAX_BUFFERED_BYTES,
+) -> int:
+    """Write each row as a JSON object on its own line, and return the number of rows written.
+
+    Buffers at most max_buffered_bytes of encoded rows (plus one row) before writing them out.
+    """
+    row_count = 0
+    buffer = bytearray()
+    for row in results:
+        fixed_row = {output_name: row.get(output_name, None) for output_name in output_names}
+        buffer += json.dumps(fixed_row, default=str).encode("utf-8")
+        buffer += b"\n"
+        row_count += 1
+
+        if len(buffer) >= max_buffered_bytes:
+            output_file.write(bytes(buffer))
+            buffer.clear()
+
+    if buffer:
+        output_file.write(bytes(buffer))
+    output_file.flush()
+    return row_count
+
+
+def _to_csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    elif isinstance(value, (list, dict)):
+        # Folded outputs are lists. CSV has no nesting, so write them as JSON.
+        return json.dumps(value, default=str)
+    else:
+        return value
+
+
+def write_results_as_csv(
+    results: Iterable[Mapping[str, Any]], output_file: IO[str], output_names: Sequence[str]
+) -> int:
+    """Write the rows as CSV with a header row, and return the number of rows written.
+
+    The output file must be a text file, opened with newline="". Null values are written
+    as empty cells, and lists (from @fold) as JSON arrays.
+    """
+    writer = csv.writer(output_file)
+    writer.writerow(output_names)
+
+    row_count = 0
+    for row in results:
+        writer.writerow([_to_csv_value(row.get(output_name, None)) for output_name in output_names])
+        row_count += 1
+
+    output_file.flush()
+    return row_count
+
+
+def get_arrow_type(graphql_type: Any) -> Any:
+    """Return the Arrow type for values of the given GraphQL output type."""
+    pyarrow = _import_pyarrow()
+
+    # GraphQL type objects stringify to their names, e.g. "Float", "String!" or "[String]".
+    type_name = str(graphql_type).rstrip("!")
+    if type_name.startswith("[") and type_name.endswith("]"):
+        return pyarrow.list_(get_arrow_type(type_name[1:-1]))
+
+    factory_name = _arrow_type_factory_names.get(type_name, None)
+    if factory_name is None:
+        raise NotImplementedError(f"No Arrow type for GraphQL type {graphql_type}")
+    return getattr(pyarrow, factory_name)()
+
+
+def write_results_as_arrow(
+    results: Iterable[Mapping[str, Any]],
+    output_file: IO[bytes],
+    output_names: Sequence[str],
+    output_types: Sequence[Any],
+    *,
+    batch_size: int = DEFAULT_ARROW_BATCH_SIZE,
+) -> int:
+    """Write the rows as an Arrow IPC stream of record batches, and return the number written.
+
+    Output types are the GraphQL types of each output, which determine the Arrow schema.
+    At most batch_size rows are buffered at a time. Requires the optional pyarrow dependency.
+    """
+    if batch_size < 1:
+        raise ValueError(f"Batch size must be positive, but got {batch_size}.")
+    if len(output_names) != len(output_types):
+        raise ValueError(
+            f"Got {len(output_types)} output types for {len(output_names)} output names."
+        )
+
+    pyarrow = _import_pyarrow()
+    schema = pyarrow.schema(
+        [
+            pyarrow.field(output_name, get_arrow_type(output_type))
+            for output_name, output_type in zip(output_names, output_types)
+        ]
+    )
+
+    row_count = 0
+    buffered_row_count = 0
+    columns: List[List[Any]] = [[] for _ in output_names]
+
+    def write_batch() -> None:
+        batch = pyarrow.record_batch(
+            [pyarrow.array(column, type=field.type) for column, field in zip(columns, schema)],
+            schema=schema,
+        )
+        writer.write_batch(batch)
+        for column in columns:
+            column.clear()
+
+    with pyarrow.ipc.new_stream(output_file, schema) as writer:
+        for row in results:
+            for column, output_name in zip(columns, output_names):
+                column.append(row.get(output_name, None))
+            row_count += 1
+            buffered_row_count += 1
+
+            if buffered_row_count >= batch_size:
+                write_batch()
+                buffered_row_count = 0
+
+        if buffered_row_count > 0:
+            write_batch()
+
+    output_file.flush()
+    return row_count
+
+
+def write_results(
+    results: Iterable[Mapping[str, Any]],
+    output_file: IO[Any],
+    output_metadata: Mapping[str, Any],
+    result_format: str,
+) -> int:
+    """Write the rows in the given format: "ndjson", "csv" or "arrow".
+
+    Takes the columns from a compiled query's output metadata. Returns the number of rows written.
+    """
+    output_names = list(output_metadata)
+    if result_format == "ndjson":
+        return write_results_as_ndjson(results, output_file, output_names)
+    elif result_format == "csv":
+        return write_results_as_csv(results, output_file, output_names)
+    elif result_format == "arrow":
+        output_types = [output_metadata[output_name].type for output_name in output_names]
+        return write_results_as_arrow(results, output_file, output_names, output_types)
+    else:
+        raise ValueError(
+            f"Unknown result format {result_format}, expected one of: ndjson, csv, arrow."
+        )
@@ -160,9 +160,14 @@ type Technology {
     out_Technology_MandatoryPrerequisite: [Technology]  # to unlock this tech, unlock all of these
     out_Technology_AnyOfPrerequisite: [Technology]  # to unlock this tech, unlock any of these
 
-    # TODO: add these "opposite direction" edges
-    # in_Technology_MandatoryPrerequisite: [Technology]  # this tech is a prereq for the following
-    # in_Technology_AnyOfPrerequisite: [Technology]  # this is an "any of" prereq for the following
+    in_Technology_MandatoryPrerequisite: [Technology]  # this tech is a prereq for the following
+    in_Technology_AnyOfPrerequisite: [Technology]  # this is an "any of" prereq for the following
+
+    # All techs reachable through any chain of mandatory or "any of" prerequisites,
+    # i.e. the techs that can be involved in unlocking this tech.
+    out_Technology_TransitivePrerequisite: [Technology]
+    # All techs that this tech is a transitive prerequisite for.
+    in_Technology_TransitivePrerequisite: [Technology]
 }
 
 type RootSchemaQuery {
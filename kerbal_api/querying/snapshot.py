@@ -0,0 +1,77 @@
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+from typing import Any, NamedTuple, Optional
+
+
+# Bump this version whenever the pickled representation of the data manager changes in a way
+# that is not backward-compatible, e.g. when tokens gain or lose attributes. Snapshots written
+# with a different version are ignored and rebuilt from the game files.
+SNAPSHOT_FORMAT_VERSION = 16
+
+_snapshot_magic = b"KERBAL-API-SNAPSHOT\n"
+_snapshot_version_format = struct.Struct(">I")
+_snapshot_header_length = len(_snapshot_magic) + _snapshot_version_format.size
+
+
+class CfgFileStat(NamedTuple):
+    size: int
+    mtime_ns: int
+    content_hash: Optional[str]  # only computed when explicitly requested, since it's slower
+
+
+def get_cfg_file_stat(file_path: str, *, with_content_hash: bool) -> CfgFileStat:
+    stat_result = os.stat(file_path)
+
+    content_hash: Optional[str] = None
+    if with_content_hash:
+        with open(file_path, "rb") as f:
+            content_hash = hashlib.sha256(f.read()).hexdigest()
+
+    return CfgFileStat(stat_result.st_size, stat_result.st_mtime_ns, content_hash)
+
+
+def write_snapshot(value: Any, snapshot_path: str) -> None:
+    # Write to a temporary file first, then atomically move it into place, so that readers
+    # never observe a partially-written snapshot.
+    temporary_path = f"{snapshot_path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary_path, "wb") as f:
+            f.write(_snapshot_magic)
+            f.write(_snapshot_version_format.pack(SNAPSHOT_FORMAT_VERSION))
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, snapshot_path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+
+def read_snapshot(snapshot_path: str) -> Optional[Any]:
+    """Load the snapshot at the given path, returning None if it is missing or unusable."""
+    try:
+        with open(snapshot_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _snapshot_header_length:
+                return None
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                if mapped_file[: len(_snapshot_magic)] != _snapshot_magic:
+                    return None
+
+                (version,) = _snapshot_version_format.unpack_from(mapped_file, len(_snapshot_magic))
+                if version != SNAPSHOT_FORMAT_VERSION:
+                    return None
+
+                # Unpickle straight out of the memory-mapped file, without copying its contents.
+                with memoryview(mapped_file) as snapshot_view, snapshot_view[
+                    _snapshot_header_length:
+                ] as pickled_data:
+                    try:
+                        return pickle.loads(pickled_data)
+                    except Exception:
+                        # The snapshot is corrupted, or refers to code that no longer exists
+                        # or has changed, e.g. a token constructor that takes different arguments.
+                        return None
+    except FileNotFoundError:
+        return None
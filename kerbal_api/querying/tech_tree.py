@@ -0,0 +1,105 @@
+from typing import Dict, Iterator, List, Sequence
+
+from .tokens import KerbalConfigToken
+
+
+def _get_prerequisite_ids(technology: KerbalConfigToken) -> List[str]:
+    return (
+        technology.foreign_keys["mandatory_prereq_ids"]
+        + technology.foreign_keys["any_of_prereq_ids"]
+    )
+
+
+def _iter_bitset_ordinals(bitset: int) -> Iterator[int]:
+    while bitset:
+        lowest_bit = bitset & -bitset
+        yield lowest_bit.bit_length() - 1
+        bitset ^= lowest_bit
+
+
+class TechPrerequisiteClosure:
+    """Precomputed transitive closure of the tech tree's prerequisite edges.
+
+    A tech's transitive prerequisites are all techs reachable from it via any chain of
+    mandatory or "any of" prerequisite edges; its transitive dependents are the reverse.
+    Both are stored as bitsets over the techs' positions in the list of techs.
+    """
+
+    technologies: Sequence[KerbalConfigToken]
+    ordinals_by_id: Dict[str, int]
+    prerequisite_bitsets: List[int]
+    dependent_bitsets: List[int]
+
+    def __init__(self, technologies: Sequence[KerbalConfigToken]) -> None:
+        self.technologies = technologies
+        self.ordinals_by_id = {
+            technology.content["id"]: ordinal for ordinal, technology in enumerate(technologies)
+        }
+
+        technology_count = len(technologies)
+        self.prerequisite_bitsets = [0] * technology_count
+        self.dependent_bitsets = [0] * technology_count
+
+        # Visit techs in an order where all prerequisites of a tech come before the tech itself,
+        # using an iterative depth-first search to avoid deep recursion on long chains.
+        # Each tech's prerequisites are then the union of its direct prerequisites' closures.
+        visited = [False] * technology_count
+        in_progress = [False] * technology_count
+        for start_ordinal in range(technology_count):
+            if visited[start_ordinal]:
+                continue
+
+            stack = [(start_ordinal, False)]
+            while stack:
+                ordinal, prerequisites_done = stack.pop()
+                prerequisite_ordinals = [
+                    self.ordinals_by_id[prereq_id]
+                    for prereq_id in _get_prerequisite_ids(technologies[ordinal])
+                ]
+
+                if prerequisites_done:
+                    in_progress[ordinal] = False
+                    visited[ordinal] = True
+
+                    bitset = 0
+                    for prerequisite_ordinal in prerequisite_ordinals:
+                        bitset |= (1 << prerequisite_ordinal) | self.prerequisite_bitsets[
+                            prerequisite_ordinal
+                        ]
+                    self.prerequisite_bitsets[ordinal] = bitset
+                    continue
+
+                if visited[ordinal]:
+                    continue
+                if in_progress[ordinal]:
+                    raise AssertionError(
+                        f"Unexpected cycle in the tech tree, involving tech "
+                        f"{technologies[ordinal].content['id']}"
+                    )
+
+                in_progress[ordinal] = True
+                stack.append((ordinal, True))
+                for prerequisite_ordinal in prerequisite_ordinals:
+                    if not visited[prerequisite_ordinal]:
+                        stack.append((prerequisite_ordinal, False))
+
+        for ordinal, bitset in enumerate(self.prerequisite_bitsets):
+            dependent_bit = 1 << ordinal
+            for prerequisite_ordinal in _iter_bitset_ordinals(bitset):
+                self.dependent_bitsets[prerequisite_ordinal] |= dependent_bit
+
+    def _get_technologies(self, bitset: int) -> List[KerbalConfigToken]:
+        return [self.technologies[ordinal] for ordinal in _iter_bitset_ordinals(bitset)]
+
+    def get_transitive_prerequisites(self, technology_id: str) -> List[KerbalConfigToken]:
+        """Return all techs that must or may be unlocked before the given tech, in list order."""
+        return self._get_technologies(self.prerequisite_bitsets[self.ordinals_by_id[technology_id]])
+
+    def get_transitive_dependents(self, technology_id: str) -> List[KerbalConfigToken]:
+        """Return all techs that the given tech helps unlock, directly or not, in list order."""
+        return self._get_technologies(self.dependent_bitsets[self.ordinals_by_id[technology_id]])
+
+    def is_transitive_prerequisite(self, prerequisite_id: str, technology_id: str) -> bool:
+        prerequisite_ordinal = self.ordinals_by_id[prerequisite_id]
+        technology_ordinal = self.ordinals_by_id[technology_id]
+        return bool(self.prerequisite_bitsets[technology_ordinal] >> prerequisite_ordinal & 1)
@@ -1,34 +1,234 @@
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Set
+from operator import attrgetter
+import sys
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
 
 from ..cfg_parser.coercing_reads import read_bool, read_float, read_int, read_str
-from ..cfg_parser.typedefs import CfgKey, ParsedCfgFile
+from ..cfg_parser.node_tree import CfgData, as_cfg_node
+from ..cfg_parser.typedefs import CfgKey
+
+
+# Tokens of the same type nearly always have the same field names, in the same order.
+# All field mappings with the same field names share a single mapping of field name to position.
+_field_positions_by_field_names: Dict[Tuple[str, ...], Dict[str, int]] = {}
+
+
+def _get_field_positions(field_names: Tuple[str, ...]) -> Dict[str, int]:
+    field_positions = _field_positions_by_field_names.get(field_names, None)
+    if field_positions is None:
+        field_positions = {
+            sys.intern(field_name): position for position, field_name in enumerate(field_names)
+        }
+        # N.B.: setdefault() is atomic, so concurrent callers all end up with the same mapping.
+        field_positions = _field_positions_by_field_names.setdefault(field_names, field_positions)
+    return field_positions
+
+
+def intern_cfg_key(cfg_key: CfgKey) -> CfgKey:
+    """Return a copy of the given cfg key whose section and key names are interned strings."""
+    # Many tokens come from the same-named sections, so share a single copy of each name.
+    # N.B.: Unlike a module-level cache of cfg keys, interned strings are freed once unused,
+    #       so long-lived processes that load many installs do not accumulate cfg keys.
+    return tuple((sys.intern(name), index) for name, index in cfg_key)
+
+
+class TokenFields(Mapping[str, Any]):
+    """A compact, read-only mapping of field names to values.
+
+    Stores only a tuple of values, plus a field-position mapping shared with every other
+    TokenFields that has the same field names. Compares equal to a dict with the same items.
+    """
+
+    __slots__ = ("_field_positions", "_values")
+
+    _field_positions: Dict[str, int]
+    _values: Tuple[Any, ...]
+
+    def __init__(self, fields: Mapping[str, Any]) -> None:
+        self._field_positions = _get_field_positions(tuple(fields))
+        self._values = tuple(fields.values())
+
+    def __getitem__(self, field_name: str) -> Any:
+        return self._values[self._field_positions[field_name]]
+
+    def get(self, field_name: str, default: Any = None) -> Any:
+        position = self._field_positions.get(field_name, None)
+        if position is None:
+            return default
+        return self._values[position]
+
+    def __contains__(self, field_name: object) -> bool:
+        return field_name in self._field_positions
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TokenFields):
+            return self._values == other._values and (
+                self._field_positions is other._field_positions
+                or tuple(self._field_positions) == tuple(other._field_positions)
+            )
+        return super().__eq__(other)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._field_positions)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return repr(dict(zip(self._field_positions, self._values)))
+
+    def __reduce__(self) -> Any:
+        # Unpickled values must go through the constructor, to share the field-position mapping.
+        return (TokenFields, (dict(zip(self._field_positions, self._values)),))
+
+
+def _as_token_fields(fields: Mapping[str, Any]) -> TokenFields:
+    if isinstance(fields, TokenFields):
+        return fields
+    return TokenFields(fields)
 
 
-@dataclass
 class KerbalToken:
+    __slots__ = ("type_name", "content", "foreign_keys")
+
     type_name: str
-    content: Dict[str, Any]  # field values
-    foreign_keys: Dict[str, List[Any]]  # values that help us look up neighbors
+    content: TokenFields  # field values
+    foreign_keys: TokenFields  # values that help us look up neighbors
+
+    def __init__(
+        self, type_name: str, content: Mapping[str, Any], foreign_keys: Mapping[str, Any]
+    ) -> None:
+        self.type_name = sys.intern(type_name)
+        self.content = _as_token_fields(content)
+        self.foreign_keys = _as_token_fields(foreign_keys)
+
+    def _get_constructor_args(self) -> Tuple[Any, ...]:
+        return (self.type_name, self.content, self.foreign_keys)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._get_constructor_args() == other._get_constructor_args()  # type: ignore
+
+    # Tokens compare by value but are not immutable, so they are not hashable.
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        args = ", ".join(
+            f"{attribute}={value!r}"
+            for attribute, value in zip(self._get_attribute_names(), self._get_constructor_args())
+        )
+        return f"{self.__class__.__name__}({args})"
+
+    def __reduce__(self) -> Any:
+        # Unpickled tokens must go through the constructor, to intern their values again.
+        return (self.__class__, self._get_constructor_args())
+
+    @classmethod
+    def _get_attribute_names(cls) -> Tuple[str, ...]:
+        return KerbalToken.__slots__
 
 
-@dataclass
 class KerbalConfigToken(KerbalToken):
+    __slots__ = ("from_cfg_file_path", "from_cfg_root")
+
     from_cfg_file_path: str
     from_cfg_root: CfgKey
 
-
-def make_part_token(cfg_file_path: str, part_config: ParsedCfgFile) -> Optional[KerbalConfigToken]:
+    def __init__(
+        self,
+        type_name: str,
+        content: Mapping[str, Any],
+        foreign_keys: Mapping[str, Any],
+        from_cfg_file_path: str,
+        from_cfg_root: CfgKey,
+    ) -> None:
+        super().__init__(type_name, content, foreign_keys)
+        self.from_cfg_file_path = sys.intern(from_cfg_file_path)
+        self.from_cfg_root = intern_cfg_key(from_cfg_root)
+
+    def _get_constructor_args(self) -> Tuple[Any, ...]:
+        return super()._get_constructor_args() + (self.from_cfg_file_path, self.from_cfg_root)
+
+    @classmethod
+    def _get_attribute_names(cls) -> Tuple[str, ...]:
+        return KerbalToken.__slots__ + KerbalConfigToken.__slots__
+
+
+def _get_values_by_name(
+    tokens: Iterable[Optional[KerbalToken]],
+    name: str,
+    get_fields: Callable[[KerbalToken], TokenFields],
+) -> List[Any]:
+    values: List[Any] = []
+    append_value = values.append
+
+    current_field_positions: Optional[Dict[str, int]] = None
+    position = 0
+    for token in tokens:
+        if token is None:
+            append_value(None)
+            continue
+
+        fields = get_fields(token)
+        field_positions = fields._field_positions
+        if field_positions is not current_field_positions:
+            current_field_positions = field_positions
+            position = field_positions[name]
+        append_value(fields._values[position])
+
+    return values
+
+
+def get_field_values(tokens: Iterable[Optional[KerbalToken]], field_name: str) -> List[Any]:
+    """Return the value of the given content field for each token, or None for None tokens.
+
+    Finds the field's position once per distinct set of field names (in practice, once per type)
+    instead of once per token, then reads values directly by position.
+    """
+    return _get_values_by_name(tokens, field_name, attrgetter("content"))
+
+
+def iter_context_field_values(
+    data_contexts: Iterable[Any], field_name: str
+) -> Iterator[Tuple[Any, Any]]:
+    """Yield (data context, value) pairs for the given content field of each context's token.
+
+    Data contexts are objects with a "current_token" attribute, such as the interpreter's
+    DataContext. The value is None for contexts without a current token. Like get_field_values(),
+    finds the field's position once per distinct set of field names, but in a single lazy pass.
+    """
+    current_field_positions: Optional[Dict[str, int]] = None
+    position = 0
+    for data_context in data_contexts:
+        token = data_context.current_token
+        if token is None:
+            yield (data_context, None)
+            continue
+
+        fields = token.content
+        field_positions = fields._field_positions
+        if field_positions is not current_field_positions:
+            current_field_positions = field_positions
+            position = field_positions[field_name]
+        yield (data_context, fields._values[position])
+
+
+def get_foreign_key_values(tokens: Iterable[Optional[KerbalToken]], key_name: str) -> List[Any]:
+    """Return the value of the given foreign key for each token, or None for None tokens."""
+    return _get_values_by_name(tokens, key_name, attrgetter("foreign_keys"))
+
+
+def make_part_token(cfg_file_path: str, part_config: CfgData) -> Optional[KerbalConfigToken]:
     type_name = "Part"
 
     base_key = (("PART", 0),)
-    name_key = base_key + (("name", 0),)
+    part_node = as_cfg_node(part_config).child("PART")
 
-    if name_key not in part_config:
+    if part_node is None or part_node.get_value("name") is None:
         # There is no part definition in this file.
         return None
 
-    internal_name = read_str(part_config, name_key)
+    internal_name = read_str(part_node, (("name", 0),))
 
     non_part_blacklist: Set[str] = {
         "flag",
@@ -45,20 +245,19 @@ def make_part_token(cfg_file_path: str, part_config: ParsedCfgFile) -> Optional[
     content: Dict[str, Any] = {
         "cfg_file_path": cfg_file_path,
         "internal_name": internal_name,
-        "name": read_str(part_config, base_key + (("title", 0),)),
-        "manufacturer": read_str(part_config, base_key + (("manufacturer", 0),), default="N/A"),
-        "cost": read_int(part_config, base_key + (("cost", 0),)),
-        "development_cost": read_int(part_config, base_key + (("entryCost", 0),)),
-        "dry_mass": read_float(part_config, base_key + (("mass", 0),)),
-        "crash_tolerance": read_float(part_config, base_key + (("crashTolerance", 0),)),
-        "max_temp_tolerance": read_float(part_config, base_key + (("maxTemp", 0),), default=1200.0),
+        "name": read_str(part_node, (("title", 0),)),
+        "manufacturer": read_str(part_node, (("manufacturer", 0),), default="N/A"),
+        "cost": read_int(part_node, (("cost", 0),)),
+        "development_cost": read_int(part_node, (("entryCost", 0),)),
+        "dry_mass": read_float(part_node, (("mass", 0),)),
+        "crash_tolerance": read_float(part_node, (("crashTolerance", 0),)),
+        "max_temp_tolerance": read_float(part_node, (("maxTemp", 0),), default=1200.0),
     }
 
     foreign_keys: Dict[str, List[Any]] = {"tech_required": []}
 
-    tech_required_key = base_key + (("TechRequired", 0),)
-    if tech_required_key in part_config:
-        tech_required = read_str(part_config, tech_required_key)
+    if part_node.get_value("TechRequired") is not None:
+        tech_required = read_str(part_node, (("TechRequired", 0),))
 
         # The PotatoRoid has the below invalid tech name key set.
         # Instead of pretending it has a required tech that doesn't exist,
@@ -69,77 +268,72 @@ def make_part_token(cfg_file_path: str, part_config: ParsedCfgFile) -> Optional[
     return KerbalConfigToken(type_name, content, foreign_keys, cfg_file_path, base_key)
 
 
-def make_resource_tokens(
-    cfg_file_path: str, parsed_cfg_file: ParsedCfgFile
-) -> List[KerbalConfigToken]:
+def make_resource_tokens(cfg_file_path: str, parsed_cfg_file: CfgData) -> List[KerbalConfigToken]:
     type_name = "Resource"
 
     results: List[KerbalConfigToken] = []
 
-    counter = 0
-    base_key = (("RESOURCE_DEFINITION", counter),)
-    name_key = base_key + (("name", 0),)
+    root_node = as_cfg_node(parsed_cfg_file)
+    for resource_node in root_node.children_named("RESOURCE_DEFINITION"):
+        if resource_node.get_value("name") is None:
+            # Resources are only defined by sections that have a name.
+            break
 
-    while name_key in parsed_cfg_file:
+        base_key = (("RESOURCE_DEFINITION", resource_node.index),)
         content: Dict[str, Any] = {
             "cfg_file_path": cfg_file_path,
-            "internal_name": read_str(parsed_cfg_file, name_key),
-            "name": read_str(parsed_cfg_file, base_key + (("displayName", 0),)),
-            "density": read_float(parsed_cfg_file, base_key + (("density", 0),)),
-            "specific_heat": read_float(parsed_cfg_file, base_key + (("hsp", 0),)),
-            "unit_cost": read_float(parsed_cfg_file, base_key + (("unitCost", 0),)),
-            "specific_volume": read_float(
-                parsed_cfg_file, base_key + (("volume", 0),), default=0.0,
-            ),
+            "internal_name": read_str(resource_node, (("name", 0),)),
+            "name": read_str(resource_node, (("displayName", 0),)),
+            "density": read_float(resource_node, (("density", 0),)),
+            "specific_heat": read_float(resource_node, (("hsp", 0),)),
+            "unit_cost": read_float(resource_node, (("unitCost", 0),)),
+            "specific_volume": read_float(resource_node, (("volume", 0),), default=0.0,),
         }
 
         results.append(KerbalConfigToken(type_name, content, {}, cfg_file_path, base_key))
 
-        counter += 1
-        base_key = (("RESOURCE_DEFINITION", counter),)
-        name_key = base_key + (("name", 0),)
-
     return results
 
 
-def make_technology_tokens(
-    cfg_file_path: str, parsed_cfg_file: ParsedCfgFile
-) -> List[KerbalConfigToken]:
+def make_technology_tokens(cfg_file_path: str, parsed_cfg_file: CfgData) -> List[KerbalConfigToken]:
     type_name = "Technology"
 
     results: List[KerbalConfigToken] = []
 
-    counter = 0
-    base_key = (("TechTree", 0), ("RDNode", counter))
-    id_key = base_key + (("id", 0),)
+    tech_tree_node = as_cfg_node(parsed_cfg_file).child("TechTree")
+    if tech_tree_node is None:
+        return results
 
-    while id_key in parsed_cfg_file:
+    for tech_node in tech_tree_node.children_named("RDNode"):
+        if tech_node.get_value("id") is None:
+            # Technologies are only defined by sections that have an id.
+            break
+
+        base_key = (("TechTree", 0), ("RDNode", tech_node.index))
         content: Dict[str, Any] = {
             "cfg_file_path": cfg_file_path,
-            "id": read_str(parsed_cfg_file, id_key),
-            "name": read_str(parsed_cfg_file, base_key + (("title", 0),)),
-            "description": read_str(parsed_cfg_file, base_key + (("description", 0),)),
-            "science_cost": read_float(parsed_cfg_file, base_key + (("cost", 0),)),
+            "id": read_str(tech_node, (("id", 0),)),
+            "name": read_str(tech_node, (("title", 0),)),
+            "description": read_str(tech_node, (("description", 0),)),
+            "science_cost": read_float(tech_node, (("cost", 0),)),
         }
 
-        any_of_prereqs = read_bool(parsed_cfg_file, base_key + (("anyToUnlock", 0),))
+        any_of_prereqs = read_bool(tech_node, (("anyToUnlock", 0),))
         foreign_keys: Dict[str, List[Any]] = {
             "mandatory_prereq_ids": [],
             "any_of_prereq_ids": [],
         }
 
-        prereq_counter = 0
-        prereq_key = base_key + (("Parent", prereq_counter), ("parentID", 0))
-        while prereq_key in parsed_cfg_file:
-            prereq_id = read_str(parsed_cfg_file, prereq_key)
+        for prereq_node in tech_node.children_named("Parent"):
+            if prereq_node.get_value("parentID") is None:
+                break
+
+            prereq_id = read_str(prereq_node, (("parentID", 0),))
             if any_of_prereqs:
                 foreign_keys["any_of_prereq_ids"].append(prereq_id)
             else:
                 foreign_keys["mandatory_prereq_ids"].append(prereq_id)
 
-            prereq_counter += 1
-            prereq_key = base_key + (("Parent", prereq_counter), ("parentID", 0))
-
         # Fix for occasional game data problem: "any of" requirement, but only one tech.
         # We make such prerequisites mandatory, since there is no choice to be made.
         if len(foreign_keys["any_of_prereq_ids"]) == 1:
@@ -148,8 +342,4 @@ def make_technology_tokens(
 
         results.append(KerbalConfigToken(type_name, content, foreign_keys, cfg_file_path, base_key))
 
-        counter += 1
-        base_key = (("TechTree", 0), ("RDNode", counter))
-        id_key = base_key + (("id", 0),)
-
     return results
@@ -0,0 +1,354 @@
+"""Serve GraphQL queries over HTTP, from a single copy of the game data loaded up front.
+
+Run with: python -m kerbal_api.serve [--port PORT | --unix-socket PATH] [--workers N]
+
+Endpoints:
+- POST /query, with a JSON body like {"query": "...", "args": {...}}. Result rows are streamed
+  back as newline-delimited JSON. Invalid requests, queries and query arguments get a 400 response
+  with a JSON body like {"error": "..."}. Other errors get a 500 response, and are logged.
+  Errors after the first row was sent are reported as a final {"error": "..."} line,
+  since the response status can no longer be changed at that point.
+- GET /health, which returns {"status": "ok"} once the data is loaded.
+
+The game data is loaded and warmed up once, in the parent process, which then forks the workers.
+The workers share the data with the parent copy-on-write, and accept connections from the same
+listening socket. Each worker caches its own compiled queries.
+"""
+from argparse import ArgumentParser
+from functools import partial
+import gc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+import os
+import signal
+import socket
+import time
+import traceback
+from types import FrameType
+from typing import Any, Dict, Iterator, List, Optional
+
+from graphql_compiler.exceptions import (
+    GraphQLError,
+    GraphQLInvalidArgumentError,
+    GraphQLValidationError,
+)
+
+from .querying import KerbalDataAdapter, KerbalDataManagerRegistry, execute_query
+from .querying.data_manager import KerbalDataManager
+from .utils import get_ksp_install_path
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+
+# Rows are buffered into chunks of about this many bytes before being sent.
+RESPONSE_CHUNK_SIZE = 64 * 1024
+
+# Workers that exit within this many seconds of being forked are considered to fail on startup.
+# Their replacements are forked after an exponentially growing delay, and after this many startup
+# failures in a row, the server stops instead of forking replacements that would fail too.
+WORKER_STARTUP_SECONDS = 5.0
+WORKER_RESTART_BASE_DELAY_SECONDS = 0.5
+MAX_WORKER_STARTUP_FAILURES = 5
+
+# Errors caused by the query or its arguments, as opposed to errors within the server.
+_client_error_types = (GraphQLError, GraphQLValidationError, GraphQLInvalidArgumentError)
+
+_INTERNAL_ERROR_MESSAGE = "Internal error while executing the query."
+
+logger = logging.getLogger(__name__)
+
+
+def _encode_json_line(value: Any) -> bytes:
+    return (json.dumps(value, default=str) + "\n").encode("utf-8")
+
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "QueryServer"
+
+    def address_string(self) -> str:
+        # Clients connected over a Unix socket have no address.
+        if isinstance(self.client_address, tuple):
+            return super().address_string()
+        return "unix-socket-client"
+
+    def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+        encoded_body = _encode_json_line(body)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded_body)))
+        self.end_headers()
+        self.wfile.write(encoded_body)
+
+    def _send_chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+        self._send_json(200, {"status": "ok"})
+
+    def do_POST(self) -> None:
+        if self.path != "/query":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+
+        try:
+            content_length = int(self.headers.get("Content-Length", ""))
+            request = json.loads(self.rfile.read(content_length))
+            query = request["query"]
+            args = request.get("args", {})
+            if not isinstance(query, str) or not isinstance(args, dict):
+                raise TypeError("The query must be a string, and the args must be an object.")
+        except (ValueError, KeyError, TypeError) as e:
+            self.close_connection = True
+            self._send_json(400, {"error": f"Invalid request: {e!r}"})
+            return
+
+        # Compile the query and compute its first row before responding,
+        # so that errors in the query itself still get an error status.
+        results: Iterator[Dict[str, Any]] = iter(())
+        try:
+            results = iter(execute_query(self.server.adapter, query, args))
+            first_rows = [next(results)]
+        except StopIteration:
+            first_rows = []
+        except _client_error_types as e:
+            self._send_json(400, {"error": repr(e)})
+            return
+        except Exception:
+            logger.exception("Internal error while executing query: %s", query)
+            self._send_json(500, {"error": _INTERNAL_ERROR_MESSAGE})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        try:
+            self._stream_rows(first_rows, results)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client went away. Stop computing results for it.
+            self.close_connection = True
+        finally:
+            close_results = getattr(results, "close", None)
+            if close_results is not None:
+                close_results()
+
+    def _stream_rows(self, first_rows: List[Dict[str, Any]], results: Iterator[Any]) -> None:
+        buffer = bytearray()
+        for row in first_rows:
+            buffer += _encode_json_line(row)
+
+        try:
+            for row in results:
+                buffer += _encode_json_line(row)
+                if len(buffer) >= RESPONSE_CHUNK_SIZE:
+                    self._send_chunk(bytes(buffer))
+                    buffer.clear()
+        except _client_error_types as e:
+            buffer += _encode_json_line({"error": repr(e)})
+        except Exception:
+            logger.exception("Internal error while streaming query results")
+            buffer += _encode_json_line({"error": _INTERNAL_ERROR_MESSAGE})
+
+        if buffer:
+            self._send_chunk(bytes(buffer))
+        self._send_chunk(b"")
+
+
+class QueryServer(ThreadingHTTPServer):
+    """An HTTP server that answers queries from an already-listening socket."""
+
+    daemon_threads = True
+
+    adapter: KerbalDataAdapter
+
+    def __init__(self, listening_socket: socket.socket, adapter: KerbalDataAdapter) -> None:
+        super().__init__(
+            listening_socket.getsockname(), QueryRequestHandler, bind_and_activate=False
+        )
+        self.socket.close()
+        self.socket = listening_socket
+        self.adapter = adapter
+
+
+def make_listening_socket(
+    *, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_socket_path: Optional[str] = None
+) -> socket.socket:
+    if unix_socket_path is not None:
+        if os.path.exists(unix_socket_path):
+            os.unlink(unix_socket_path)
+        listening_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listening_socket.bind(unix_socket_path)
+    else:
+        listening_socket = socket.create_server((host, port))
+
+    listening_socket.listen(socket.SOMAXCONN)
+    return listening_socket
+
+
+def warm_up_data_manager(data_manager: KerbalDataManager) -> None:
+    """Build all lazily-built data that queries commonly need, so workers can share it."""
+    for type_name in list(data_manager.pending_cfg_file_paths_by_type):
+        data_manager.ensure_ingested(type_name)
+    data_manager.materialize_part_neighbors()
+    data_manager.get_technology_prerequisite_closure()
+
+
+def _run_worker(listening_socket: socket.socket, adapter: KerbalDataAdapter) -> None:
+    server = QueryServer(listening_socket, adapter)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def _fork_worker(listening_socket: socket.socket, adapter: KerbalDataAdapter) -> int:
+    pid = os.fork()
+    if pid != 0:
+        return pid
+
+    # In the worker: the parent decides when workers stop, and tells them with SIGTERM.
+    exit_code = 1
+    try:
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        _run_worker(listening_socket, adapter)
+        exit_code = 0
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        # Never return into the parent's code, nor run its cleanup.
+        os._exit(exit_code)
+
+
+class WorkerRestartPolicy:
+    """Decides when to replace workers that exited unexpectedly, and when to give up instead."""
+
+    __slots__ = ("consecutive_startup_failures",)
+
+    consecutive_startup_failures: int
+
+    def __init__(self) -> None:
+        self.consecutive_startup_failures = 0
+
+    def get_restart_delay(self, worker_uptime: float) -> Optional[float]:
+        """Return how many seconds to wait before replacing the worker, or None to give up."""
+        if worker_uptime >= WORKER_STARTUP_SECONDS:
+            self.consecutive_startup_failures = 0
+            return 0.0
+
+        self.consecutive_startup_failures += 1
+        if self.consecutive_startup_failures >= MAX_WORKER_STARTUP_FAILURES:
+            return None
+        return WORKER_RESTART_BASE_DELAY_SECONDS * 2 ** (self.consecutive_startup_failures - 1)
+
+
+def serve(adapter: KerbalDataAdapter, listening_socket: socket.socket, *, workers: int) -> None:
+    """Serve queries until interrupted, from the given number of forked worker processes.
+
+    With zero workers, or on platforms without fork(), serves from the current process instead.
+    Raises RuntimeError if workers keep exiting right after they start.
+    """
+    warm_up_data_manager(adapter.data_manager)
+
+    if workers == 0 or not hasattr(os, "fork"):
+        _run_worker(listening_socket, adapter)
+        return
+
+    # Keep the garbage collector from touching the loaded data in the workers,
+    # which would make them copy the memory pages it lives in.
+    gc.collect()
+    gc.freeze()
+
+    stopping = False
+    gave_up = False
+    worker_start_times: Dict[int, float] = {}  # worker pid -> time.monotonic() when forked
+    restart_policy = WorkerRestartPolicy()
+
+    def _stop(signal_number: int, frame: Optional[FrameType]) -> None:
+        nonlocal stopping
+        stopping = True
+        for worker_pid in worker_start_times:
+            os.kill(worker_pid, signal.SIGTERM)
+
+    def _start_worker() -> None:
+        worker_start_times[_fork_worker(listening_socket, adapter)] = time.monotonic()
+
+    signal.signal(signal.SIGINT, _stop)
+    signal.signal(signal.SIGTERM, _stop)
+
+    for _ in range(workers):
+        _start_worker()
+
+    while worker_start_times:
+        try:
+            worker_pid, _ = os.wait()
+        except ChildProcessError:
+            break
+        start_time = worker_start_times.pop(worker_pid, None)
+        if stopping or start_time is None:
+            continue
+
+        # Replace workers that exited unexpectedly, unless they keep failing on startup.
+        restart_delay = restart_policy.get_restart_delay(time.monotonic() - start_time)
+        if restart_delay is None:
+            logger.error(
+                "Workers exited on startup %d times in a row, stopping.",
+                restart_policy.consecutive_startup_failures,
+            )
+            gave_up = True
+            _stop(signal.SIGTERM, None)
+            continue
+
+        time.sleep(restart_delay)
+        if not stopping:
+            _start_worker()
+
+    if gave_up:
+        raise RuntimeError("Stopped serving, since workers kept exiting right after starting.")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = ArgumentParser(prog="python -m kerbal_api.serve", description=__doc__.split("\n")[0])
+    parser.add_argument("--ksp-install-path", default=None)
+    parser.add_argument("--snapshot-path", default=None)
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix-socket", dest="unix_socket_path", default=None)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    options = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(process)d %(message)s")
+
+    if options.workers < 0:
+        parser.error(f"The number of workers cannot be negative, but got {options.workers}.")
+
+    ksp_install_path = options.ksp_install_path
+    if ksp_install_path is None:
+        ksp_install_path = get_ksp_install_path()
+
+    registry = KerbalDataManagerRegistry(
+        partial(KerbalDataManager.from_ksp_install_path, snapshot_path=options.snapshot_path)
+    )
+    adapter = KerbalDataAdapter(ksp_install_path, registry=registry)
+
+    listening_socket = make_listening_socket(
+        host=options.host, port=options.port, unix_socket_path=options.unix_socket_path
+    )
+    logger.info("Serving queries on %s", listening_socket.getsockname())
+
+    try:
+        serve(adapter, listening_socket, workers=options.workers)
+    finally:
+        listening_socket.close()
+        if options.unix_socket_path is not None and os.path.exists(options.unix_socket_path):
+            os.unlink(options.unix_socket_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Event
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+import unittest
+
+from ..querying import KerbalDataAdapter, execute_query, execute_query_async, get_default_adapter
+from ..querying.tokens import KerbalToken
+from ..utils import get_ksp_install_path
+
+
+_PARTS_QUERY = """
+{
+    Part {
+        name @output(out_name: "part_name")
+        cost @output(out_name: "cost")
+    }
+}
+"""
+
+
+class _SlowAdapter(KerbalDataAdapter):
+    """Produces root tokens slowly, and records when the query stops asking for more."""
+
+    stopped: Event
+
+    def __init__(self, ksp_install_path: str) -> None:
+        super().__init__(ksp_install_path)
+        self.stopped = Event()
+
+    def get_tokens_of_type(self, type_name: str, **hints: Any) -> Iterable[KerbalToken]:
+        return self._produce_slowly(super().get_tokens_of_type(type_name, **hints))
+
+    def _produce_slowly(self, tokens: Iterable[KerbalToken]) -> Iterator[KerbalToken]:
+        try:
+            for token in tokens:
+                time.sleep(0.02)
+                yield token
+        finally:
+            self.stopped.set()
+
+
+class _CloseRecordingIterator(Iterator[Any]):
+    closed: bool
+
+    def __init__(self, iterator: Iterator[Any]) -> None:
+        self._iterator = iterator
+        self.closed = False
+
+    def __next__(self) -> Any:
+        return next(self._iterator)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _GatedExecutor(ThreadPoolExecutor):
+    """Runs submitted work only once the gate is opened, recording the iterators it returns."""
+
+    gate: Event
+    returned_iterators: List[_CloseRecordingIterator]
+
+    def __init__(self) -> None:
+        super().__init__(max_workers=1)
+        self.gate = Event()
+        self.returned_iterators = []
+
+    def submit(  # type: ignore
+        self, fn: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> "Future[Any]":
+        def run_once_gate_opens() -> Any:
+            self.gate.wait()
+            value = fn(*args, **kwargs)
+            if isinstance(value, Iterator):
+                value = _CloseRecordingIterator(value)
+                self.returned_iterators.append(value)
+            return value
+
+        return super().submit(run_once_gate_opens)
+
+
+async def _collect_results(
+    query: str,
+    args: Dict[str, Any],
+    *,
+    limit: Optional[int] = None,
+    adapter: Optional[KerbalDataAdapter] = None,
+    **kwargs: Any,
+) -> List[Dict[str, Any]]:
+    results = []
+    if adapter is None:
+        adapter = get_default_adapter()
+    async_results = execute_query_async(adapter, query, args, **kwargs)
+    try:
+        async for result in async_results:
+            results.append(result)
+            if limit is not None and len(results) >= limit:
+                break
+    finally:
+        await async_results.aclose()  # type: ignore
+    return results
+
+
+class AsyncExecutionTests(unittest.TestCase):
+    def test_async_results_match_sync_results(self) -> None:
+        expected_results = list(execute_query(get_default_adapter(), _PARTS_QUERY, {}))
+        self.assertGreater(len(expected_results), 3)
+
+        actual_results = asyncio.run(_collect_results(_PARTS_QUERY, {}, chunk_size=3))
+
+        self.assertEqual(expected_results, actual_results)
+
+    def test_stopping_early_returns_a_prefix_of_the_results(self) -> None:
+        expected_results = list(execute_query(get_default_adapter(), _PARTS_QUERY, {}))
+
+        actual_results = asyncio.run(_collect_results(_PARTS_QUERY, {}, limit=2, chunk_size=1))
+
+        self.assertEqual(expected_results[:2], actual_results)
+
+    def test_timeout(self) -> None:
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(_collect_results(_PARTS_QUERY, {}, timeout=0))
+
+    def test_timeout_in_the_middle_of_a_query_stops_it(self) -> None:
+        adapter = _SlowAdapter(get_ksp_install_path())
+        with adapter:
+            self.assertGreater(len(adapter.data_manager.parts), 50)
+
+            with self.assertRaises(asyncio.TimeoutError):
+                asyncio.run(
+                    _collect_results(_PARTS_QUERY, {}, adapter=adapter, timeout=0.2, chunk_size=1)
+                )
+
+            self.assertTrue(adapter.stopped.wait(timeout=10))
+
+    def test_timeout_while_the_query_is_starting_closes_its_results(self) -> None:
+        executor = _GatedExecutor()
+        try:
+            with self.assertRaises(asyncio.TimeoutError):
+                asyncio.run(_collect_results(_PARTS_QUERY, {}, timeout=0.05, executor=executor))
+            executor.gate.set()
+        finally:
+            executor.shutdown(wait=True)
+
+        (results,) = executor.returned_iterators
+        self.assertTrue(results.closed)
+
+    def test_invalid_chunk_size(self) -> None:
+        with self.assertRaises(ValueError):
+            asyncio.run(_collect_results(_PARTS_QUERY, {}, chunk_size=0))
@@ -0,0 +1,89 @@
+import math
+import unittest
+
+import pytest
+
+from ..querying.data_manager import (
+    KerbalDataManager,
+    get_default_resources_for_part,
+    get_engine_modules_for_part,
+)
+from ..utils import get_ksp_install_path
+
+
+numpy = pytest.importorskip("numpy")
+
+
+class ColumnarStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data_manager = KerbalDataManager.from_ksp_install_path(get_ksp_install_path())
+        self.store = self.data_manager.get_columnar_store()
+
+    def test_columns_match_token_contents(self) -> None:
+        parts = self.store.table("Part")
+        self.assertEqual(self.data_manager.parts, parts.get_tokens())
+
+        for field_name, column in parts.columns.items():
+            for token, value in zip(self.data_manager.parts, column.tolist()):
+                expected_value = token.content[field_name]
+                if expected_value is None:
+                    self.assertTrue(math.isnan(value))
+                else:
+                    self.assertEqual(expected_value, value)
+
+        self.assertIs(self.store, self.data_manager.get_columnar_store())
+
+    def test_filter_sort_and_derived_columns(self) -> None:
+        parts = self.store.table("Part")
+        cost_per_ton = parts["cost"] / parts["dry_mass"]
+        expensive_parts = (
+            parts.with_column("cost_per_ton", cost_per_ton)
+            .where(parts["cost"] >= numpy.nanmedian(parts["cost"]))
+            .sort_by("cost_per_ton", descending=True)
+        )
+
+        expected_tokens = sorted(
+            (
+                token
+                for token in self.data_manager.parts
+                if token.content["cost"] >= numpy.nanmedian(parts["cost"])
+            ),
+            key=lambda token: token.content["cost"] / token.content["dry_mass"],
+            reverse=True,
+        )
+        self.assertGreater(len(expensive_parts), 0)
+        self.assertEqual(expected_tokens, expensive_parts.get_tokens())
+
+    def test_join_arrays_match_edges(self) -> None:
+        parts = self.store.table("Part")
+        engine_modules = self.store.table("EngineModule")
+
+        # Thrust-to-weight ratio of each engine module, relative to its part's dry mass.
+        part_row_ids, engine_row_ids = self.store.join("Part_EngineModule")
+        thrust_to_weight = (
+            engine_modules["max_thrust"][engine_row_ids] / parts["dry_mass"][part_row_ids]
+        )
+
+        expected_thrust_to_weight = [
+            engine_module.content["max_thrust"] / part.content["dry_mass"]
+            for part in self.data_manager.parts
+            for engine_module in get_engine_modules_for_part(self.data_manager, part)
+        ]
+        self.assertGreater(len(expected_thrust_to_weight), 0)
+        self.assertEqual(expected_thrust_to_weight, thrust_to_weight.tolist())
+
+        part_row_ids, contained_row_ids = self.store.join("Part_HasDefaultResource")
+        contained_row_ids, resource_row_ids = self.store.join("ContainedResource_Resource")
+        resource_tokens = self.store.table("Resource").tokens
+        contained_tokens = self.store.table("ContainedResource").tokens
+        for contained_row_id, resource_row_id in zip(contained_row_ids, resource_row_ids):
+            self.assertEqual(
+                contained_tokens[contained_row_id].foreign_keys["resource_internal_name"],
+                resource_tokens[resource_row_id].content["internal_name"],
+            )
+
+        expected_contained_resource_count = sum(
+            len(get_default_resources_for_part(self.data_manager, part))
+            for part in self.data_manager.parts
+        )
+        self.assertEqual(expected_contained_resource_count, len(part_row_ids))
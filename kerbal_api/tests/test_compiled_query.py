@@ -0,0 +1,136 @@
+from typing import Any, Dict
+import unittest
+
+from ..querying import (
+    CompiledQueryCache,
+    QueryProfile,
+    compile_query,
+    execute_query,
+    execute_query_batch,
+    get_default_adapter,
+)
+from ..querying.compiled_query import normalize_query_text
+
+
+class CompiledQueryTests(unittest.TestCase):
+    def test_query_text_normalization_ignores_insignificant_characters(self) -> None:
+        query = """
+        {
+            Part {
+                # The part's display name.
+                name @output(out_name: "part_name")
+            }
+        }
+        """
+        equivalent_query = '{ Part { name @output(out_name: "part_name"), } }'
+
+        self.assertEqual(normalize_query_text(query), normalize_query_text(equivalent_query))
+
+    def test_query_text_normalization_preserves_string_literals(self) -> None:
+        query = '{ Part { name @output(out_name: "part  name") } }'
+        other_query = '{ Part { name @output(out_name: "part name") } }'
+
+        self.assertNotEqual(normalize_query_text(query), normalize_query_text(other_query))
+
+    def test_cache_counts_hits_and_misses(self) -> None:
+        cache = CompiledQueryCache(max_size=4)
+        query = """
+        {
+            Part {
+                name @output(out_name: "part_name")
+            }
+        }
+        """
+
+        first_compiled_query = cache.get_or_compile(query)
+        second_compiled_query = cache.get_or_compile(" ".join(query.split()))
+
+        self.assertIs(first_compiled_query, second_compiled_query)
+
+        cache_info = cache.cache_info()
+        self.assertEqual(1, cache_info.hits)
+        self.assertEqual(1, cache_info.misses)
+        self.assertEqual(1, cache_info.current_size)
+
+    def test_cache_evicts_least_recently_used_query(self) -> None:
+        cache = CompiledQueryCache(max_size=2)
+        query_template = '{ Part { name @output(out_name: "%s") } }'
+
+        cache.get_or_compile(query_template % "first")
+        cache.get_or_compile(query_template % "second")
+        cache.get_or_compile(query_template % "first")  # now "second" is least recently used
+        cache.get_or_compile(query_template % "third")
+
+        self.assertEqual(2, cache.cache_info().current_size)
+
+        cache.get_or_compile(query_template % "first")
+        self.assertEqual(2, cache.cache_info().hits)
+
+        cache.get_or_compile(query_template % "second")
+        self.assertEqual(4, cache.cache_info().misses)
+
+    def test_compiled_query_can_be_executed_with_different_args(self) -> None:
+        adapter = get_default_adapter()
+        compiled_query = compile_query(
+            """
+            {
+                Part {
+                    internal_name @filter(op_name: "=", value: ["$name"])
+                                  @output(out_name: "internal_name")
+                }
+            }
+            """
+        )
+
+        for name in ("PotatoRoid", "Clydesdale"):
+            args: Dict[str, Any] = {"name": name}
+            self.assertEqual([{"internal_name": name}], list(compiled_query.execute(adapter, args)))
+
+    def test_batch_results_match_separate_executions(self) -> None:
+        adapter = get_default_adapter()
+        query = """
+        {
+            Part {
+                manufacturer @filter(op_name: "=", value: ["$manufacturer"])
+                name @output(out_name: "name")
+            }
+        }
+        """
+        manufacturers = sorted(
+            {part.content["manufacturer"] for part in adapter.data_manager.parts[:20]} - {None}
+        )
+        args_list = [{"manufacturer": manufacturer} for manufacturer in manufacturers]
+        args_list.append({"manufacturer": "No Such Manufacturer"})
+
+        expected_results = [
+            (args_index, result)
+            for args_index, args in enumerate(args_list)
+            for result in execute_query(adapter, query, args)
+        ]
+        self.assertGreater(len(expected_results), len(manufacturers))
+
+        # Without an index on the filtered field, each separate execution scans all parts,
+        # whereas the batch scans them once, to build an on-demand index that it then shares.
+        unbatched_profile = QueryProfile()
+        for args in args_list:
+            list(execute_query(adapter, query, args, profile=unbatched_profile))
+        batch_profile = QueryProfile()
+        batch_results = list(execute_query_batch(adapter, query, args_list, profile=batch_profile))
+
+        self.assertEqual(expected_results, batch_results)
+        self.assertEqual(len(expected_results), batch_profile.result_count)
+
+        unbatched_scan, batch_scan = (
+            next(
+                operation
+                for operation in profile.operations
+                if operation.operation == "get_tokens_of_type"
+            )
+            for profile in (unbatched_profile, batch_profile)
+        )
+        self.assertEqual(
+            (len(args_list), 0), (unbatched_scan.full_scans, unbatched_scan.index_lookups)
+        )
+        self.assertEqual((1, len(args_list)), (batch_scan.full_scans, batch_scan.index_lookups))
+        # The on-demand index finds exactly the matching parts, one per result.
+        self.assertEqual(len(expected_results), batch_scan.outputs)
@@ -0,0 +1,153 @@
+from concurrent.futures import ThreadPoolExecutor
+import sys
+from threading import Barrier
+from typing import Any, Callable, Dict, List, Tuple
+import unittest
+
+from graphql_compiler.interpreter import DataContext
+
+from ..querying import KerbalDataAdapter, KerbalDataManagerRegistry, execute_query
+from ..querying.data_manager import KerbalDataManager
+from ..utils import get_ksp_install_path
+
+
+_THREAD_COUNT = 16
+
+_QUERIES: List[Tuple[str, Dict[str, Any]]] = [
+    (
+        """
+        {
+            Part {
+                name @output(out_name: "part_name")
+                cost @filter(op_name: "<", value: ["$max_cost"])
+                out_Part_EngineModule {
+                    max_thrust @output(out_name: "max_thrust")
+                }
+            }
+        }
+        """,
+        {"max_cost": 2000},
+    ),
+    (
+        """
+        {
+            Technology {
+                name @filter(op_name: "=", value: ["$tech_name"])
+                out_Technology_TransitivePrerequisite {
+                    name @output(out_name: "prerequisite_name")
+                }
+            }
+        }
+        """,
+        {"tech_name": "Basic Science"},
+    ),
+    (
+        """
+        {
+            Part {
+                name @output(out_name: "part_name")
+                     @filter(op_name: "has_substring", value: ["$substring"])
+                out_Part_HasDefaultResource {
+                    out_ContainedResource_Resource {
+                        name @output(out_name: "resource_name")
+                    }
+                }
+            }
+        }
+        """,
+        {"substring": "Fuel"},
+    ),
+]
+
+
+def _make_lazy_adapter() -> KerbalDataAdapter:
+    # A fresh adapter, backed by a data manager that has not yet built any of its lazy data.
+    registry = KerbalDataManagerRegistry(
+        lambda ksp_install_path: KerbalDataManager.from_ksp_install_path(
+            ksp_install_path, lazy_ingestion=True
+        )
+    )
+    return KerbalDataAdapter(get_ksp_install_path(), registry=registry)
+
+
+def _read_everything(adapter: KerbalDataAdapter) -> List[Any]:
+    # Exercise every lazily-built part of the data manager through the adapter's interface.
+    results: List[Any] = []
+    data_manager = adapter.data_manager
+    for (type_name, edge_info) in sorted(KerbalDataAdapter.edge_handlers):
+        if type_name == "ContainedResource":
+            continue
+        data_contexts = [
+            DataContext.make_empty_context_from_token(token)
+            for token in adapter.get_tokens_of_type(type_name)
+        ]
+        results.extend(
+            [
+                list(neighbors)
+                for _, neighbors in adapter.project_neighbors(data_contexts, type_name, edge_info)
+            ]
+        )
+        results.extend(
+            value for _, value in adapter.project_property(data_contexts, type_name, "name")
+        )
+
+    results.append(list(data_manager.get_sorted_field_index("Part", "name").find_range("A", "M")))
+    results.append(data_manager.find_tokens_with_substring("Part", "name", "Fuel"))
+    return results
+
+
+def _run_concurrently(function: Callable[[], Any]) -> List[Any]:
+    # Start all threads at the same time, and switch between them often,
+    # to make races between lazy initializations as likely as possible.
+    barrier = Barrier(_THREAD_COUNT)
+
+    def run_after_barrier() -> Any:
+        barrier.wait()
+        return function()
+
+    original_switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=_THREAD_COUNT) as executor:
+            futures = [executor.submit(run_after_barrier) for _ in range(_THREAD_COUNT)]
+            return [future.result() for future in futures]
+    finally:
+        sys.setswitchinterval(original_switch_interval)
+
+
+class ConcurrencyTests(unittest.TestCase):
+    # These tests are most meaningful on free-threaded Python builds, where threads truly run
+    # in parallel, but they also catch many races on regular builds.
+
+    def test_data_managers_are_frozen_after_loading(self) -> None:
+        data_manager = KerbalDataManager.from_ksp_install_path(get_ksp_install_path())
+        self.assertTrue(data_manager.frozen)
+        with self.assertRaises(AssertionError):
+            data_manager.ingest_cfg_file(next(iter(data_manager.cfg_file_stats)))
+
+    def test_concurrent_lazy_initialization_matches_serial_execution(self) -> None:
+        with _make_lazy_adapter() as serial_adapter:
+            expected_results = _read_everything(serial_adapter)
+
+        with _make_lazy_adapter() as shared_adapter:
+            all_results = _run_concurrently(lambda: _read_everything(shared_adapter))
+
+        for results in all_results:
+            self.assertEqual(expected_results, results)
+
+    def test_concurrent_queries_match_serial_execution(self) -> None:
+        with _make_lazy_adapter() as serial_adapter:
+            expected_results = [
+                list(execute_query(serial_adapter, query, args)) for query, args in _QUERIES
+            ]
+        self.assertTrue(all(expected_results))
+
+        with _make_lazy_adapter() as shared_adapter:
+            all_results = _run_concurrently(
+                lambda: [
+                    list(execute_query(shared_adapter, query, args)) for query, args in _QUERIES
+                ]
+            )
+
+        for results in all_results:
+            self.assertEqual(expected_results, results)
@@ -0,0 +1,110 @@
+import unittest
+
+from ..querying.data_manager import (
+    KerbalDataManager,
+    get_data_transmitter_for_part,
+    get_default_resources_for_part,
+    get_engine_modules_for_part,
+)
+from ..utils import get_ksp_install_path
+from .utils import assert_parsed_cfg_files_fit_memory_budget
+
+
+class DataManagerIngestionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ksp_path = get_ksp_install_path()
+
+    def test_parallel_ingestion_matches_serial_ingestion(self) -> None:
+        serial_data_manager = KerbalDataManager.from_ksp_install_path(self.ksp_path)
+        parallel_data_manager = KerbalDataManager.from_ksp_install_path(
+            self.ksp_path, max_workers=4
+        )
+
+        self.assertEqual(
+            list(serial_data_manager.parsed_cfg_files),
+            list(parallel_data_manager.parsed_cfg_files),
+        )
+        self.assertEqual(
+            serial_data_manager.parsed_cfg_files, parallel_data_manager.parsed_cfg_files
+        )
+        self.assertEqual(serial_data_manager.parts, parallel_data_manager.parts)
+        self.assertEqual(
+            serial_data_manager.parts_by_internal_name,
+            parallel_data_manager.parts_by_internal_name,
+        )
+        self.assertEqual(serial_data_manager.resources, parallel_data_manager.resources)
+        self.assertEqual(serial_data_manager.technologies, parallel_data_manager.technologies)
+        self.assertEqual(
+            serial_data_manager.technologies_by_id, parallel_data_manager.technologies_by_id
+        )
+
+    def test_part_neighbors_are_built_once_and_reused(self) -> None:
+        data_manager = KerbalDataManager.from_ksp_install_path(self.ksp_path)
+        neighbor_getters = (
+            get_engine_modules_for_part,
+            get_default_resources_for_part,
+            get_data_transmitter_for_part,
+        )
+
+        first_neighbors = [
+            getter(data_manager, part_token)
+            for part_token in data_manager.parts
+            for getter in neighbor_getters
+        ]
+        data_manager.materialize_part_neighbors()
+        second_neighbors = [
+            getter(data_manager, part_token)
+            for part_token in data_manager.parts
+            for getter in neighbor_getters
+        ]
+
+        self.assertGreater(sum(len(neighbors) for neighbors in first_neighbors), 0)
+        for first, second in zip(first_neighbors, second_neighbors):
+            self.assertIs(first, second)
+
+    def test_lazy_ingestion_matches_eager_ingestion(self) -> None:
+        eager_data_manager = KerbalDataManager.from_ksp_install_path(self.ksp_path)
+        lazy_data_manager = KerbalDataManager.from_ksp_install_path(
+            self.ksp_path, lazy_ingestion=True
+        )
+
+        # Nothing is parsed until a type is first needed.
+        self.assertEqual([], lazy_data_manager.technologies)
+        self.assertEqual({}, lazy_data_manager.parsed_cfg_files)
+
+        self.assertEqual(
+            eager_data_manager.technologies, lazy_data_manager.get_root_tokens("Technology")
+        )
+        self.assertNotIn("Technology", lazy_data_manager.pending_cfg_file_paths_by_type)
+        self.assertIn("Part", lazy_data_manager.pending_cfg_file_paths_by_type)
+
+        self.assertEqual(eager_data_manager.parts, lazy_data_manager.get_root_tokens("Part"))
+        self.assertEqual(
+            eager_data_manager.resources, lazy_data_manager.get_root_tokens("Resource")
+        )
+        self.assertEqual({}, lazy_data_manager.pending_cfg_file_paths_by_type)
+        self.assertEqual(
+            eager_data_manager.technologies_by_id, lazy_data_manager.technologies_by_id
+        )
+
+    def test_memory_budget_drops_and_reloads_parsed_files(self) -> None:
+        eager_data_manager = KerbalDataManager.from_ksp_install_path(self.ksp_path)
+        memory_budget = 256 * 1024
+        budgeted_data_manager = KerbalDataManager.from_ksp_install_path(
+            self.ksp_path, cfg_file_memory_budget=memory_budget
+        )
+
+        self.assertEqual(eager_data_manager.parts, budgeted_data_manager.parts)
+        self.assertEqual(eager_data_manager.resources, budgeted_data_manager.resources)
+        self.assertEqual(eager_data_manager.technologies, budgeted_data_manager.technologies)
+
+        # Files that define no tokens are never kept, and the rest stay close to the budget.
+        self.assertIn("other", eager_data_manager.get_cfg_file_memory_usage())
+        assert_parsed_cfg_files_fit_memory_budget(self, budgeted_data_manager, eager_data_manager)
+
+        # Dropped files are transparently re-read when their data is needed again.
+        for part_token in eager_data_manager.parts:
+            self.assertEqual(
+                get_data_transmitter_for_part(eager_data_manager, part_token),
+                get_data_transmitter_for_part(budgeted_data_manager, part_token),
+            )
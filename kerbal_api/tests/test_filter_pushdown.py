@@ -0,0 +1,239 @@
+import math
+from typing import Any, Dict, List, NamedTuple, Tuple
+import unittest
+
+from ..querying.data_manager import KerbalDataManager, get_engine_modules_for_part
+from ..querying.filter_pushdown import find_candidate_tokens
+from ..querying.indexes import NumericFieldIndex, SortedFieldIndex, SubstringIndex
+from ..utils import get_ksp_install_path
+
+
+class _FakeFilterInfo(NamedTuple):
+    fields: Tuple[str, ...]
+    op_name: str
+    args: Tuple[str, ...]
+
+
+class SortedFieldIndexTests(unittest.TestCase):
+    def test_range_lookups(self) -> None:
+        index = SortedFieldIndex(
+            [(3, "c"), (1, "a"), (None, "x"), (2, "b"), (math.nan, "y"), (2, "b2"), (5, "e")]
+        )
+
+        self.assertEqual(5, len(index))
+        self.assertEqual(["a", "b", "b2", "c", "e"], index.find_range())
+        self.assertEqual(["b", "b2", "c"], index.find_range(2, 3))
+        self.assertEqual(["c"], index.find_range(2, 3, lower_inclusive=False))
+        self.assertEqual(["b", "b2"], index.find_range(2, 3, upper_inclusive=False))
+        self.assertEqual(["c", "e"], index.find_range(lower_bound=3))
+        self.assertEqual(["a"], index.find_range(upper_bound=2, upper_inclusive=False))
+        self.assertEqual([], index.find_range(4, 4))
+
+    def test_incrementally_built_numeric_index_matches_bulk_built_index(self) -> None:
+        keyed_items = [
+            (3, "c"),
+            (1.5, "a"),
+            (None, "x"),
+            (2, "b"),
+            (math.nan, "y"),
+            (2.0, "b2"),
+            (5, "e"),
+        ]
+        bulk_index = NumericFieldIndex(keyed_items)
+        incremental_index: NumericFieldIndex[str] = NumericFieldIndex()
+        for key, item in keyed_items[:3]:
+            incremental_index.add(key, item)
+        self.assertEqual(["a", "c"], incremental_index.find_range())
+        for key, item in keyed_items[3:]:
+            incremental_index.add(key, item)
+        incremental_index.flush()
+
+        self.assertEqual(5, len(incremental_index))
+        self.assertEqual(list(bulk_index.keys), list(incremental_index.keys))
+        self.assertEqual(bulk_index.items, incremental_index.items)
+        self.assertEqual(["a", "b", "b2"], incremental_index.find_range(1, 2))
+        with self.assertRaises(TypeError):
+            incremental_index.find_range("1", "2")
+
+
+class SubstringIndexTests(unittest.TestCase):
+    def test_substring_lookups(self) -> None:
+        index: SubstringIndex[int] = SubstringIndex()
+        values = ["Mk1 Command Pod", "Mk1-3 Command Pod", "Rockomax Jumbo-64", None, "Pod", ""]
+        for item, value in enumerate(values):
+            index.add(value, item)
+
+        self.assertEqual(5, len(index))
+        self.assertEqual([0, 1], index.find("Command"))
+        self.assertEqual([0, 1, 4], index.find("Pod"))
+        self.assertEqual([], index.find("pod"))
+        self.assertEqual([0, 1, 4], index.find("pod", case_sensitive=False))
+        self.assertEqual([0, 1], index.find("mk1", case_sensitive=False))
+        self.assertEqual([1, 2], index.find("-"))
+        self.assertEqual([0, 1, 2, 4, 5], index.find(""))
+        self.assertEqual([], index.find("Mainsail"))
+
+
+class FilterPushdownTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data_manager = KerbalDataManager.from_ksp_install_path(get_ksp_install_path())
+
+    def _assert_candidates_cover_matches(
+        self, type_name: str, filter_info: _FakeFilterInfo, args: Any, expected: List[Any]
+    ) -> None:
+        candidates = find_candidate_tokens(self.data_manager, type_name, [filter_info], args)
+        if candidates is None:
+            self.fail(f"Expected filter {filter_info} to be answered from an index.")
+
+        candidate_ids = {id(token) for token in candidates}
+        for token in expected:
+            self.assertIn(id(token), candidate_ids)
+
+    def test_equality_filters_use_indexes(self) -> None:
+        part = self.data_manager.parts[0]
+        internal_name = part.content["internal_name"]
+
+        candidates = find_candidate_tokens(
+            self.data_manager,
+            "Part",
+            [_FakeFilterInfo(("internal_name",), "=", ("$name",))],
+            {"name": internal_name},
+        )
+        self.assertEqual([part], candidates)
+
+        technology_ids = [token.content["id"] for token in self.data_manager.technologies[:2]]
+        self._assert_candidates_cover_matches(
+            "Technology",
+            _FakeFilterInfo(("id",), "in_collection", ("$ids",)),
+            {"ids": technology_ids},
+            self.data_manager.technologies[:2],
+        )
+
+    def test_range_filters_match_full_scan(self) -> None:
+        costs = sorted(
+            token.content["cost"]
+            for token in self.data_manager.parts
+            if token.content["cost"] is not None
+        )
+        median_cost = costs[len(costs) // 2]
+
+        for op_name, predicate in (
+            ("<", lambda value: value < median_cost),
+            ("<=", lambda value: value <= median_cost),
+            (">", lambda value: value > median_cost),
+            (">=", lambda value: value >= median_cost),
+        ):
+            expected = [
+                token
+                for token in self.data_manager.parts
+                if token.content["cost"] is not None and predicate(token.content["cost"])
+            ]
+            candidates = find_candidate_tokens(
+                self.data_manager,
+                "Part",
+                [_FakeFilterInfo(("cost",), op_name, ("$cost",))],
+                {"cost": median_cost},
+            )
+            if candidates is None:
+                self.fail(f"Expected {op_name} filter to be answered from an index.")
+            self.assertEqual(
+                sorted(id(token) for token in expected), sorted(id(token) for token in candidates)
+            )
+
+    def test_substring_filters_match_full_scan(self) -> None:
+        for type_name, field_name in (
+            ("Part", "name"),
+            ("Part", "internal_name"),
+            ("Technology", "description"),
+        ):
+            tokens = self.data_manager.get_root_tokens(type_name)
+            some_value = next(
+                token.content[field_name] for token in tokens if token.content[field_name]
+            )
+            for substring in (some_value[:1], some_value[1:5], some_value, "no such substring"):
+                expected = [
+                    token
+                    for token in tokens
+                    if token.content[field_name] is not None
+                    and substring in token.content[field_name]
+                ]
+                candidates = find_candidate_tokens(
+                    self.data_manager,
+                    type_name,
+                    [_FakeFilterInfo((field_name,), "has_substring", ("$value",))],
+                    {"value": substring},
+                )
+                self.assertEqual(expected, candidates)
+
+    def test_numeric_indexes_are_built_during_ingestion(self) -> None:
+        tokens_by_type = {
+            "Part": self.data_manager.parts,
+            "Resource": self.data_manager.resources,
+            "Technology": self.data_manager.technologies,
+            "EngineModule": [
+                engine_module
+                for part in self.data_manager.parts
+                for engine_module in get_engine_modules_for_part(self.data_manager, part)
+            ],
+        }
+
+        self.assertGreater(len(self.data_manager.numeric_field_indexes), 0)
+        for (type_name, field_name), index in self.data_manager.numeric_field_indexes.items():
+            expected = sorted(
+                token.content[field_name]
+                for token in tokens_by_type[type_name]
+                if token.content[field_name] is not None
+            )
+            self.assertEqual(expected, list(index.keys))
+            self.assertEqual(expected, [token.content[field_name] for token in index.find_range()])
+            self.assertIs(index, self.data_manager.get_sorted_field_index(type_name, field_name))
+
+    def test_on_demand_equality_indexes_are_built_once(self) -> None:
+        filter_info = _FakeFilterInfo(("manufacturer",), "=", ("$value",))
+        on_demand_indexes: Dict[Any, Any] = {}
+        manufacturers = {part.content["manufacturer"] for part in self.data_manager.parts}
+
+        for manufacturer in sorted(manufacturers - {None}) + ["No Such Manufacturer"]:
+            expected = [
+                part
+                for part in self.data_manager.parts
+                if part.content["manufacturer"] == manufacturer
+            ]
+            candidates = find_candidate_tokens(
+                self.data_manager,
+                "Part",
+                [filter_info],
+                {"value": manufacturer},
+                on_demand_indexes=on_demand_indexes,
+            )
+            self.assertEqual(expected, candidates)
+
+        self.assertEqual([("Part", "manufacturer")], list(on_demand_indexes))
+
+        # Fields with prebuilt indexes keep using those.
+        part = self.data_manager.parts[0]
+        candidates = find_candidate_tokens(
+            self.data_manager,
+            "Part",
+            [_FakeFilterInfo(("internal_name",), "=", ("$value",))],
+            {"value": part.content["internal_name"]},
+            on_demand_indexes=on_demand_indexes,
+        )
+        self.assertEqual([part], candidates)
+        self.assertEqual([("Part", "manufacturer")], list(on_demand_indexes))
+
+    def test_unsupported_filters_fall_back_to_full_scan(self) -> None:
+        unsupported_filters = [
+            # No index on this field.
+            _FakeFilterInfo(("manufacturer",), "=", ("$value",)),
+            # Tagged values aren't known before the query runs.
+            _FakeFilterInfo(("internal_name",), "=", ("%tag",)),
+            # Not an index-friendly operation.
+            _FakeFilterInfo(("name",), "!=", ("$value",)),
+        ]
+        for filter_info in unsupported_filters:
+            self.assertIsNone(
+                find_candidate_tokens(self.data_manager, "Part", [filter_info], {"value": "x"})
+            )
+
+        self.assertIsNone(find_candidate_tokens(self.data_manager, "Part", None, None))
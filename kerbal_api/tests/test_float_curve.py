@@ -0,0 +1,117 @@
+import math
+from types import ModuleType
+from typing import Optional
+import unittest
+
+from ..querying.data_manager import (
+    KerbalDataManager,
+    evaluate_engine_performance,
+    get_engine_modules_for_part,
+)
+from ..querying.float_curve import FloatCurve, evaluate_float_curves, parse_float_curve
+from ..utils import get_ksp_install_path
+
+
+numpy: Optional[ModuleType]
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class FloatCurveTests(unittest.TestCase):
+    def test_parsing_keeps_tangents_and_sorts_keys(self) -> None:
+        curve = parse_float_curve(["1 250 -10 -20", "0 320", "6 0.001"])
+
+        self.assertEqual([0.0, 1.0, 6.0], list(curve.times))
+        self.assertEqual([320.0, 250.0, 0.001], list(curve.values))
+        self.assertTrue(math.isnan(curve.in_tangents[0]))
+        self.assertEqual((-10.0, -20.0), curve.get_tangents(1))
+
+        self.assertEqual(parse_float_curve(["0 320", "1 250 -10 -20", "6 0.001"]), curve)
+        self.assertNotEqual(parse_float_curve(["0 320", "1 250", "6 0.001"]), curve)
+
+    def test_evaluation_at_keys_and_outside_range(self) -> None:
+        curve = parse_float_curve(["0 320", "1 250", "6 0.001"])
+
+        self.assertEqual(320.0, curve.evaluate(-1.0))
+        self.assertEqual(320.0, curve.evaluate(0.0))
+        self.assertEqual(250.0, curve.evaluate(1.0))
+        self.assertEqual(0.001, curve.evaluate(6.0))
+        self.assertEqual(0.001, curve.evaluate(100.0))
+        self.assertTrue(math.isnan(parse_float_curve([]).evaluate(0.0)))
+
+    def test_automatic_tangents(self) -> None:
+        # Endpoints get flat tangents, so a two-key curve is a smoothstep between the keys.
+        curve = parse_float_curve(["0 0", "2 1"])
+        self.assertAlmostEqual(0.5, curve.evaluate(1.0))
+        self.assertAlmostEqual(3 * 0.25 ** 2 - 2 * 0.25 ** 3, curve.evaluate(0.5))
+
+        # Interior keys use the mean of the adjacent segments' slopes: on a straight line,
+        # that is the line's own slope.
+        curve = parse_float_curve(["0 0", "1 1 1 1", "2 2", "3 3 1 1"])
+        self.assertEqual((1.0, 1.0), curve.get_tangents(2))
+        self.assertAlmostEqual(2.25, curve.evaluate(2.25))
+
+    def test_keys_with_duplicate_times(self) -> None:
+        # Of several keys with the same time, the last one wins.
+        curve = parse_float_curve(["0 320", "1 250", "1 240", "6 0.001"])
+        self.assertEqual(parse_float_curve(["0 320", "1 240", "6 0.001"]), curve)
+        self.assertEqual(240.0, curve.evaluate(1.0))
+        self.assertLess(240.0, curve.evaluate(0.5))
+
+        # Curves constructed directly may still contain them: such segments are flat.
+        nan = math.nan
+        curve = FloatCurve([0, 1, 1, 6], [320, 250, 240, 0.001], [nan] * 4, [nan] * 4)
+        self.assertEqual((-35.0, -35.0), curve.get_tangents(1))
+        self.assertEqual(240.0, curve.evaluate(1.0))
+        self.assertLess(250.0, curve.evaluate(0.5))
+
+        if numpy is not None:
+            times = [0.5, 1.0, 2.0]
+            for expected, result in zip(
+                [curve.evaluate(time) for time in times],
+                evaluate_float_curves([curve], times)[0].tolist(),
+            ):
+                self.assertAlmostEqual(expected, result)
+
+    @unittest.skipIf(numpy is None, "requires NumPy")
+    def test_vectorized_evaluation_matches_scalar_evaluation(self) -> None:
+        curves = [
+            parse_float_curve([]),
+            parse_float_curve(["0.5 7"]),
+            parse_float_curve(["0 320", "1 250", "6 0.001"]),
+            parse_float_curve(["0 0 0 3", "1 1", "2 0.5 -2 -1", "4 3"]),
+        ]
+        times = [-1.0, 0.0, 0.25, 0.5, 1.0, 1.5, 2.0, 3.99, 4.0, 10.0]
+
+        results = evaluate_float_curves(curves, times)
+
+        self.assertEqual((len(curves), len(times)), results.shape)
+        for curve, curve_results in zip(curves, results.tolist()):
+            for time, result in zip(times, curve_results):
+                expected = curve.evaluate(time)
+                if math.isnan(expected):
+                    self.assertTrue(math.isnan(result))
+                else:
+                    self.assertAlmostEqual(expected, result)
+
+    @unittest.skipIf(numpy is None, "requires NumPy")
+    def test_engine_performance(self) -> None:
+        data_manager = KerbalDataManager.from_ksp_install_path(get_ksp_install_path())
+        engine_modules = [
+            engine_module
+            for part in data_manager.parts
+            for engine_module in get_engine_modules_for_part(data_manager, part)
+            if engine_module.content["isp_vacuum"]
+        ]
+        self.assertGreater(len(engine_modules), 0)
+
+        isp, max_thrust = evaluate_engine_performance(engine_modules, [0.0, 1.0])
+        for engine_module, (vacuum_isp, vacuum_thrust), (sea_level_isp, _) in zip(
+            engine_modules, zip(isp[:, 0], max_thrust[:, 0]), zip(isp[:, 1], max_thrust[:, 1])
+        ):
+            self.assertAlmostEqual(engine_module.content["isp_vacuum"], vacuum_isp)
+            self.assertAlmostEqual(engine_module.content["max_thrust"], vacuum_thrust)
+            if engine_module.content["isp_at_1atm"] is not None:
+                self.assertAlmostEqual(engine_module.content["isp_at_1atm"], sea_level_isp)
@@ -3,7 +3,11 @@ from unittest import TestCase
 
 import pytest
 
+from graphql_compiler.interpreter import DataContext
+
 from ..querying import KerbalDataAdapter, execute_query, get_default_adapter
+from ..querying.data_manager import KerbalDataManager, get_default_resources_for_part
+from ..querying.tokens import KerbalConfigToken
 
 
 def ensure_query_produces_expected_output(
@@ -308,6 +312,49 @@ class TestInterpreter(TestCase):
 
         ensure_query_produces_expected_output(self, query, args, expected_results)
 
+    def test_tech_tree_techs_unlocked_by_start(self) -> None:
+        query = """
+        {
+            Technology {
+                name @filter(op_name: "=", value: ["$tech_name"]) @output(out_name: "tech_name")
+
+                in_Technology_MandatoryPrerequisite {
+                    name @output(out_name: "unlocked_tech")
+                }
+            }
+        }
+        """
+        args: Dict[str, Any] = {"tech_name": "Start"}
+
+        expected_results = [
+            {"tech_name": "Start", "unlocked_tech": "Basic Rocketry"},
+            {"tech_name": "Start", "unlocked_tech": "Engineering 101"},
+        ]
+
+        ensure_query_produces_expected_output(self, query, args, expected_results)
+
+    def test_tech_tree_transitive_prerequisites(self) -> None:
+        query = """
+        {
+            Technology {
+                name @filter(op_name: "=", value: ["$tech_name"]) @output(out_name: "tech_name")
+
+                out_Technology_TransitivePrerequisite {
+                    name @output(out_name: "prerequisite")
+                }
+            }
+        }
+        """
+        args: Dict[str, Any] = {"tech_name": "Basic Science"}
+
+        expected_results = [
+            {"tech_name": "Basic Science", "prerequisite": "Survivability"},
+            {"tech_name": "Basic Science", "prerequisite": "Engineering 101"},
+            {"tech_name": "Basic Science", "prerequisite": "Start"},
+        ]
+
+        ensure_query_produces_expected_output(self, query, args, expected_results)
+
     def test_tech_tree_singular_any_of_prereqs_converted_to_mandatory_prerequisites(self) -> None:
         # This test ensures we correct a particular kind of data error in the game files,
         # where a tech is listed as having "any of" prerequisites, but only a single prerequisite
@@ -903,3 +950,72 @@ class TestInterpreter(TestCase):
         # generator to complete the execution, even though we don't care about the results.
         for _ in execute_query(self.adapter, query, args):
             pass
+
+
+class AdapterRegistrationTests(TestCase):
+    adapter: ClassVar[KerbalDataAdapter]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.adapter = get_default_adapter()
+
+    def test_batched_neighbors_match_single_token_handlers(self) -> None:
+        data_manager = self.adapter.data_manager
+        for (type_name, edge_info), handler in KerbalDataAdapter.edge_handlers.items():
+            if type_name == "ContainedResource":
+                tokens = [
+                    contained_resource
+                    for part in data_manager.parts
+                    for contained_resource in get_default_resources_for_part(data_manager, part)
+                ]
+            else:
+                tokens = list(data_manager.get_root_tokens(type_name))
+            self.assertGreater(len(tokens), 0)
+
+            data_contexts = [
+                DataContext.make_empty_context_from_token(token) for token in tokens + [None]
+            ]
+            results = list(self.adapter.project_neighbors(data_contexts, type_name, edge_info))
+
+            self.assertEqual(data_contexts, [data_context for data_context, _ in results])
+            expected_neighbors = [list(handler(data_manager, token)) for token in tokens] + [[]]
+            self.assertEqual(
+                expected_neighbors, [list(neighbors) for _, neighbors in results], edge_info
+            )
+
+    def test_registering_on_a_subclass_does_not_affect_the_base_class(self) -> None:
+        class ModdedAdapter(KerbalDataAdapter):
+            pass
+
+        def get_self_for_part(
+            data_manager: KerbalDataManager, token: KerbalConfigToken
+        ) -> List[KerbalConfigToken]:
+            return [token]
+
+        edge_info = ("out", "Part_Self")
+        ModdedAdapter.register_edge_handler("Part", edge_info, get_self_for_part)
+        ModdedAdapter.register_coercion("Part", "ModdedPart", {"Part"})
+
+        self.assertNotIn(("Part", edge_info), KerbalDataAdapter.edge_handlers)
+        self.assertNotIn(("Part", "ModdedPart"), KerbalDataAdapter.coercion_table)
+        with self.assertRaises(ValueError):
+            ModdedAdapter.register_edge_handler("Part", edge_info, get_self_for_part)
+        with self.assertRaises(ValueError):
+            ModdedAdapter.register_coercion("AntennaModule", "RelayAntennaModule", set())
+
+        with ModdedAdapter(
+            self.adapter.ksp_install_path, registry=self.adapter.registry
+        ) as modded_adapter:
+            part = modded_adapter.data_manager.parts[0]
+            data_contexts = [DataContext.make_empty_context_from_token(part)]
+
+            ((_, neighbors),) = modded_adapter.project_neighbors(data_contexts, "Part", edge_info)
+            self.assertEqual([part], neighbors)
+
+            ((_, can_coerce),) = modded_adapter.can_coerce_to_type(
+                data_contexts, "Part", "ModdedPart"
+            )
+            self.assertTrue(can_coerce)
+
+        with self.assertRaises(NotImplementedError):
+            list(self.adapter.project_neighbors(data_contexts, "Part", edge_info))
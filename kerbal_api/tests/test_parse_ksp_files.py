@@ -1,14 +1,64 @@
 from itertools import chain
 import os
+from tempfile import TemporaryDirectory
 from typing import List
 import unittest
 
 from ..cfg_parser.file_finder import get_cfg_files_recursively
+from ..cfg_parser.node_tree import make_cfg_node_tree, parse_cfg_node_tree
 from ..cfg_parser.parser import parse_cfg_file
+from ..cfg_parser.section_sniffer import sniff_section_names
+from ..cfg_parser.streaming_parser import (
+    CfgKeyValue,
+    CfgSectionEnd,
+    CfgSectionStart,
+    iter_cfg_events,
+    parse_cfg_file_streaming,
+)
 from ..querying.tokens import make_part_token
 from ..utils import get_ksp_install_path
 
 
+class NonUtf8CfgFileParsing(unittest.TestCase):
+    def test_invalid_utf8_bytes_are_replaced(self) -> None:
+        with TemporaryDirectory() as temporary_directory:
+            file_path = os.path.join(temporary_directory, "part.cfg")
+            with open(file_path, "wb") as f:
+                # "Caf\xe9" is Latin-1 text, as sometimes found in mods, and not valid UTF-8.
+                f.write(b"PART\n{\n\tname = testPart\n\ttitle = Caf\xe9 Pod\n}\n")
+
+            parsed_file = parse_cfg_file_streaming(file_path)
+            cfg_node = parse_cfg_node_tree(file_path)
+
+            self.assertEqual(parse_cfg_file(file_path), parsed_file)
+            assert parsed_file is not None and cfg_node is not None
+            self.assertEqual("Caf\ufffd Pod", parsed_file[(("PART", 0), ("title", 0))])
+            self.assertEqual("testPart", parsed_file[(("PART", 0), ("name", 0))])
+            self.assertEqual(
+                {"PART"}, sniff_section_names(file_path, {"PART", "RESOURCE_DEFINITION"})
+            )
+
+
+class CfgNodeMappingTests(unittest.TestCase):
+    def test_node_tree_supports_the_mapping_methods(self) -> None:
+        with TemporaryDirectory() as temporary_directory:
+            file_path = os.path.join(temporary_directory, "part.cfg")
+            with open(file_path, "w") as f:
+                f.write("PART\n{\n\tname = testPart\n\tMODULE\n\t{\n\t\tname = A\n\t}\n}\n")
+
+            parsed_file = parse_cfg_file(file_path)
+            cfg_node = parse_cfg_node_tree(file_path)
+
+        assert parsed_file is not None and cfg_node is not None
+        self.assertEqual(list(parsed_file.keys()), list(cfg_node.keys()))
+        self.assertEqual(list(parsed_file.values()), list(cfg_node.values()))
+        self.assertEqual(list(parsed_file.items()), list(cfg_node.items()))
+
+        module_node = cfg_node.get_node((("PART", 0), ("MODULE", 0)))
+        assert module_node is not None
+        self.assertEqual(["A"], module_node.values_named("name"))
+
+
 class KSPParsing(unittest.TestCase):
     def setUp(self) -> None:
         self.ksp_path = get_ksp_install_path()
@@ -41,6 +91,78 @@ class KSPParsing(unittest.TestCase):
 
         self.assertGreater(files_processed, 200)
 
+    def test_streaming_parser_matches_line_list_parser(self) -> None:
+        all_cfg_files = chain(
+            get_cfg_files_recursively(self.squad_dir_path),
+            get_cfg_files_recursively(self.expansions_dir_path),
+        )
+        for file_path in all_cfg_files:
+            self.assertEqual(
+                parse_cfg_file(file_path), parse_cfg_file_streaming(file_path), msg=file_path
+            )
+
+    def test_streaming_parser_events_are_balanced(self) -> None:
+        for file_path in get_cfg_files_recursively(self.squad_parts_dir_path):
+            open_sections: List[CfgSectionStart] = []
+            key_value_count = 0
+
+            for event in iter_cfg_events(file_path):
+                if isinstance(event, CfgSectionStart):
+                    open_sections.append(event)
+                elif isinstance(event, CfgSectionEnd):
+                    opening_event = open_sections.pop()
+                    self.assertEqual((opening_event.name, opening_event.occurrence), event)
+                else:
+                    self.assertIsInstance(event, CfgKeyValue)
+                    key_value_count += 1
+
+            parsed_file = parse_cfg_file(file_path)
+            self.assertEqual(len(parsed_file) if parsed_file is not None else 0, key_value_count)
+
+    def test_node_tree_matches_flat_parsed_data(self) -> None:
+        for file_path in get_cfg_files_recursively(self.squad_dir_path):
+            parsed_file = parse_cfg_file(file_path)
+            node_tree = parse_cfg_node_tree(file_path)
+
+            if parsed_file is None:
+                self.assertIsNone(node_tree, msg=file_path)
+            else:
+                assert node_tree is not None
+                self.assertEqual(parsed_file, node_tree, msg=file_path)
+                self.assertEqual(parsed_file, make_cfg_node_tree(parsed_file), msg=file_path)
+
+    def test_node_tree_children_can_be_walked_directly(self) -> None:
+        for file_path in get_cfg_files_recursively(self.squad_parts_dir_path):
+            parsed_file = parse_cfg_file(file_path)
+            node_tree = parse_cfg_node_tree(file_path)
+            if parsed_file is None or node_tree is None:
+                continue
+
+            part_node = node_tree.child("PART")
+            if part_node is None:
+                continue
+
+            for module_node in part_node.children_named("MODULE"):
+                module_key = (("PART", 0), ("MODULE", module_node.index))
+                self.assertEqual(
+                    parsed_file.get(module_key + (("name", 0),), None),
+                    module_node.get_value("name"),
+                )
+
+    def test_section_sniffing_finds_all_top_level_sections(self) -> None:
+        sniffed_section_names = frozenset({"PART", "RESOURCE_DEFINITION", "TechTree"})
+        for file_path in get_cfg_files_recursively(self.ksp_path):
+            node_tree = parse_cfg_node_tree(file_path)
+            top_level_section_names = (
+                set() if node_tree is None else set(node_tree.children_by_name)
+            )
+
+            self.assertLessEqual(
+                top_level_section_names & sniffed_section_names,
+                sniff_section_names(file_path, sniffed_section_names),
+                msg=file_path,
+            )
+
     def test_few_cfg_files_in_parts_dirs_that_are_semantically_confusing(self) -> None:
         # The game has a much broader definition of "part" than we'd like to use. For us,
         # a part means a thing we can use in the VAB/SPH and attach to our creations.
@@ -0,0 +1,72 @@
+import os
+from tempfile import TemporaryDirectory
+from typing import Callable, Optional
+import unittest
+
+from graphql_compiler.interpreter import DataContext
+
+from ..benchmarks import project_property_one_at_a_time, write_cfg_file_with_repeated_keys
+from ..cfg_parser.parser import parse_cfg_file
+from ..cfg_parser.streaming_parser import parse_cfg_file_streaming
+from ..cfg_parser.typedefs import ParsedCfgFile
+from ..querying.interpreter import KerbalDataAdapter
+from ..querying.registry import KerbalDataManagerRegistry
+from ..utils import get_ksp_install_path
+
+
+class RepeatedKeyParsingTests(unittest.TestCase):
+    # Parsing a section with N repeated keys must take linear time in N: the timings are reported
+    # by benchmark_parser_scaling() in kerbal_api.benchmarks, since they are too noisy to assert.
+    repetitions = 10000
+
+    def setUp(self) -> None:
+        self.temporary_directory = TemporaryDirectory()
+        self.file_path = os.path.join(self.temporary_directory.name, "repeated_keys.cfg")
+        write_cfg_file_with_repeated_keys(self.file_path, self.repetitions)
+
+    def tearDown(self) -> None:
+        self.temporary_directory.cleanup()
+
+    def _ensure_all_keys_are_numbered(
+        self, parser: Callable[[str], Optional[ParsedCfgFile]]
+    ) -> None:
+        parsed_file = parser(self.file_path)
+        assert parsed_file is not None
+        self.assertEqual(
+            {
+                (("FLOAT_CURVE", 0), ("key", index)): f"{index} {index * 2}"
+                for index in range(self.repetitions)
+            },
+            parsed_file,
+        )
+
+    def test_line_list_parser_numbers_repeated_keys(self) -> None:
+        self._ensure_all_keys_are_numbered(parse_cfg_file)
+
+    def test_streaming_parser_numbers_repeated_keys(self) -> None:
+        self._ensure_all_keys_are_numbered(parse_cfg_file_streaming)
+
+
+class ProjectPropertyEquivalenceTests(unittest.TestCase):
+    # Projection finds the field's position once per distinct set of token fields, then reads
+    # values straight from the tokens' value tuples. It must produce exactly what looking each
+    # field up by name did, including for None data contexts. Its timings are reported by
+    # benchmark_project_property() in kerbal_api.benchmarks.
+    # Values are read from tokens rather than the columnar store, which is out of scope here:
+    # its NaN-filled float columns cannot reproduce int and None field values.
+    field_names = ("name", "cost", "dry_mass", "crash_tolerance", "max_temp_tolerance")
+
+    def test_projection_matches_projecting_one_at_a_time(self) -> None:
+        with KerbalDataAdapter(
+            get_ksp_install_path(), registry=KerbalDataManagerRegistry()
+        ) as adapter:
+            data_contexts = [
+                DataContext.make_empty_context_from_token(token)
+                for token in adapter.data_manager.parts + [None]
+            ]
+
+            for field_name in self.field_names:
+                self.assertEqual(
+                    list(project_property_one_at_a_time(data_contexts, field_name)),
+                    list(adapter.project_property(data_contexts, "Part", field_name)),
+                )
@@ -0,0 +1,117 @@
+from collections import namedtuple
+import unittest
+
+from graphql_compiler.interpreter import DataContext
+
+from ..querying import QueryProfile, execute_query, explain_query, get_default_adapter
+from ..querying.data_manager import get_engine_modules_for_part
+from ..querying.interpreter import SharedScanAdapter
+from ..querying.profiling import ProfilingAdapter
+
+
+_FakeFilterInfo = namedtuple("_FakeFilterInfo", ("fields", "op_name", "args"))
+
+
+class ProfilingTests(unittest.TestCase):
+    def test_operations_are_counted(self) -> None:
+        adapter = get_default_adapter()
+        profile = QueryProfile()
+        profiling_adapter = ProfilingAdapter(adapter, profile)
+        parts = adapter.data_manager.parts
+
+        data_contexts = [
+            DataContext.make_empty_context_from_token(token)
+            for token in profiling_adapter.get_tokens_of_type("Part")
+        ]
+        projected_values = list(
+            profiling_adapter.project_property(iter(data_contexts), "Part", "name")
+        )
+        neighbors = list(
+            profiling_adapter.project_neighbors(
+                iter(data_contexts), "Part", ("out", "Part_EngineModule")
+            )
+        )
+        list(
+            profiling_adapter.get_tokens_of_type(
+                "Part",
+                filter_hints=[_FakeFilterInfo(("internal_name",), "=", ("$name",))],
+                runtime_arg_hints={"name": parts[0].content["internal_name"]},
+            )
+        )
+
+        self.assertEqual([part.content["name"] for part in parts], [v for _, v in projected_values])
+        self.assertEqual(len(parts), len(neighbors))
+
+        scan, projection, neighbor_projection = profile.operations
+        self.assertEqual(
+            ("get_tokens_of_type", "Part", None), (scan.operation, scan.type_name, scan.target)
+        )
+        self.assertEqual((2, 1, 1), (scan.calls, scan.full_scans, scan.index_lookups))
+        self.assertEqual(len(parts) + 1, scan.outputs)
+
+        self.assertEqual(("project_property", "name"), (projection.operation, projection.target))
+        self.assertEqual(len(parts), projection.input_contexts)
+
+        self.assertEqual("out_Part_EngineModule", neighbor_projection.target)
+        self.assertEqual(len(parts), neighbor_projection.input_contexts)
+        self.assertEqual(
+            sum(len(get_engine_modules_for_part(adapter.data_manager, part)) for part in parts),
+            neighbor_projection.outputs,
+        )
+
+        for operation in profile.operations:
+            self.assertGreaterEqual(operation.seconds, 0.0)
+        self.assertEqual(len(profile.operations) + 1, len(profile.format().splitlines()))
+
+    def test_scans_to_build_on_demand_indexes_are_counted(self) -> None:
+        adapter = get_default_adapter()
+        profile = QueryProfile()
+        profiling_adapter = ProfilingAdapter(SharedScanAdapter(adapter), profile)
+        filter_hints = [_FakeFilterInfo(("manufacturer",), "=", ("$manufacturer",))]
+        manufacturers = [part.content["manufacturer"] for part in adapter.data_manager.parts[:3]]
+
+        for manufacturer in manufacturers:
+            list(
+                profiling_adapter.get_tokens_of_type(
+                    "Part",
+                    filter_hints=filter_hints,
+                    runtime_arg_hints={"manufacturer": manufacturer},
+                )
+            )
+
+        # The first lookup scans all parts to build an index, which the others reuse.
+        (scan,) = profile.operations
+        self.assertEqual(
+            (len(manufacturers), 1, len(manufacturers)),
+            (scan.calls, scan.full_scans, scan.index_lookups),
+        )
+        self.assertIn("3 index lookups, 1 full scans", scan.describe())
+
+    def test_explain_query(self) -> None:
+        adapter = get_default_adapter()
+        query = """
+        {
+            Part {
+                name @output(out_name: "name")
+                out_Part_EngineModule {
+                    max_thrust @output(out_name: "max_thrust")
+                }
+            }
+        }
+        """
+        expected_results = list(execute_query(adapter, query, {}))
+
+        profile = explain_query(adapter, query, {})
+
+        self.assertEqual(len(expected_results), profile.result_count)
+        self.assertGreater(profile.result_count, 0)
+        self.assertIn(
+            ("project_neighbors", "Part", "out_Part_EngineModule"),
+            [
+                (operation.operation, operation.type_name, operation.target)
+                for operation in profile.operations
+            ],
+        )
+        self.assertGreaterEqual(
+            profile.execute_seconds, sum(operation.seconds for operation in profile.operations)
+        )
@@ -0,0 +1,54 @@
+from typing import List
+import unittest
+
+from ..querying import KerbalDataAdapter, KerbalDataManagerRegistry, get_default_adapter
+from ..querying.data_manager import KerbalDataManager
+from ..utils import get_ksp_install_path
+
+
+class DataManagerRegistryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ksp_path = get_ksp_install_path()
+        self.built_paths: List[str] = []
+
+        def counting_builder(ksp_install_path: str) -> KerbalDataManager:
+            self.built_paths.append(ksp_install_path)
+            return KerbalDataManager.from_ksp_install_path(ksp_install_path)
+
+        self.registry = KerbalDataManagerRegistry(builder=counting_builder)
+
+    def test_default_adapters_share_data_manager(self) -> None:
+        first_adapter = get_default_adapter()
+        second_adapter = get_default_adapter()
+
+        self.assertIs(first_adapter.data_manager, second_adapter.data_manager)
+
+    def test_adapters_share_data_manager_and_build_it_once(self) -> None:
+        first_adapter = KerbalDataAdapter(self.ksp_path, registry=self.registry)
+        second_adapter = KerbalDataAdapter(self.ksp_path, registry=self.registry)
+
+        self.assertIs(first_adapter.data_manager, second_adapter.data_manager)
+        self.assertEqual(1, len(self.built_paths))
+        self.assertEqual(2, self.registry.reference_count(self.ksp_path))
+
+        first_adapter.close()
+        second_adapter.close()
+        self.assertEqual(0, self.registry.reference_count(self.ksp_path))
+
+    def test_lazy_adapter_builds_data_manager_on_first_use(self) -> None:
+        with KerbalDataAdapter(self.ksp_path, registry=self.registry, lazy=True) as adapter:
+            self.assertEqual([], self.built_paths)
+            self.assertGreater(len(adapter.data_manager.parts), 0)
+            self.assertEqual(1, len(self.built_paths))
+
+    def test_invalidation_rebuilds_for_new_adapters_only(self) -> None:
+        old_adapter = KerbalDataAdapter(self.ksp_path, registry=self.registry)
+        old_data_manager = old_adapter.data_manager
+
+        self.registry.invalidate(self.ksp_path)
+        new_adapter = KerbalDataAdapter(self.ksp_path, registry=self.registry)
+
+        self.assertIs(old_data_manager, old_adapter.data_manager)
+        self.assertIsNot(old_data_manager, new_adapter.data_manager)
+        self.assertEqual(2, len(self.built_paths))
+        self.assertEqual(2, self.registry.reference_count(self.ksp_path))
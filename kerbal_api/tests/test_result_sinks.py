@@ -0,0 +1,120 @@
+import csv
+import io
+import json
+from typing import Any, Dict, List
+import unittest
+
+from ..querying import execute_query, export_query_results, get_default_adapter
+from ..querying.result_sinks import (
+    write_results_as_arrow,
+    write_results_as_csv,
+    write_results_as_ndjson,
+)
+
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+_ROWS: List[Dict[str, Any]] = [
+    {"part_name": "Mk1 Command Pod", "cost": 600.0, "tags": ["command", "pod"]},
+    {"part_name": "FL-T100 Fuel Tank", "cost": 150.0, "tags": []},
+    # Outputs within @optional blocks may be missing or null.
+    {"part_name": "Mystery Goo", "cost": None},
+]
+_OUTPUT_NAMES = ["part_name", "cost", "tags"]
+
+
+class _WriteRecordingFile(io.BytesIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.write_sizes: List[int] = []
+
+    def write(self, data: Any) -> int:
+        self.write_sizes.append(len(data))
+        return super().write(data)
+
+
+class ResultSinkTests(unittest.TestCase):
+    def test_ndjson_rows_have_fixed_columns(self) -> None:
+        output_file = io.BytesIO()
+        row_count = write_results_as_ndjson(iter(_ROWS), output_file, _OUTPUT_NAMES)
+
+        lines = output_file.getvalue().decode("utf-8").splitlines()
+        self.assertEqual(len(_ROWS), row_count)
+        self.assertEqual(
+            [{output_name: row.get(output_name) for output_name in _OUTPUT_NAMES} for row in _ROWS],
+            [json.loads(line) for line in lines],
+        )
+        for line in lines:
+            self.assertEqual(_OUTPUT_NAMES, list(json.loads(line)))
+
+    def test_ndjson_buffering_is_bounded(self) -> None:
+        rows = ({"part_name": f"part {index}", "cost": float(index)} for index in range(10000))
+        output_file = _WriteRecordingFile()
+        max_buffered_bytes = 4096
+
+        row_count = write_results_as_ndjson(
+            rows, output_file, _OUTPUT_NAMES, max_buffered_bytes=max_buffered_bytes
+        )
+
+        self.assertEqual(10000, row_count)
+        self.assertGreater(len(output_file.write_sizes), 10)
+        max_row_size = max(len(line) + 1 for line in output_file.getvalue().splitlines())
+        self.assertLess(max(output_file.write_sizes), max_buffered_bytes + max_row_size)
+
+    def test_csv_rows(self) -> None:
+        output_file = io.StringIO(newline="")
+        row_count = write_results_as_csv(iter(_ROWS), output_file, _OUTPUT_NAMES)
+
+        output_file.seek(0)
+        self.assertEqual(len(_ROWS), row_count)
+        self.assertEqual(
+            [
+                _OUTPUT_NAMES,
+                ["Mk1 Command Pod", "600.0", '["command", "pod"]'],
+                ["FL-T100 Fuel Tank", "150.0", "[]"],
+                ["Mystery Goo", "", ""],
+            ],
+            list(csv.reader(output_file)),
+        )
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_arrow_stream_round_trip(self) -> None:
+        output_file = io.BytesIO()
+        row_count = write_results_as_arrow(
+            iter(_ROWS), output_file, _OUTPUT_NAMES, ["String!", "Float", "[String]"], batch_size=2
+        )
+
+        table = pyarrow.ipc.open_stream(output_file.getvalue()).read_all()
+        self.assertEqual(len(_ROWS), row_count)
+        self.assertEqual(_OUTPUT_NAMES, table.schema.names)
+        self.assertEqual(pyarrow.float64(), table.schema.field("cost").type)
+        self.assertEqual(2, len(table.to_batches()))
+        self.assertEqual(
+            [{output_name: row.get(output_name) for output_name in _OUTPUT_NAMES} for row in _ROWS],
+            table.to_pylist(),
+        )
+
+    def test_export_query_results_matches_execute_query(self) -> None:
+        query = """
+        {
+            Part {
+                name @output(out_name: "part_name")
+                cost @output(out_name: "cost")
+            }
+        }
+        """
+        expected_results = list(execute_query(get_default_adapter(), query, {}))
+        self.assertGreater(len(expected_results), 0)
+
+        output_file = io.BytesIO()
+        row_count = export_query_results(get_default_adapter(), query, {}, output_file)
+
+        self.assertEqual(len(expected_results), row_count)
+        self.assertEqual(
+            expected_results,
+            [json.loads(line) for line in output_file.getvalue().decode("utf-8").splitlines()],
+        )
@@ -0,0 +1,185 @@
+from http.client import HTTPConnection
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+from threading import Thread
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+import unittest
+
+from ..querying import KerbalDataAdapter, execute_query, get_default_adapter
+from ..querying.tokens import KerbalToken
+from ..serve import (
+    MAX_WORKER_STARTUP_FAILURES,
+    WORKER_STARTUP_SECONDS,
+    QueryServer,
+    WorkerRestartPolicy,
+    make_listening_socket,
+)
+from ..utils import get_ksp_install_path
+
+
+_PARTS_QUERY = """
+{
+    Part {
+        name @output(out_name: "part_name")
+        cost @output(out_name: "cost")
+    }
+}
+"""
+
+
+class _FailingAdapter(KerbalDataAdapter):
+    def get_tokens_of_type(self, type_name: str, **hints: Any) -> Iterable[KerbalToken]:
+        raise RuntimeError("Simulated internal error")
+
+
+def _request_over_unix_socket(socket_path: str, request: bytes) -> bytes:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client_socket:
+        client_socket.connect(socket_path)
+        client_socket.sendall(request)
+        client_socket.shutdown(socket.SHUT_WR)
+
+        response = bytearray()
+        while True:
+            data = client_socket.recv(65536)
+            if not data:
+                return bytes(response)
+            response += data
+
+
+class QueryServerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.adapter = get_default_adapter()
+        self.server = QueryServer(make_listening_socket(port=0), self.adapter)
+        self.server_thread = Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self.server_thread.join()
+
+    def _request(self, method: str, path: str, body: Any = None) -> Tuple[int, bytes]:
+        connection = HTTPConnection(*self.server.socket.getsockname()[:2])
+        try:
+            encoded_body = None if body is None else json.dumps(body).encode("utf-8")
+            connection.request(method, path, body=encoded_body)
+            response = connection.getresponse()
+            return response.status, response.read()
+        finally:
+            connection.close()
+
+    def test_health(self) -> None:
+        status, body = self._request("GET", "/health")
+        self.assertEqual(200, status)
+        self.assertEqual({"status": "ok"}, json.loads(body))
+
+    def test_invalid_requests(self) -> None:
+        self.assertEqual(404, self._request("GET", "/missing")[0])
+        self.assertEqual(400, self._request("POST", "/query", {"args": {}})[0])
+        self.assertEqual(400, self._request("POST", "/query", {"query": 1})[0])
+
+        status, body = self._request("POST", "/query", {"query": "{ NoSuchType { name } }"})
+        self.assertEqual(400, status)
+        self.assertIn("error", json.loads(body))
+
+        query_with_arg = """
+        {
+            Part {
+                internal_name @filter(op_name: "=", value: ["$name"])
+                              @output(out_name: "internal_name")
+            }
+        }
+        """
+        status, body = self._request("POST", "/query", {"query": query_with_arg, "args": {}})
+        self.assertEqual(400, status)
+        self.assertIn("error", json.loads(body))
+
+    def test_internal_errors(self) -> None:
+        with _FailingAdapter(get_ksp_install_path()) as failing_adapter:
+            self.server.adapter = failing_adapter
+            with self.assertLogs("kerbal_api.serve", level="ERROR") as logs:
+                status, body = self._request("POST", "/query", {"query": _PARTS_QUERY})
+
+        self.assertEqual(500, status)
+        self.assertNotIn("Simulated", json.loads(body)["error"])
+        self.assertIn("Simulated internal error", "\n".join(logs.output))
+
+    def test_query_results_are_streamed_as_ndjson(self) -> None:
+        expected_results = list(execute_query(self.adapter, _PARTS_QUERY, {}))
+        self.assertGreater(len(expected_results), 0)
+
+        status, body = self._request("POST", "/query", {"query": _PARTS_QUERY, "args": {}})
+
+        self.assertEqual(200, status)
+        actual_results: List[Dict[str, Any]] = [
+            json.loads(line) for line in body.decode("utf-8").splitlines()
+        ]
+        self.assertEqual(expected_results, actual_results)
+
+
+class WorkerRestartPolicyTests(unittest.TestCase):
+    def test_workers_failing_on_startup_are_restarted_with_backoff_then_given_up_on(self) -> None:
+        restart_policy = WorkerRestartPolicy()
+        restart_delays: List[float] = []
+        for _ in range(MAX_WORKER_STARTUP_FAILURES - 1):
+            restart_delay = restart_policy.get_restart_delay(0.0)
+            assert restart_delay is not None
+            restart_delays.append(restart_delay)
+        self.assertIsNone(restart_policy.get_restart_delay(0.0))
+
+        self.assertGreater(restart_delays[0], 0.0)
+        for restart_delay, next_restart_delay in zip(restart_delays, restart_delays[1:]):
+            self.assertLess(restart_delay, next_restart_delay)
+
+    def test_workers_that_ran_for_a_while_are_restarted_immediately(self) -> None:
+        restart_policy = WorkerRestartPolicy()
+        for _ in range(MAX_WORKER_STARTUP_FAILURES - 1):
+            self.assertIsNotNone(restart_policy.get_restart_delay(0.0))
+
+        # A worker that started successfully resets the count of startup failures.
+        self.assertEqual(0.0, restart_policy.get_restart_delay(WORKER_STARTUP_SECONDS))
+        self.assertEqual(0, restart_policy.consecutive_startup_failures)
+        self.assertIsNotNone(restart_policy.get_restart_delay(0.0))
+
+
+@unittest.skipUnless(hasattr(os, "fork") and hasattr(socket, "AF_UNIX"), "requires fork()")
+class PreForkedServerTests(unittest.TestCase):
+    def test_serving_from_forked_workers_over_a_unix_socket(self) -> None:
+        with TemporaryDirectory() as temporary_directory:
+            socket_path = os.path.join(temporary_directory, "kerbal_api.sock")
+            server_process = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "kerbal_api.serve",
+                    "--unix-socket",
+                    socket_path,
+                    "--workers",
+                    "2",
+                ],
+                cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                deadline = time.monotonic() + 60
+                while not os.path.exists(socket_path):
+                    self.assertLess(time.monotonic(), deadline)
+                    self.assertIsNone(server_process.poll())
+                    time.sleep(0.05)
+
+                for _ in range(4):
+                    response = _request_over_unix_socket(
+                        socket_path, b"GET /health HTTP/1.1\r\nConnection: close\r\n\r\n"
+                    )
+                    self.assertTrue(response.startswith(b"HTTP/1.1 200 "), response)
+            finally:
+                server_process.send_signal(signal.SIGTERM)
+                self.assertEqual(0, server_process.wait(timeout=60))
+
+            self.assertFalse(os.path.exists(socket_path))
@@ -0,0 +1,98 @@
+import os
+import pickle
+from tempfile import TemporaryDirectory
+from typing import Any
+import unittest
+
+from ..querying.data_manager import KerbalDataManager
+from ..querying.snapshot import read_snapshot, write_snapshot
+from ..querying.tokens import KerbalConfigToken
+from ..utils import get_ksp_install_path
+from .utils import assert_parsed_cfg_files_fit_memory_budget
+
+
+class _UnpicklesWithError:
+    def __init__(self, reduce_value: Any) -> None:
+        self.reduce_value = reduce_value
+
+    def __reduce__(self) -> Any:
+        return self.reduce_value
+
+
+class DataManagerSnapshotTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ksp_path = get_ksp_install_path()
+        self.temporary_directory = TemporaryDirectory()
+        self.snapshot_path = os.path.join(self.temporary_directory.name, "snapshot.bin")
+
+    def tearDown(self) -> None:
+        self.temporary_directory.cleanup()
+
+    def test_snapshot_of_unchanged_install_is_reused(self) -> None:
+        data_manager = KerbalDataManager.from_ksp_install_path(
+            self.ksp_path, snapshot_path=self.snapshot_path
+        )
+        self.assertTrue(os.path.isfile(self.snapshot_path))
+
+        reloaded_data_manager = KerbalDataManager.from_ksp_install_path(
+            self.ksp_path, snapshot_path=self.snapshot_path
+        )
+
+        self.assertIsNot(data_manager, reloaded_data_manager)
+        self.assertEqual(data_manager.cfg_file_stats, reloaded_data_manager.cfg_file_stats)
+        self.assertEqual(data_manager.parts, reloaded_data_manager.parts)
+        self.assertEqual(data_manager.resources, reloaded_data_manager.resources)
+        self.assertEqual(data_manager.technologies, reloaded_data_manager.technologies)
+
+    def test_snapshot_with_content_hashes_matches_direct_ingestion(self) -> None:
+        data_manager = KerbalDataManager.from_ksp_install_path(self.ksp_path)
+
+        KerbalDataManager.from_ksp_install_path(
+            self.ksp_path, snapshot_path=self.snapshot_path, verify_content_hashes=True
+        )
+        reloaded_data_manager = KerbalDataManager.from_ksp_install_path(
+            self.ksp_path, snapshot_path=self.snapshot_path, verify_content_hashes=True
+        )
+
+        self.assertEqual(data_manager.parsed_cfg_files, reloaded_data_manager.parsed_cfg_files)
+        self.assertEqual(data_manager.parts, reloaded_data_manager.parts)
+
+    def test_corrupted_snapshot_is_ignored(self) -> None:
+        with open(self.snapshot_path, "wb") as f:
+            f.write(b"not a snapshot")
+
+        self.assertIsNone(KerbalDataManager.load_snapshot(self.snapshot_path))
+
+    def test_snapshot_with_valid_header_and_unusable_payload_is_ignored(self) -> None:
+        write_snapshot(None, self.snapshot_path)
+        with open(self.snapshot_path, "rb") as f:
+            header = f.read()[: -len(pickle.dumps(None, protocol=pickle.HIGHEST_PROTOCOL))]
+        with open(self.snapshot_path, "wb") as f:
+            f.write(header + b"not a pickle")
+        self.assertIsNone(read_snapshot(self.snapshot_path))
+
+        unusable_values = [
+            # Unpickling raises ValueError.
+            _UnpicklesWithError((int, ("not a number",))),
+            # Unpickling raises TypeError, as if the token constructor's arguments had changed.
+            _UnpicklesWithError((KerbalConfigToken, ("Part", {}, {}))),
+        ]
+        for unusable_value in unusable_values:
+            write_snapshot(unusable_value, self.snapshot_path)
+            self.assertIsNone(read_snapshot(self.snapshot_path))
+
+    def test_memory_budget_applies_to_reused_snapshot(self) -> None:
+        unbudgeted_data_manager = KerbalDataManager.from_ksp_install_path(
+            self.ksp_path, snapshot_path=self.snapshot_path
+        )
+        memory_budget = 256 * 1024
+        budgeted_data_manager = KerbalDataManager.from_ksp_install_path(
+            self.ksp_path, snapshot_path=self.snapshot_path, cfg_file_memory_budget=memory_budget
+        )
+
+        self.assertEqual(memory_budget, budgeted_data_manager.cfg_file_memory_budget)
+        self.assertEqual(unbudgeted_data_manager.parts, budgeted_data_manager.parts)
+
+        assert_parsed_cfg_files_fit_memory_budget(
+            self, budgeted_data_manager, unbudgeted_data_manager
+        )
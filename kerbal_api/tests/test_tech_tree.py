@@ -0,0 +1,89 @@
+from typing import Dict, List, Set
+import unittest
+
+from ..querying.data_manager import (
+    KerbalDataManager,
+    get_any_of_dependents_of_technology,
+    get_mandatory_dependents_of_technology,
+    get_transitive_dependents_of_technology,
+    get_transitive_prerequisites_of_technology,
+)
+from ..querying.tokens import KerbalConfigToken
+from ..utils import get_ksp_install_path
+
+
+def _get_prerequisites_by_search(
+    data_manager: KerbalDataManager, technology: KerbalConfigToken
+) -> Set[str]:
+    found_ids: Set[str] = set()
+    ids_to_visit: List[str] = [technology.content["id"]]
+    while ids_to_visit:
+        current = data_manager.technologies_by_id[ids_to_visit.pop()]
+        for prereq_id in (
+            current.foreign_keys["mandatory_prereq_ids"] + current.foreign_keys["any_of_prereq_ids"]
+        ):
+            if prereq_id not in found_ids:
+                found_ids.add(prereq_id)
+                ids_to_visit.append(prereq_id)
+    return found_ids
+
+
+class TechTreeTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data_manager = KerbalDataManager.from_ksp_install_path(get_ksp_install_path())
+
+    def test_reverse_prerequisite_edges_match_forward_edges(self) -> None:
+        for foreign_key, get_dependents in (
+            ("mandatory_prereq_ids", get_mandatory_dependents_of_technology),
+            ("any_of_prereq_ids", get_any_of_dependents_of_technology),
+        ):
+            expected_dependent_ids: Dict[str, List[str]] = {}
+            for technology in self.data_manager.technologies:
+                for prereq_id in technology.foreign_keys[foreign_key]:
+                    expected_dependent_ids.setdefault(prereq_id, []).append(
+                        technology.content["id"]
+                    )
+
+            for technology in self.data_manager.technologies:
+                self.assertEqual(
+                    expected_dependent_ids.get(technology.content["id"], []),
+                    [
+                        dependent.content["id"]
+                        for dependent in get_dependents(self.data_manager, technology)
+                    ],
+                )
+
+    def test_transitive_closure_matches_graph_search(self) -> None:
+        technologies = self.data_manager.technologies
+        self.assertGreater(len(technologies), 0)
+
+        expected_prerequisite_ids = {
+            technology.content["id"]: _get_prerequisites_by_search(self.data_manager, technology)
+            for technology in technologies
+        }
+        self.assertTrue(any(expected_prerequisite_ids.values()))
+
+        for technology in technologies:
+            technology_id = technology.content["id"]
+            prerequisite_ids = [
+                prerequisite.content["id"]
+                for prerequisite in get_transitive_prerequisites_of_technology(
+                    self.data_manager, technology
+                )
+            ]
+            self.assertCountEqual(expected_prerequisite_ids[technology_id], prerequisite_ids)
+
+            dependent_ids = [
+                dependent.content["id"]
+                for dependent in get_transitive_dependents_of_technology(
+                    self.data_manager, technology
+                )
+            ]
+            self.assertCountEqual(
+                [
+                    other_id
+                    for other_id, other_prerequisite_ids in expected_prerequisite_ids.items()
+                    if technology_id in other_prerequisite_ids
+                ],
+                dependent_ids,
+            )
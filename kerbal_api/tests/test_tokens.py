@@ -0,0 +1,66 @@
+import pickle
+import unittest
+
+from ..querying.data_manager import KerbalDataManager
+from ..querying.tokens import KerbalConfigToken, KerbalToken, TokenFields, get_field_values
+from ..utils import get_ksp_install_path
+
+
+class TokenTests(unittest.TestCase):
+    def test_token_fields_behave_like_a_read_only_dict(self) -> None:
+        fields = TokenFields({"name": "Mk1 Pod", "cost": 600, "dry_mass": None})
+
+        self.assertEqual({"name": "Mk1 Pod", "cost": 600, "dry_mass": None}, fields)
+        self.assertEqual(["name", "cost", "dry_mass"], list(fields))
+        self.assertEqual(600, fields["cost"])
+        self.assertIsNone(fields.get("dry_mass", 0))
+        self.assertEqual(0, fields.get("missing", 0))
+        self.assertNotIn("missing", fields)
+        with self.assertRaises(KeyError):
+            fields["missing"]
+        with self.assertRaises(TypeError):
+            fields["cost"] = 700  # type: ignore
+
+        self.assertNotEqual(TokenFields({"cost": 600, "name": "Mk1 Pod", "dry_mass": None}), fields)
+        self.assertEqual(TokenFields(dict(fields)), fields)
+
+    def test_tokens_share_field_names_paths_and_cfg_key_names(self) -> None:
+        data_manager = KerbalDataManager.from_ksp_install_path(get_ksp_install_path())
+        first_part, second_part = data_manager.parts[:2]
+
+        self.assertIs(first_part.content._field_positions, second_part.content._field_positions)
+        self.assertIs(first_part.from_cfg_root[0][0], second_part.from_cfg_root[0][0])
+
+        reloaded_parts = pickle.loads(pickle.dumps(data_manager.parts))
+        self.assertEqual(data_manager.parts, reloaded_parts)
+        for part, reloaded_part in zip(data_manager.parts, reloaded_parts):
+            self.assertIs(part.content._field_positions, reloaded_part.content._field_positions)
+            self.assertIs(part.from_cfg_file_path, reloaded_part.from_cfg_file_path)
+            self.assertEqual(part.from_cfg_root, reloaded_part.from_cfg_root)
+            for (name, _), (reloaded_name, _) in zip(
+                part.from_cfg_root, reloaded_part.from_cfg_root
+            ):
+                self.assertIs(name, reloaded_name)
+
+    def test_tokens_compare_by_value(self) -> None:
+        token = KerbalConfigToken("Resource", {"name": "Ore"}, {}, "Ore.cfg", (("RESOURCE", 0),))
+
+        self.assertEqual(
+            KerbalConfigToken("Resource", {"name": "Ore"}, {}, "Ore.cfg", (("RESOURCE", 0),)), token
+        )
+        self.assertNotEqual(
+            KerbalConfigToken("Resource", {"name": "Ore"}, {}, "Ore.cfg", (("RESOURCE", 1),)), token
+        )
+        self.assertIn("name': 'Ore'", repr(token))
+
+    def test_field_values_of_tokens_with_different_field_names(self) -> None:
+        tokens = [
+            KerbalToken("Resource", {"name": "Ore", "density": 0.01}, {}),
+            None,
+            KerbalToken("Resource", {"name": "Ablator", "density": 0.001}, {}),
+            KerbalToken("Part", {"cost": 600, "name": "Mk1 Pod"}, {}),
+        ]
+
+        self.assertEqual(["Ore", None, "Ablator", "Mk1 Pod"], get_field_values(tokens, "name"))
+        with self.assertRaises(KeyError):
+            get_field_values(tokens, "cost")
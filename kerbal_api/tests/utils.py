@@ -0,0 +1,27 @@
+import unittest
+
+from ..querying.data_manager import KerbalDataManager
+
+
+def assert_parsed_cfg_files_fit_memory_budget(
+    test_case: unittest.TestCase,
+    budgeted_data_manager: KerbalDataManager,
+    unbudgeted_data_manager: KerbalDataManager,
+) -> None:
+    """Assert that the budgeted data manager kept fewer parsed files, and stayed close to budget.
+
+    Files that define no tokens are never kept. The most recently used file is always kept,
+    so the kept files may exceed the budget by at most its size.
+    """
+    memory_budget = budgeted_data_manager.cfg_file_memory_budget
+    assert memory_budget is not None
+
+    memory_usage = budgeted_data_manager.get_cfg_file_memory_usage()
+    test_case.assertNotIn("other", memory_usage)
+    test_case.assertLess(
+        len(budgeted_data_manager.parsed_cfg_files), len(unbudgeted_data_manager.parsed_cfg_files)
+    )
+    newest_file_size = budgeted_data_manager.cfg_file_sizes[
+        next(reversed(list(budgeted_data_manager.parsed_cfg_files)))
+    ]
+    test_case.assertLessEqual(sum(memory_usage.values()), memory_budget + newest_file_size)
@@ -1,4 +1,5 @@
 import os
+from typing import Any
 
 
 KSP_INSTALL_PATH_ENV_VAR_NAME = "KSP_INSTALL_PATH"
@@ -27,3 +28,14 @@ def get_ksp_install_path() -> str:
         f"Please set the {KSP_INSTALL_PATH_ENV_VAR_NAME} env var to the absolute path of "
         f"the KSP root directory (the one that contains the GameData directory)."
     )
+
+
+def import_numpy() -> Any:
+    """Import and return NumPy, an optional dependency needed by the vectorized code paths."""
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "Vectorized analysis requires NumPy. Install it with: pip install kerbal-api[columnar]"
+        ) from e
+    return numpy